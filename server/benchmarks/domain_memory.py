@@ -0,0 +1,127 @@
+"""Compare memory retained by the domain lookup table in its previous dict-per-row form
+and in the columnar ``DomainIndex`` form.
+
+Usage:
+
+    python benchmarks/domain_memory.py [--domains domain_lookup_YYYYMMDD.tsv]
+
+Without ``--domains``, a synthetic table is generated: 20,000 genes with 1-11 rows
+each, drawing from 12,000 distinct domains. Memory is measured with ``tracemalloc``
+after garbage collection, so it reflects Python allocations only.
+"""
+
+import csv
+import gc
+import random
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+from curfu.domain_services import DomainIndex
+
+DOMAIN_WORDS = ("kinase", "binding", "zinc finger", "C2H2-type", "SH3", "catalytic")
+
+
+def write_synthetic_table(
+    path: Path, n_genes: int = 20000, n_domains: int = 12000
+) -> None:
+    """Write a domain lookup table with realistic sharing of domains between genes.
+
+    :param path: location to write table to
+    :param n_genes: number of genes to include
+    :param n_domains: number of distinct domains to draw from
+    """
+    rng = random.Random(0)  # noqa: S311
+    names = {
+        i: "Domain " + " ".join(rng.choice(DOMAIN_WORDS) for _ in range(4))
+        for i in range(n_domains)
+    }
+    with path.open("w") as f:
+        for gene in range(n_genes):
+            refseq_ac = f"NP_{rng.randint(1, 999999):06d}.{rng.randint(1, 3)}"
+            for _ in range(rng.randint(1, 11)):
+                domain = rng.randrange(n_domains)
+                f.write(
+                    f"hgnc:{gene}\tSYM{gene}\tIPR{domain:06d}\t{names[domain]}\t"
+                    f"{rng.randint(1, 500)}\t{rng.randint(500, 900)}\t{refseq_ac}\n"
+                )
+
+
+def load_dicts(domain_file: Path) -> dict[str, list[dict]]:
+    """Load table the way ``DomainService`` did before it used ``DomainIndex``.
+
+    :param domain_file: path to domain lookup table
+    :return: rows as dicts, grouped by gene ID
+    """
+    domains: dict[str, list[dict]] = {}
+    with domain_file.open() as df:
+        for row in csv.reader(df, delimiter="\t"):
+            domains.setdefault(row[0].lower(), []).append(
+                {
+                    "interproId": f"interpro:{row[2]}",
+                    "domainName": row[3],
+                    "start": int(row[4]),
+                    "end": int(row[5]),
+                    "refseqAc": row[6],
+                }
+            )
+    return domains
+
+
+def load_index(domain_file: Path) -> DomainIndex:
+    """Load table into columnar form.
+
+    :param domain_file: path to domain lookup table
+    :return: domain index
+    """
+    return DomainIndex(DomainIndex.build(domain_file))
+
+
+def measure(load: Callable[[Path], object], domain_file: Path) -> tuple[float, float]:
+    """Measure memory used to load table.
+
+    :param load: function to load table with
+    :param domain_file: path to domain lookup table
+    :return: MB retained once loaded, and peak MB while loading
+    """
+    gc.collect()
+    tracemalloc.start()
+    table = load(domain_file)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return retained / 1e6, peak / 1e6
+
+
+@click.command()
+@click.option(
+    "--domains",
+    "-d",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Path to domain lookup table. Defaults to a generated synthetic table.",
+)
+def main(domains: Path | None) -> None:
+    """Report memory retained by each domain table representation.
+
+    :param domains: path to domain lookup table
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if domains is None:
+            domains = Path(tmp_dir) / "domain_lookup_synthetic.tsv"
+            write_synthetic_table(domains)
+        with domains.open("rb") as f:
+            n_rows = sum(1 for _ in f)
+        click.echo(
+            f"{domains.name}: {n_rows} rows, {domains.stat().st_size / 1e6:.1f} MB"
+        )
+        for label, load in (("dict-per-row", load_dicts), ("columnar", load_index)):
+            retained, peak = measure(load, domains)
+            click.echo(f"{label}: {retained:.1f} MB retained, {peak:.1f} MB peak")
+
+
+if __name__ == "__main__":
+    main()
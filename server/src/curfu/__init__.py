@@ -51,9 +51,62 @@ else:
     UTA_DB_URL = "postgresql://uta_admin@localhost:5433/uta/uta_20210129"
 
 
+def _get_env_flag(name: str) -> bool:
+    """Check whether a boolean env var is set.
+
+    :param name: env var name
+    :return: True if var is set to ``1`` or ``true`` (case-insensitive)
+    """
+    return environ.get(name, "").lower() in ("1", "true")
+
+
+# defer parsing of domain lookup table until domains are requested, for faster startup
+LAZY_DOMAINS = _get_env_flag("CURFU_LAZY_DOMAINS")
+# max number of genes to keep parsed domains for when loading lazily
+DOMAIN_CACHE_SIZE = int(environ.get("CURFU_DOMAIN_CACHE_SIZE", "2048"))
+
+# bounds for cached gene normalization results
+NORMALIZER_CACHE_SIZE = int(environ.get("CURFU_NORMALIZER_CACHE_SIZE", "4096"))
+NORMALIZER_CACHE_TTL = float(environ.get("CURFU_NORMALIZER_CACHE_TTL", "3600"))
+
+# max number of SeqRepo identifier translations to cache. These don't change within a
+# SeqRepo release, so they don't expire.
+SEQREPO_CACHE_SIZE = int(environ.get("CURFU_SEQREPO_CACHE_SIZE", "4096"))
+
+# max number of transcript exon structures and exon genomic alignments to cache. UTA
+# data doesn't change while the app is running, so they don't expire.
+EXON_CACHE_SIZE = int(environ.get("CURFU_EXON_CACHE_SIZE", "4096"))
+
+# bounds for cached lists of transcripts per gene
+TRANSCRIPTS_CACHE_SIZE = int(environ.get("CURFU_TRANSCRIPTS_CACHE_SIZE", "2048"))
+TRANSCRIPTS_CACHE_TTL = float(environ.get("CURFU_TRANSCRIPTS_CACHE_TTL", "3600"))
+# look up a gene's transcripts in the background as soon as the gene is resolved, so
+# that they're cached by the time the client asks for them
+PREFETCH_TRANSCRIPTS = _get_env_flag("CURFU_PREFETCH_TRANSCRIPTS")
+
+# directory of additional demo fusions, one JSON file per fusion, served by file name
+DEMO_DIR = Path(environ.get("CURFU_DEMO_DIR", APP_ROOT / "data" / "demos"))
+# serve demo fusions with the same element/domain IDs on every request, rather than
+# generating fresh ones, so that responses are identical and fully cacheable
+DETERMINISTIC_DEMO_IDS = _get_env_flag("CURFU_DETERMINISTIC_DEMO_IDS")
+
+# number of threads available for blocking normalizer, SeqRepo, and FUSOR calls
+BLOCKING_WORKERS = int(environ.get("CURFU_BLOCKING_WORKERS", "8"))
+# number of processes available for CPU-bound batch fusion validation, per server
+# process. Each holds its own FUSOR instance, and the total is multiplied by the number
+# of server processes (e.g. gunicorn workers), so it's kept small by default.
+VALIDATION_WORKERS = int(environ.get("CURFU_VALIDATION_WORKERS", "2"))
+
+
 class LookupServiceError(Exception):
     """Custom Exception to use when lookups fail in curation services."""
 
 
 # define max acceptable matches for autocomplete suggestions
 MAX_SUGGESTIONS = 50
+
+# define max number of terms accepted by batch gene normalization
+MAX_GENE_BATCH_SIZE = 1000
+
+# define max number of conversions accepted by batch coordinate conversion
+MAX_COORDS_BATCH_SIZE = 5000
@@ -0,0 +1,222 @@
+"""Provide support for processing large batches of fusions.
+
+Batches are submitted either as a JSON array or as newline-delimited JSON (NDJSON),
+one object per line, and results are produced as NDJSON in input order, so that they
+can be streamed back to the client as soon as each leading chunk is done. Submitted
+batches are received in full before processing starts; NDJSON items are then parsed
+one at a time as they're processed.
+"""
+
+import asyncio
+import json
+import re
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from itertools import islice
+from typing import NamedTuple, TypeVar
+
+from fusor import FUSOR
+from fusor.exceptions import FUSORParametersException, IDTranslationException
+
+from curfu import logger
+from curfu.schemas import NomenclatureResponse, ValidateFusionResponse
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# number of items handed to a worker at once. Large enough to amortize the cost of
+# passing work between processes, small enough to keep results flowing steadily.
+BATCH_CHUNK_SIZE = 100
+
+
+class InvalidItem(NamedTuple):
+    """Stand in for a batch item that couldn't be parsed, so that it still gets a
+    result in its place in the output.
+    """
+
+    warning: str
+
+
+def parse_batch(data: bytes) -> Iterator[dict | InvalidItem]:
+    """Parse a batch of objects.
+
+    NDJSON lines are parsed lazily, as the returned iterator is consumed, directly from
+    ``data`` rather than from a decoded or split copy of it.
+
+    :param data: either a JSON array, or NDJSON with one object per line. Blank lines
+        in NDJSON are skipped.
+    :return: iterator over parsed objects, with an ``InvalidItem`` in place of each
+        NDJSON line that isn't valid JSON
+    :raise ValueError: if data looks like a JSON array but can't be parsed as one
+    """
+    if _JSON_ARRAY_START.match(data):
+        items = json.loads(data)
+        if not isinstance(items, list):
+            msg = "Batch must be a JSON array or newline-delimited JSON objects"
+            raise ValueError(msg)
+        return iter(items)
+    return _parse_ndjson(data)
+
+
+# leading whitespace and opening bracket of a JSON array
+_JSON_ARRAY_START = re.compile(rb"\s*\[")
+
+
+def _parse_ndjson(data: bytes) -> Iterator[dict | InvalidItem]:
+    """Lazily parse NDJSON.
+
+    :param data: NDJSON with one object per line
+    :return: iterator over parsed objects, with an ``InvalidItem`` in place of each
+        line that isn't valid JSON
+    """
+    start = 0
+    line_number = 0
+    while start < len(data):
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = len(data)
+        line = data[start:end]
+        line_number += 1
+        start = end + 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield InvalidItem(f"Unable to parse line {line_number}: {e}")
+
+
+def chunked(items: Iterable[T], size: int = BATCH_CHUNK_SIZE) -> Iterator[list[T]]:
+    """Split items into consecutive chunks.
+
+    :param items: items to split
+    :param size: max number of items per chunk
+    :return: iterator over chunks
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def map_ordered(
+    executor: Executor,
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_pending: int,
+) -> AsyncIterator[R]:
+    """Apply a function to items on an executor, yielding results in input order.
+
+    At most ``max_pending`` items are submitted ahead of the result being awaited, so
+    memory use is bounded however many items there are. Outstanding work is cancelled
+    if iteration stops early (e.g. the client disconnects).
+
+    :param executor: executor to run ``func`` on
+    :param func: function to apply. Must be picklable if ``executor`` is a process
+        pool.
+    :param items: items to apply ``func`` to
+    :param max_pending: max number of submitted items awaiting collection
+    :return: async iterator over results
+    """
+    loop = asyncio.get_running_loop()
+    pending: deque[asyncio.Future[R]] = deque()
+    try:
+        for item in items:
+            pending.append(loop.run_in_executor(executor, func, item))
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# FUSOR instance used by a validation worker process. Set by ``init_validation_worker``.
+_worker_fusor: FUSOR | None = None
+
+
+def init_validation_worker() -> None:
+    """Initialize FUSOR in a validation worker process, once per process rather than
+    once per chunk.
+    """
+    global _worker_fusor
+    _worker_fusor = FUSOR()
+
+
+def validate_fusion_item(
+    fusor: FUSOR, item: dict | InvalidItem
+) -> ValidateFusionResponse:
+    """Validate a proposed fusion object, as the single-fusion validation endpoint
+    does.
+
+    :param fusor: FUSOR instance
+    :param item: fusion object, using snake_case for first-level property keys (see
+        the ``/api/validate`` endpoint)
+    :return: response with validated fusion if correct, or warnings if not. Any error
+        raised while validating is reported as a warning, so that one item can't cut
+        short the results of the rest of its batch.
+    """
+    if isinstance(item, InvalidItem):
+        return ValidateFusionResponse(warnings=[item.warning])
+    if not isinstance(item, dict):
+        return ValidateFusionResponse(warnings=["Fusion must be a JSON object"])
+    try:
+        fusion = fusor.fusion(**item)
+    except FUSORParametersException as e:
+        return ValidateFusionResponse(warnings=str(e).split("\n"))
+    except Exception as e:
+        logger.exception("Unexpected error validating batch item")
+        return ValidateFusionResponse(warnings=[f"Unable to validate fusion: {e}"])
+    return ValidateFusionResponse(fusion=fusion)
+
+
+def validate_fusion_chunk(chunk: list[dict | InvalidItem]) -> str:
+    """Validate a chunk of proposed fusion objects. Run in a worker process that's been
+    set up by ``init_validation_worker``.
+
+    :param chunk: fusion objects
+    :return: NDJSON lines containing a validation response for each fusion, in order
+    """
+    return "".join(
+        f"{validate_fusion_item(_worker_fusor, item).model_dump_json(exclude_none=True)}\n"
+        for item in chunk
+    )
+
+
+def generate_nomenclature_item(
+    fusor: FUSOR, item: dict | InvalidItem
+) -> NomenclatureResponse:
+    """Validate a proposed fusion object and generate its nomenclature.
+
+    :param fusor: FUSOR instance. Its SeqRepo lookups are shared across items.
+    :param item: fusion object, structured as for validation
+    :return: response with fusion nomenclature if successful, or warnings if not. As
+        with validation, any error raised is reported as a warning.
+    """
+    validated = validate_fusion_item(fusor, item)
+    if validated.warnings:
+        return NomenclatureResponse(nomenclature="", warnings=validated.warnings)
+    try:
+        nomenclature = fusor.generate_nomenclature(validated.fusion)
+    except Exception as e:
+        if not isinstance(e, ValueError | IDTranslationException):
+            logger.exception("Unexpected error generating nomenclature for batch item")
+        return NomenclatureResponse(
+            nomenclature="",
+            warnings=["Unable to generate nomenclature for provided fusion"],
+        )
+    return NomenclatureResponse(nomenclature=nomenclature)
+
+
+def generate_nomenclature_chunk(fusor: FUSOR, chunk: list[dict | InvalidItem]) -> str:
+    """Generate nomenclature for a chunk of proposed fusion objects.
+
+    :param fusor: FUSOR instance
+    :param chunk: fusion objects
+    :return: NDJSON lines containing a nomenclature response for each fusion, in order
+    """
+    return "".join(
+        f"{generate_nomenclature_item(fusor, item).model_dump_json(exclude_none=True)}\n"
+        for item in chunk
+    )
@@ -0,0 +1,146 @@
+"""Provide in-memory caching for expensive lookups."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """Provide a size-bounded, least-recently-used cache whose entries expire a fixed
+    time after being stored.
+
+    Safe to share between threads. Hit and miss counts are kept for monitoring.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None) -> None:
+        """Initialize cache.
+
+        :param max_size: max number of entries to hold. When full, the least recently
+            used entry is evicted to make room.
+        :param ttl: seconds after which an entry expires. If None, entries never
+            expire.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: Hashable) -> Any:  # noqa: ANN401
+        """Get unexpired cached value.
+
+        :param key: cache key
+        :return: cached value
+        :raise KeyError: if no unexpired value is cached for key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        raise KeyError(key)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """Store value, evicting the least recently used entry if full.
+
+        :param key: cache key
+        :param value: value to cache
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove entry if present.
+
+        :param key: cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    async def shared(self, key: Hashable, lookup: Callable[[], Awaitable[T]]) -> T:
+        """Get result of a single-flight async lookup. Concurrent callers with the same
+        key await one lookup, whose result stays cached once done. Lookups that fail
+        or are cancelled are discarded, so that they're retried on the next call.
+
+        Must be called from the event loop thread.
+
+        :param key: identifies lookup
+        :param lookup: function starting lookup. Only called if no lookup for
+            ``key`` is cached.
+        :return: lookup result
+        """
+        try:
+            future = self[key]
+        except KeyError:
+            future = asyncio.ensure_future(lookup())
+            future.add_done_callback(partial(self._discard_failed, key))
+            self[key] = future
+        # shield shared lookup from cancellation of any one of its awaiters
+        return await asyncio.shield(future)
+
+    def _discard_failed(self, key: Hashable, future: asyncio.Future) -> None:
+        """Remove failed lookup, so that it's retried on next request.
+
+        :param key: identifies lookup
+        :param future: completed lookup
+        """
+        if future.cancelled() or future.exception() is not None:
+            self.discard(key)
+
+    def __len__(self) -> int:
+        """Get number of entries held, including any that have expired but haven't
+        been evicted yet.
+        """
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries and reset usage counts."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int | float | None]:
+        """Get cache usage statistics.
+
+        :return: hit and miss counts, current and max number of entries, and entry TTL
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+
+class CachingProxy:
+    """Provide a base for wrappers that cache some of an object's methods. Attributes
+    the wrapper doesn't define are passed through to the wrapped object.
+    """
+
+    def __init__(self, wrapped: Any) -> None:  # noqa: ANN401
+        """Initialize proxy.
+
+        :param wrapped: object to wrap
+        """
+        self.wrapped = wrapped
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Pass through attribute access to wrapped object."""
+        return getattr(self.wrapped, name)
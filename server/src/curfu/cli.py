@@ -1,15 +1,34 @@
 """Provide command-line interface to application and associated utilities."""
 
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import TextIO
 
 import click
+from fusor import FUSOR
 
-from curfu import APP_ROOT
+from curfu import APP_ROOT, BLOCKING_WORKERS
+from curfu.batch import (
+    chunked,
+    generate_nomenclature_chunk,
+    init_validation_worker,
+    parse_batch,
+    validate_fusion_chunk,
+)
 from curfu.devtools import DEFAULT_INTERPRO_TYPES
 from curfu.devtools.build_client_types import build_client_types
-from curfu.devtools.build_gene_suggest import GeneSuggestionBuilder
-from curfu.devtools.build_interpro import build_gene_domain_maps
+from curfu.devtools.build_gene_suggest import (
+    GeneSuggestionBuilder,
+    build_gene_index_file,
+)
+from curfu.devtools.build_interpro import (
+    build_domain_index_file,
+    build_gene_domain_maps,
+    get_domain_manifest_path,
+)
+from curfu.sequence_services import CachedSeqRepo
 
 
 @click.command()
@@ -44,7 +63,7 @@ Possible values: {`active_site`, `binding_site`, `conserved_site`, `domain`, `fa
 @click.option(
     "--protein2ipr",
     "-p",
-    help="Path to InterPro-Uniprot protein2ipr.dat file",
+    help="Path to InterPro-Uniprot protein2ipr.dat file, optionally gzipped",
     default=None,
 )
 @click.option(
@@ -54,27 +73,82 @@ Possible values: {`active_site`, `binding_site`, `conserved_site`, `domain`, `fa
     default=None,
 )
 @click.option(
-    "--uniprot", "-u", help="Path to uniprot_sprot_YYYYMMDD.xml", default=None
+    "--uniprot",
+    "-u",
+    help="Path to uniprot_sprot_YYYYMMDD.xml, optionally gzipped",
+    default=None,
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="Number of workers to scan the Gene Normalizer DB and protein2ipr with. Defaults to number of CPUs.",
+)
+@click.option(
+    "--keep-gz",
+    is_flag=True,
+    default=False,
+    help="Store downloaded protein2ipr and UniProtKB data gzipped, and read it as such, rather than unpacking it.",
+)
+@click.option(
+    "--previous",
+    "-P",
+    help="Path to previous domain_lookup_YYYYMMDD.tsv file, to rebuild incrementally from. Its manifest must be alongside it.",
+    default=None,
 )
 def domains(
-    types: str, protein2ipr: str | None, refs: str | None, uniprot: str | None
+    types: str,
+    protein2ipr: str | None,
+    refs: str | None,
+    uniprot: str | None,
+    workers: int | None,
+    keep_gz: bool,
+    previous: str | None,
 ) -> None:
     """Build domain mappings for use in Fusion Curation app.
     \f
     :param str types: comma-separated list
+    :param workers: number of worker processes
+    :param keep_gz: whether to keep downloaded data gzipped
+    :param previous: path to previous domain lookup file
     """
     types_split = set(types.lower().replace(" ", "").split(","))
     protein2ipr_path = Path(protein2ipr) if protein2ipr else None
     uniprot_path = Path(uniprot) if uniprot else None
     refs_path = Path(refs) if refs else None
+    previous_path = Path(previous) if previous else None
+    if previous_path:
+        manifest_path = get_domain_manifest_path(previous_path)
+        if not manifest_path.exists():
+            msg = f"No manifest found for {previous_path} (expected {manifest_path}). Rebuild without --previous."
+            raise click.BadParameter(msg, param_hint="'--previous'")
     build_gene_domain_maps(
         interpro_types=types_split,
         protein_ipr_path=protein2ipr_path,
         uniprot_sprot_path=uniprot_path,
         uniprot_refs_path=refs_path,
+        workers=workers,
+        keep_gz=keep_gz,
+        previous_domains_path=previous_path,
     )
 
 
+@devtools.command()
+@click.option(
+    "--domains",
+    "-d",
+    help="Path to domain_lookup_YYYYMMDD.tsv file. Defaults to newest available file.",
+    default=None,
+)
+def domain_index(domains: str | None) -> None:
+    """Build binary snapshot of domain lookup table for memory-mapped loading.
+    \f
+    :param domains: path to domain lookup file
+    """
+    build_domain_index_file(Path(domains) if domains else None)
+
+
 @devtools.command()
 def genes() -> None:
     """Build gene mappings for use in Fusion Curation gene autocomplete."""
@@ -82,7 +156,100 @@ def genes() -> None:
     builder.build_gene_suggestion_file()
 
 
+@devtools.command()
+@click.option(
+    "--suggestions",
+    "-s",
+    help="Path to gene_suggest_YYYYMMDD.csv file. Defaults to newest available file.",
+    default=None,
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=APP_ROOT / "data",
+    help="Directory to save snapshot to. Defaults to the app data directory.",
+)
+def gene_index(suggestions: str | None, output_dir: Path) -> None:
+    """Build binary snapshot of gene autocomplete index for faster service startup.
+    \f
+    :param suggestions: path to gene suggestions file
+    :param output_dir: directory to save snapshot to
+    """
+    build_gene_index_file(Path(suggestions) if suggestions else None, output_dir)
+
+
 @devtools.command()
 def client_types() -> None:
     """Build type definitions for use in client development."""
     build_client_types()
+
+
+@devtools.command()
+@click.argument(
+    "fusions_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="Path to write NDJSON validation results to. Defaults to stdout.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=os.cpu_count() or 1,
+    help="Number of worker processes to validate with. Defaults to number of CPUs.",
+)
+def validate(fusions_file: Path, output: TextIO, workers: int) -> None:
+    """Validate a file of fusion objects, given as a JSON array or as newline-delimited
+    JSON. Writes one validation result per fusion, in input order, as newline-delimited
+    JSON.
+    \f
+    :param fusions_file: path to fusions file
+    :param output: file to write results to
+    :param workers: number of worker processes
+    """
+    fusions = parse_batch(fusions_file.read_bytes())
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_validation_worker
+    ) as pool:
+        for lines in pool.map(validate_fusion_chunk, chunked(fusions)):
+            output.write(lines)
+
+
+@devtools.command()
+@click.argument(
+    "fusions_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="Path to write NDJSON nomenclature results to. Defaults to stdout.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=BLOCKING_WORKERS,
+    help="Number of threads to generate nomenclature with.",
+)
+def nomenclature(fusions_file: Path, output: TextIO, workers: int) -> None:
+    """Generate nomenclature for a file of fusion objects, given as a JSON array or as
+    newline-delimited JSON. Writes one nomenclature result per fusion, in input order,
+    as newline-delimited JSON.
+    \f
+    :param fusions_file: path to fusions file
+    :param output: file to write results to
+    :param workers: number of threads
+    """
+    fusor = FUSOR()
+    fusor.seqrepo = CachedSeqRepo(fusor.seqrepo)
+    fusions = parse_batch(fusions_file.read_bytes())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for lines in pool.map(
+            partial(generate_nomenclature_chunk, fusor), chunked(fusions)
+        ):
+            output.write(lines)
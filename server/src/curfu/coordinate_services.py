@@ -0,0 +1,103 @@
+"""Provide transcript exon structure lookups shared between coordinate conversions."""
+
+import logging
+
+from cool_seq_tool.mappers.exon_genomic_coords import (
+    ExonGenomicCoordsMapper,
+    _ExonCoord,
+)
+from cool_seq_tool.sources.uta_database import GenomicAlnData
+
+from curfu import EXON_CACHE_SIZE
+from curfu.cache import TTLCache
+
+logger = logging.getLogger("curfu")
+
+
+class CachedExonCoordsMapper(ExonGenomicCoordsMapper):
+    """Provide exon/genomic coordinate conversion backed by a shared cache of
+    transcript exon structures and exon genomic alignments.
+
+    Lookups are single-flight: concurrent conversions on the same transcript await one
+    UTA query rather than each issuing their own. Lookups that fail aren't cached. As
+    a subclass sharing the original mapper's resources, it inherits every conversion
+    unchanged, and only the exon lookups those conversions make are cached.
+
+    Caching is done by overriding the mapper's private exon lookup methods, so the
+    Cool-Seq-Tool version is pinned exactly, and unit tests check that the overridden
+    signatures still match upstream.
+    """
+
+    def __init__(
+        self, mapper: ExonGenomicCoordsMapper, max_size: int = EXON_CACHE_SIZE
+    ) -> None:
+        """Initialize mapper.
+
+        :param mapper: existing mapper to share UTA, SeqRepo, MANE, and liftover
+            resources with
+        :param max_size: max number of exon structures and alignments to hold
+        """
+        super().__init__(
+            mapper.seqrepo_access,
+            mapper.uta_db,
+            mapper.mane_transcript_mappings,
+            mapper.liftover,
+        )
+        self.cache = TTLCache(max_size)
+
+    async def _get_all_exon_coords(
+        self, tx_ac: str, genomic_ac: str | None = None
+    ) -> list[_ExonCoord]:
+        """Get all exon coordinate data for a transcript, querying UTA only if not
+        already cached.
+
+        :param tx_ac: RefSeq transcript accession
+        :param genomic_ac: RefSeq genomic accession. If not provided, use the GRCh38
+            accession associated with ``tx_ac``.
+        :return: exon coordinate data, ordered by ascending exon number
+        """
+        return await self.cache.shared(
+            ("exons", tx_ac, genomic_ac),
+            lambda: super(CachedExonCoordsMapper, self)._get_all_exon_coords(
+                tx_ac, genomic_ac=genomic_ac
+            ),
+        )
+
+    async def _get_genomic_aln_coords(
+        self,
+        tx_ac: str,
+        tx_exon_start: _ExonCoord | None = None,
+        tx_exon_end: _ExonCoord | None = None,
+        gene: str | None = None,
+    ) -> tuple[GenomicAlnData | None, GenomicAlnData | None, str | None]:
+        """Get aligned genomic coordinates for transcript exon start and end, querying
+        UTA only for exons whose alignment isn't already cached.
+
+        :param tx_ac: transcript accession
+        :param tx_exon_start: transcript's exon start coordinates. If not provided,
+            must provide ``tx_exon_end``
+        :param tx_exon_end: transcript's exon end coordinates. If not provided, must
+            provide ``tx_exon_start``
+        :param gene: HGNC gene symbol
+        :return: aligned genomic data for start and end exon, and warning if lookup
+            failed
+        """
+        if tx_exon_start is None and tx_exon_end is None:
+            msg = "Must provide either `tx_exon_start` or `tx_exon_end` or both"
+            logger.warning(msg)
+            return None, None, msg
+        aligned_coords: list[GenomicAlnData | None] = []
+        for exon in (tx_exon_start, tx_exon_end):
+            if exon is None:
+                aligned_coords.append(None)
+                continue
+            aligned_coord, warning = await self.cache.shared(
+                ("alignment", tx_ac, exon.tx_start_i, exon.tx_end_i, gene),
+                lambda exon=exon: self.uta_db.get_alt_ac_start_or_end(
+                    tx_ac, exon.tx_start_i, exon.tx_end_i, gene=gene
+                ),
+            )
+            if not aligned_coord:
+                return None, None, warning
+            aligned_coords.append(aligned_coord)
+        return *aligned_coords, None
@@ -0,0 +1,374 @@
+"""Provide client-ready demo fusion objects.
+
+Rendering a demo means looking up nomenclature (in part from SeqRepo) for each of its
+elements and validating the client models, but the result only depends on the demo
+fusion and the FUSOR version, so each demo is rendered once and served from its
+serialized JSON thereafter.
+"""
+
+import json
+import re
+from pathlib import Path
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+from fusor import FUSOR, examples
+from fusor.exceptions import IDTranslationException
+from fusor.models import (
+    AssayedFusion,
+    CategoricalFusion,
+    FUSORTypes,
+    RegulatoryElement,
+    StructuralElementType,
+)
+from fusor.nomenclature import (
+    gene_nomenclature,
+    reg_element_nomenclature,
+    templated_seq_nomenclature,
+    tx_segment_nomenclature,
+)
+
+from curfu import DEMO_DIR, DETERMINISTIC_DEMO_IDS, LookupServiceError, logger
+from curfu.schemas import (
+    ClientAssayedFusion,
+    ClientCategoricalFusion,
+    ClientGeneElement,
+    ClientLinkerElement,
+    ClientMultiplePossibleGenesElement,
+    ClientTemplatedSequenceElement,
+    ClientTranscriptSegmentElement,
+    ClientUnknownGeneElement,
+    DemoResponse,
+    GeneElement,
+    LinkerElement,
+    MultiplePossibleGenesElement,
+    TemplatedSequenceElement,
+    TranscriptSegmentElement,
+    UnknownGeneElement,
+)
+
+ElementUnion = (
+    TranscriptSegmentElement
+    | LinkerElement
+    | TemplatedSequenceElement
+    | GeneElement
+    | UnknownGeneElement
+    | MultiplePossibleGenesElement
+)
+ClientElementUnion = (
+    ClientTranscriptSegmentElement
+    | ClientLinkerElement
+    | ClientTemplatedSequenceElement
+    | ClientGeneElement
+    | ClientUnknownGeneElement
+    | ClientMultiplePossibleGenesElement
+)
+Fusion = CategoricalFusion | AssayedFusion
+ClientFusion = ClientCategoricalFusion | ClientAssayedFusion
+
+
+def clientify_structural_element(
+    element: ElementUnion,
+    fusor_instance: FUSOR,
+) -> ClientElementUnion:
+    """Add fields required by client to structural element object.
+
+    :param element: a structural element object
+    :param fusor_instance: instantiated FUSOR object, passed down from FastAPI request
+        context
+    :return: client-ready structural element
+    """
+    element_args = element.model_dump()
+    element_args["elementId"] = str(uuid4())
+
+    if element.type == StructuralElementType.UNKNOWN_GENE_ELEMENT:
+        element_args["nomenclature"] = "?"
+        return ClientUnknownGeneElement(**element_args)
+    if element.type == StructuralElementType.MULTIPLE_POSSIBLE_GENES_ELEMENT:
+        element_args["nomenclature"] = "v"
+        return ClientMultiplePossibleGenesElement(**element_args)
+    if element.type == StructuralElementType.LINKER_SEQUENCE_ELEMENT:
+        nm = element.linkerSequence.sequence.root
+        element_args["nomenclature"] = nm
+        return ClientLinkerElement(**element_args)
+    if element.type == StructuralElementType.TEMPLATED_SEQUENCE_ELEMENT:
+        nm = templated_seq_nomenclature(element, fusor_instance.seqrepo)
+        element_args["nomenclature"] = nm
+        element_args["inputChromosome"] = element.region.sequenceReference.id.split(
+            ":"
+        )[1]
+        element_args["inputStart"] = element.region.start
+        element_args["inputEnd"] = element.region.end
+        return ClientTemplatedSequenceElement(**element_args)
+    if element.type == StructuralElementType.GENE_ELEMENT:
+        nm = gene_nomenclature(element)
+        element_args["nomenclature"] = nm
+        return ClientGeneElement(**element_args)
+    if element.type == StructuralElementType.TRANSCRIPT_SEGMENT_ELEMENT:
+        nm = tx_segment_nomenclature(element)
+        element_args["nomenclature"] = nm
+        element_args["inputType"] = "exon_coords"
+        element_args["inputTx"] = element.transcript.split(":")[1]
+        element_args["inputExonStart"] = str(element.exonStart)
+        element_args["inputExonStartOffset"] = str(element.exonStartOffset)
+        element_args["inputExonEnd"] = str(element.exonEnd)
+        element_args["inputExonEndOffset"] = str(element.exonEndOffset)
+        element_args["inputGene"] = element.gene.label
+        return ClientTranscriptSegmentElement(**element_args)
+    msg = "Unknown element type provided"
+    raise ValueError(msg)
+
+
+def clientify_fusion(fusion: Fusion, fusor_instance: FUSOR) -> ClientFusion:
+    """Add client-required properties to fusion object.
+
+    :param fusion: fusion to append to
+    :param fusor_instance: FUSOR object instance provided by FastAPI request context
+    :return: completed client-ready fusion
+    """
+    fusion_args = fusion.model_dump()
+    client_elements = [
+        clientify_structural_element(element, fusor_instance)
+        for element in fusion.structure
+    ]
+    fusion_args["structure"] = client_elements
+
+    if fusion_args.get("regulatoryElement"):
+        reg_element_args = fusion_args["regulatoryElement"]
+        nomenclature = reg_element_nomenclature(
+            RegulatoryElement(**reg_element_args), fusor_instance.seqrepo
+        )
+        reg_element_args["nomenclature"] = nomenclature
+        regulatory_class = fusion_args["regulatoryElement"]["regulatoryClass"]
+        if regulatory_class == "enhancer":
+            reg_element_args["displayClass"] = "Enhancer"
+        else:
+            msg = "Undefined reg element class used in demo"
+            raise ValueError(msg)
+        reg_element_args["elementId"] = str(uuid4())
+        fusion_args["regulatoryElement"] = reg_element_args
+
+    if fusion.type == FUSORTypes.CATEGORICAL_FUSION:
+        if fusion.criticalFunctionalDomains:
+            client_domains = []
+            for domain in fusion.criticalFunctionalDomains:
+                client_domain = domain.model_dump()
+                client_domain["domainId"] = str(uuid4())
+                client_domains.append(client_domain)
+            fusion_args["criticalFunctionalDomains"] = client_domains
+        return ClientCategoricalFusion(**fusion_args)
+    if fusion.type == FUSORTypes.ASSAYED_FUSION:
+        return ClientAssayedFusion(**fusion_args)
+    msg = "Unknown fusion type provided"
+    raise ValueError(msg)
+
+
+# client-side IDs assigned to fusion components when clientified
+CLIENT_ID_FIELDS = ("elementId", "domainId")
+
+FUSION_MODELS: dict[str, type[Fusion]] = {
+    FUSORTypes.CATEGORICAL_FUSION: CategoricalFusion,
+    FUSORTypes.ASSAYED_FUSION: AssayedFusion,
+}
+
+
+# FUSOR examples served as demos, keyed by demo name
+EXAMPLE_DEMOS: dict[str, Fusion] = {
+    "alk": examples.alk,
+    "ewsr1": examples.ewsr1,
+    "bcr_abl1": examples.bcr_abl1,
+    "tpm3_ntrk1": examples.tpm3_ntrk1,
+    "tpm3_pdgfrb": examples.tpm3_pdgfrb,
+    "igh_myc": examples.igh_myc,
+}
+
+# errors expected from clientifying a demo fusion that FUSOR or SeqRepo can't handle
+DEMO_RENDER_ERRORS = (ValueError, KeyError, IndexError, IDTranslationException)
+
+
+def get_example_demos() -> dict[str, Fusion]:
+    """Get fusion examples provided by FUSOR.
+
+    :return: example fusions keyed by name, e.g. ``bcr_abl1``
+    """
+    return dict(EXAMPLE_DEMOS)
+
+
+def load_demo_dir(demo_dir: Path) -> dict[str, Fusion]:
+    """Load demo fusions from a directory of JSON files, each holding one fusion
+    object structured like the FUSOR examples. Files that can't be loaded are logged
+    and skipped.
+
+    :param demo_dir: directory to load ``*.json`` files from. Need not exist.
+    :return: fusions keyed by file name stem
+    """
+    demos = {}
+    for path in sorted(demo_dir.glob("*.json")):
+        fusion = _load_demo_file(path)
+        if fusion is not None:
+            demos[path.stem] = fusion
+    return demos
+
+
+def _load_demo_file(path: Path) -> Fusion | None:
+    """Load demo fusion from JSON file.
+
+    :param path: path to JSON file
+    :return: fusion if file could be loaded, None otherwise
+    """
+    try:
+        with path.open() as f:
+            fusion_args = json.load(f)
+        return FUSION_MODELS[fusion_args["type"]](**fusion_args)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error(f"Unable to load demo fusion from {path}: {e}")
+        return None
+
+
+def _collect_client_ids(obj: dict | list | str | float | None) -> list[str]:
+    """Get client-side IDs from a dumped client fusion.
+
+    :param obj: dumped client fusion, or any value within it
+    :return: IDs, in order of appearance
+    """
+    ids = []
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in CLIENT_ID_FIELDS and isinstance(value, str):
+                ids.append(value)
+            else:
+                ids += _collect_client_ids(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            ids += _collect_client_ids(value)
+    return ids
+
+
+class DemoTemplate:
+    """Store a rendered demo response, split around its client-side IDs so that fresh
+    IDs can be spliced in without re-rendering.
+    """
+
+    def __init__(self, name: str, client_fusion: ClientFusion) -> None:
+        """Serialize demo response.
+
+        :param name: demo name. Used to derive deterministic IDs.
+        :param client_fusion: clientified demo fusion
+        """
+        response = DemoResponse(fusion=client_fusion, warnings=[])
+        data = response.model_dump_json(by_alias=True, exclude_none=True).encode()
+        ids = _collect_client_ids(client_fusion.model_dump())
+        if ids:
+            pattern = b"|".join(re.escape(i.encode()) for i in ids)
+            self.parts = re.split(pattern, data)
+        else:
+            self.parts = [data]
+        self.deterministic_ids = [
+            str(uuid5(NAMESPACE_URL, f"curfu:demo:{name}:{i}")) for i in range(len(ids))
+        ]
+        self.deterministic = self.render(self.deterministic_ids)
+
+    def render(self, ids: list[str]) -> bytes:
+        """Render response with the given client-side IDs.
+
+        :param ids: one ID for each element/domain, in order of appearance
+        :return: JSON-encoded ``DemoResponse``
+        """
+        rendered = [self.parts[0]]
+        for client_id, part in zip(ids, self.parts[1:], strict=True):
+            rendered += [client_id.encode(), part]
+        return b"".join(rendered)
+
+    def render_fresh(self) -> bytes:
+        """Render response with newly generated random client-side IDs.
+
+        :return: JSON-encoded ``DemoResponse``
+        """
+        return self.render([str(uuid4()) for _ in self.deterministic_ids])
+
+
+class DemoService:
+    """Provide client-ready demo fusion responses from a registry of demo fusions.
+
+    The registry holds FUSOR's examples, along with any fusions placed in the local
+    demo directory, which take precedence over examples of the same name.
+    """
+
+    def __init__(
+        self,
+        fusor_instance: FUSOR,
+        demos: dict[str, Fusion] | None = None,
+        deterministic_ids: bool = DETERMINISTIC_DEMO_IDS,
+    ) -> None:
+        """Initialize service.
+
+        :param fusor_instance: FUSOR instance, used to render nomenclature
+        :param demos: demo fusions keyed by name. Defaults to the FUSOR examples plus
+            the contents of the local demo directory.
+        :param deterministic_ids: if True, serve the same element/domain IDs for a demo
+            on every request. Otherwise, generate random IDs for each request, as
+            the client expects of newly created fusion components.
+        """
+        self.fusor = fusor_instance
+        if demos is None:
+            demos = get_example_demos() | load_demo_dir(DEMO_DIR)
+        self.demos = demos
+        self.deterministic_ids = deterministic_ids
+        self._templates: dict[str, DemoTemplate] = {}
+        # reasons demos were dropped from the registry by ``render_all``
+        self.errors: dict[str, str] = {}
+
+    def _render(self, name: str) -> DemoTemplate:
+        """Clientify and serialize demo, if not already done.
+
+        :param name: demo name
+        :return: rendered demo
+        :raise LookupServiceError: if no demo by that name is available
+        """
+        template = self._templates.get(name)
+        if template is None:
+            if name in self.errors:
+                raise LookupServiceError(self.errors[name])
+            if name not in self.demos:
+                msg = f"No demo available for {name}"
+                raise LookupServiceError(msg)
+            client_fusion = clientify_fusion(self.demos[name], self.fusor)
+            template = self._templates.setdefault(
+                name, DemoTemplate(name, client_fusion)
+            )
+        return template
+
+    def render_all(self) -> None:
+        """Render every demo ahead of time. Demos that can't be rendered are removed
+        from the registry, and the error is logged and reported to later requests for
+        them.
+        """
+        for name in list(self.demos):
+            error = self._try_render(name)
+            if error is not None:
+                del self.demos[name]
+                self.errors[name] = error
+
+    def _try_render(self, name: str) -> str | None:
+        """Render demo, logging any failure.
+
+        :param name: demo name
+        :return: error message if demo couldn't be rendered, None otherwise
+        """
+        try:
+            self._render(name)
+        except DEMO_RENDER_ERRORS as e:
+            logger.exception(f"Unable to render demo {name}")
+            return f"Unable to render demo {name}: {e}"
+        return None
+
+    def get_response(self, name: str) -> bytes:
+        """Get client-ready demo response.
+
+        :param name: demo name
+        :return: JSON-encoded ``DemoResponse``
+        :raise LookupServiceError: if no demo by that name is available
+        """
+        template = self._render(name)
+        if self.deterministic_ids:
+            return template.deterministic
+        return template.render_fresh()
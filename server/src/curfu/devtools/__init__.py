@@ -1,7 +1,10 @@
 """Utility functions for application setup."""
 
 import ftplib
+import zlib
 from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO
 
 from curfu import logger
 
@@ -22,5 +25,62 @@ def ftp_download(domain: str, path: str, fname: str, callback: Callable) -> None
         raise Exception(e) from e
 
 
+class _GunzipWriter:
+    """Decompress gzip data into a file as it arrives."""
+
+    def __init__(self, outfile: BinaryIO) -> None:
+        """Initialize writer.
+
+        :param outfile: binary file to write decompressed data to
+        """
+        self.outfile = outfile
+        self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+
+    def write(self, data: bytes) -> None:
+        """Decompress and write a piece of gzip data.
+
+        :param data: next piece of gzip data
+        """
+        self.outfile.write(self._decompressor.decompress(data))
+        # a gzip file may consist of several concatenated members
+        while self._decompressor.eof and self._decompressor.unused_data:
+            data = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+            self.outfile.write(self._decompressor.decompress(data))
+
+    def close(self) -> None:
+        """Write any remaining decompressed data.
+
+        :raise ValueError: if gzip data was truncated
+        """
+        self.outfile.write(self._decompressor.flush())
+        if not self._decompressor.eof:
+            msg = "Downloaded gzip data is incomplete"
+            raise ValueError(msg)
+
+
+def ftp_download_gz(
+    domain: str, path: str, fname: str, outfile_path: Path, decompress: bool = True
+) -> Path:
+    """Acquire gzipped file via FTP, in a single pass over the data.
+
+    :param domain: domain name for remote file host
+    :param path: path within host to desired file
+    :param fname: name of desired gzipped file as provided on host
+    :param outfile_path: path to save file to
+    :param decompress: if True, decompress data as it's downloaded. Otherwise, save
+        gzipped data as is.
+    :return: path to saved file
+    """
+    with outfile_path.open("wb") as f:
+        if decompress:
+            writer = _GunzipWriter(f)
+            ftp_download(domain, path, fname, writer.write)
+            writer.close()
+        else:
+            ftp_download(domain, path, fname, f.write)
+    return outfile_path
+
+
 # default interpro entry types to try to gather for domains
 DEFAULT_INTERPRO_TYPES = "Active_site,Binding_site,Conserved_site,Domain,Family"
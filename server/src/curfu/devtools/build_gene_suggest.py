@@ -12,6 +12,8 @@ from gene.database import create_db
 from gene.schemas import RecordType
 
 from curfu import APP_ROOT, logger
+from curfu.gene_services import GeneService
+from curfu.utils import get_data_file
 
 
 class GeneSuggestionBuilder:
@@ -150,3 +152,34 @@ class GeneSuggestionBuilder:
         msg = f"Built gene suggestions table in {(stop - start):.5f} seconds."
         click.echo(msg)
         logger.info(msg)
+
+
+def build_gene_index_file(
+    suggestions_file: Path | None = None, output_dir: Path = APP_ROOT / "data"
+) -> Path:
+    """Build a binary snapshot of the gene suggestion index, which the gene service
+    loads in preference to re-parsing the suggestions table as long as that table
+    hasn't changed since.
+
+    :param suggestions_file: path to gene suggestions table to index. If not provided,
+        will use newest available file in expected location.
+    :param output_dir: The directory where the snapshot file will be saved. Default is
+        the 'data' directory within the application root.
+    :return: path to saved snapshot
+    """
+    start = timer()
+
+    if not suggestions_file:
+        suggestions_file = get_data_file("gene_suggest")
+    genes = GeneService(suggestions_file=suggestions_file)
+    # named for the suggestions file rather than the build date, so that rebuilding
+    # from an older file doesn't replace the snapshot of a newer one
+    version = suggestions_file.stem.removeprefix("gene_suggest_")
+    outfile_path = output_dir / f"gene_index_{version}.bin"
+    genes.save_index(outfile_path)
+
+    stop = timer()
+    msg = f"Built gene index snapshot from {suggestions_file.name} in {(stop - start):.5f} seconds."
+    click.echo(msg)
+    logger.info(msg)
+    return outfile_path
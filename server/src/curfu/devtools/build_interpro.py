@@ -3,17 +3,41 @@
 import csv
 import datetime
 import gzip
-import shutil
+import hashlib
+import json
+import os
+import resource
+import sys
+import threading
 import xml.etree.ElementTree as ET  # noqa: N817
+from collections import deque
+from collections.abc import Container, Iterable, Iterator
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 from timeit import default_timer as timer
+from typing import BinaryIO
 
 import click
+from botocore.client import BaseClient
 from gene.database import create_db
 from gene.query import QueryHandler
 
 from curfu import APP_ROOT, logger
-from curfu.devtools import ftp_download
+from curfu.devtools import ftp_download, ftp_download_gz
+from curfu.domain_services import (
+    DOMAIN_INDEX_MAGIC,
+    DOMAIN_INDEX_VERSION,
+    DomainIndex,
+)
+from curfu.snapshot import write_snapshot
+from curfu.utils import get_data_file
 
 # uniprot accession id -> (normalized ID, normalized label)
 UniprotRefs = dict[str, tuple[str, str]]
@@ -21,75 +45,144 @@ UniprotRefs = dict[str, tuple[str, str]]
 # (uniprot accession id, ncbi gene id) -> refseq NP_ accession
 UniprotAcRefs = dict[tuple[str, str], str]
 
+# UniProt accession, InterPro ID, domain name, domain start, domain end
+ProteinIprRow = tuple[str, str, str, str, str]
+
+# bytes of protein2ipr.dat filtered by a worker process at a time
+PROTEIN_IPR_CHUNK_SIZE = 64 * 1024 * 1024
+
+# UniProtKB XML element tags
+UNIPROT_ENTRY_TAG = "{http://uniprot.org/uniprot}entry"
+UNIPROT_ACCESSION_TAG = "{http://uniprot.org/uniprot}accession"
+UNIPROT_DB_REFERENCE_TAG = "{http://uniprot.org/uniprot}dbReference"
+UNIPROT_MOLECULE_TAG = "{http://uniprot.org/uniprot}molecule"
+UNIPROT_PROPERTY_TAG = "{http://uniprot.org/uniprot}property"
+
 # consistent formatting for saved files
 DATE_FMT = "%Y%m%d"
 
+# location of current UniProtKB release
+UNIPROT_FTP_DOMAIN = "ftp.uniprot.org"
+UNIPROT_FTP_PATH = "pub/databases/uniprot/current_release/knowledgebase/complete/"
+
+
+def download_protein2ipr(output_dir: Path, keep_gz: bool = False) -> Path:
+    """Download and store Uniprot-InterPro translation table
 
-def download_protein2ipr(output_dir: Path) -> None:
-    """Download, unpack, and store Uniprot-InterPro translation table
     :param output_dir: location to save file within
+    :param keep_gz: if True, store the table gzipped, as downloaded. Otherwise, unpack
+        it while downloading.
+    :return: path to saved file
     """
     logger.info("Retrieving Uniprot mapping data from InterPro")
 
-    gz_file_path = output_dir / "protein2ipr.dat.gz"
-    with gz_file_path.open("w") as fp:
-        ftp_download(
-            "ftp.ebi.ac.uk",
-            "pub/databases/interpro",
-            "protein2ipr.dat.gz",
-            lambda data: fp.write(data),
-        )
-
     today = datetime.datetime.strftime(
         datetime.datetime.now(tz=datetime.timezone.utc), DATE_FMT
     )
-    outfile_path = output_dir / f"protein2ipr_{today}.dat"
-    with outfile_path.open("wb") as f_out, gzip.open(gz_file_path, "rb") as f_in:
-        shutil.copyfileobj(f_in, f_out)
-    gz_file_path.unlink()
-    if not outfile_path.exists():
-        raise Exception
+    outfile_path = output_dir / f"protein2ipr_{today}.dat{'.gz' if keep_gz else ''}"
+    ftp_download_gz(
+        "ftp.ebi.ac.uk",
+        "pub/databases/interpro",
+        "protein2ipr.dat.gz",
+        outfile_path,
+        decompress=not keep_gz,
+    )
 
     logger.info("Successfully retrieved UniProt mapping data for Interpro")
+    return outfile_path
+
+
+def _scan_uniprot_ids(
+    client: BaseClient, table_name: str, segment: int, total_segments: int
+) -> set[str]:
+    """Collect UniProt references from one segment of a parallel scan of the Gene
+    Normalizer table. Filtering happens server-side, and only the attribute needed is
+    returned, so little more than the references themselves is transferred.
+
+    :param client: low-level DynamoDB client. Unlike table resources, clients are safe
+        to share between threads.
+    :param table_name: name of Gene Normalizer table
+    :param segment: index of segment to scan
+    :param total_segments: number of segments table is scanned in
+    :return: UniProt references, eg ``uniprot:q9upv7``
+    """
+    uniprot_ids = set()
+    paginator = client.get_paginator("scan")
+    for page in paginator.paginate(
+        TableName=table_name,
+        Segment=segment,
+        TotalSegments=total_segments,
+        ProjectionExpression="label_and_type",
+        FilterExpression="item_type = :item_type AND begins_with(label_and_type, :prefix)",
+        ExpressionAttributeValues={
+            ":item_type": {"S": "associated_with"},
+            ":prefix": {"S": "uniprot"},
+        },
+    ):
+        for item in page["Items"]:
+            uniprot_ids.add(item["label_and_type"]["S"].split("##")[0])
+    return uniprot_ids
+
+
+# per-thread Gene Normalizer query handlers, as DynamoDB resources can't be shared
+_thread_state = threading.local()
+# boto3 sessions aren't safe to create resources from concurrently
+_query_handler_lock = threading.Lock()
+
+
+def _normalize_uniprot_id(uniprot_id: str) -> tuple[str, str]:
+    """Normalize a UniProt reference to the gene it's associated with. Run in a
+    worker thread.
+
+    :param uniprot_id: UniProt reference, eg ``uniprot:q9upv7``
+    :return: normalized concept ID and label of associated gene
+    """
+    query_handler = getattr(_thread_state, "query_handler", None)
+    if query_handler is None:
+        with _query_handler_lock:
+            query_handler = QueryHandler(create_db())
+        _thread_state.query_handler = query_handler
+    norm_response = query_handler.normalize(uniprot_id)
+    return norm_response.gene.gene_id, norm_response.gene.label
 
 
-def get_uniprot_refs() -> UniprotRefs:
+def get_uniprot_refs(workers: int | None = None) -> UniprotRefs:
     """Produce list of all Uniprot IDs referenced in the Gene Normalizer along with
     the normalized label and concept ID of the associated gene. Used in conjunction
     with Interpro's provided Uniprot mappings to identify possible functional
     domains for genes.
 
+    The table is read as a parallel scan, with one segment per worker, and each
+    distinct reference is then normalized once, concurrently. Works against DynamoDB
+    Local as well, by way of the Gene Normalizer's usual DB configuration.
+
+    :param workers: number of segments to scan in, and threads to normalize with.
+        Defaults to number of CPUs.
     :return: Dict keying uniprot accession ID (upper-case) to tuple of normalized ID and
     label, eg {'Q9UPV7': ('hgnc:29180', 'PHF24')}
     """
     start = timer()
+    workers = workers or os.cpu_count() or 1
 
     # scanning on DynamoDB_Local is extremely slow
     q = QueryHandler(create_db())  # must be dynamodb
     genes = q.db.genes
 
-    uniprot_ids: UniprotRefs = {}
-    last_evaluated_key = None
-    while True:
-        if last_evaluated_key:
-            response = genes.scan(ExclusiveStartKey=last_evaluated_key)
-        else:
-            response = genes.scan()
-        last_evaluated_key = response.get("LastEvaluatedKey")
-        records = response["Items"]
-        for record in records:
-            if record["item_type"] != "associated_with":
-                continue
-            if record["label_and_type"].startswith("uniprot"):
-                uniprot_id = record["label_and_type"].split("##")[0]
-                if uniprot_id in uniprot_ids:
-                    continue
-                norm_response = q.normalize(uniprot_id)
-                norm_id = norm_response.gene.gene_id
-                norm_label = norm_response.gene.label
-                uniprot_ids[uniprot_id] = (norm_id, norm_label)
-        if not last_evaluated_key:
-            break
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        segments = pool.map(
+            partial(_scan_uniprot_ids, genes.meta.client, genes.name),
+            range(workers),
+            repeat(workers),
+        )
+        uniprot_refs = sorted(set().union(*segments))
+        msg = f"Scanned {len(uniprot_refs)} uniprot refs in {(timer() - start):.5f} seconds."
+        logger.info(msg)
+        click.echo(msg)
+        normalized = pool.map(_normalize_uniprot_id, uniprot_refs)
+        uniprot_ids: UniprotRefs = {
+            uniprot_ref.split(":")[1].upper(): norm_values
+            for uniprot_ref, norm_values in zip(uniprot_refs, normalized, strict=True)
+        }
 
     stop = timer()
     msg = f"Collected valid uniprot refs in {(stop - start):.5f} seconds."
@@ -101,193 +194,642 @@ def get_uniprot_refs() -> UniprotRefs:
     )
     save_path = APP_ROOT / "data" / f"uniprot_refs_{today}.tsv"
     with save_path.open("w") as out:
-        for uniprot_ref, data in uniprot_ids.items():
-            out.write(f"{uniprot_ref.split(':')[1].upper()}\t{data[0]}\t{data[1]}\n")
+        for uniprot_ac, data in uniprot_ids.items():
+            out.write(f"{uniprot_ac}\t{data[0]}\t{data[1]}\n")
 
     return uniprot_ids
 
 
-def download_uniprot_sprot(output_dir: Path) -> Path:
+def download_uniprot_sprot(output_dir: Path, keep_gz: bool = False) -> Path:
     """Retrieve UniProtKB data.
+
     :param output_dir: directory to save UniProtKB data in.
+    :param keep_gz: if True, store the data gzipped, as downloaded. Otherwise, unpack
+        it while downloading.
+    :return: path to saved file
     """
     logger.info("Retrieving UniProtKB data.")
 
-    gz_file_path = output_dir / "uniprot_sprot.xml.gz"
-    with gz_file_path.open("w") as fp:
-        ftp_download(
-            "ftp.uniprot.org",
-            "pub/databases/uniprot/current_release/knowledgebase/complete/",
-            "uniprot_sprot.xml.gz",
-            lambda data: fp.write(data),
-        )
     today = datetime.datetime.strftime(
         datetime.datetime.now(tz=datetime.timezone.utc), DATE_FMT
     )
-    outfile_path = output_dir / f"uniprot_sprot_{today}.dat"
-    with outfile_path.open("wb") as f_out, gzip.open(gz_file_path, "rb") as f_in:
-        shutil.copyfileobj(f_in, f_out)
-    gz_file_path.unlink()
-    if not outfile_path.exists():
-        raise Exception
+    outfile_path = output_dir / f"uniprot_sprot_{today}.dat{'.gz' if keep_gz else ''}"
+    ftp_download_gz(
+        UNIPROT_FTP_DOMAIN,
+        UNIPROT_FTP_PATH,
+        "uniprot_sprot.xml.gz",
+        outfile_path,
+        decompress=not keep_gz,
+    )
 
     logger.info("Successfully retrieved UniProtKB data.")
     return outfile_path
 
 
+def get_uniprot_release() -> str:
+    """Identify the current UniProtKB release from its release date file, without
+    downloading any of its data.
+
+    :return: contents of release date file, naming the release of each dataset
+    """
+    data = []
+    ftp_download(UNIPROT_FTP_DOMAIN, UNIPROT_FTP_PATH, "reldate.txt", data.append)
+    return b"".join(data).decode().strip()
+
+
+def _is_gzipped(path: Path) -> bool:
+    """Check whether file is gzipped, going by its extension.
+
+    :param path: path to file
+    :return: True if file is gzipped
+    """
+    return path.suffix == ".gz"
+
+
+def filter_protein_ipr_lines(
+    lines: Iterable[bytes],
+    domain_ids: Container[bytes],
+    uniprot_acs: Container[bytes],
+) -> list[ProteinIprRow]:
+    """Pick out protein2ipr rows for relevant UniProt accessions and InterPro IDs.
+
+    The accession at the start of each raw line is checked before the line is split
+    into fields. Rows are grouped by accession, so only the first row in each group
+    needs the set lookup, and irrelevant groups are never split at all.
+
+    :param lines: raw lines from protein2ipr.dat
+    :param domain_ids: InterPro IDs to keep rows for
+    :param uniprot_acs: UniProt accessions to keep rows for
+    :return: rows for relevant accessions and InterPro IDs, in input order
+    """
+    rows = []
+    last_ac = None
+    relevant = False
+    for line in lines:
+        uniprot_ac = line[: line.find(b"\t")]
+        if uniprot_ac != last_ac:
+            last_ac = uniprot_ac
+            relevant = uniprot_ac in uniprot_acs
+        if not relevant:
+            continue
+        fields = line.rstrip(b"\r\n").split(b"\t")
+        if fields[1] in domain_ids:
+            rows.append(
+                (
+                    fields[0].decode(),
+                    fields[1].decode(),
+                    fields[2].decode(),
+                    fields[4].decode(),
+                    fields[5].decode(),
+                )
+            )
+    return rows
+
+
+# filter sets held by each protein2ipr worker process
+_worker_domain_ids: frozenset[bytes] = frozenset()
+_worker_uniprot_acs: frozenset[bytes] = frozenset()
+
+
+def _init_protein_ipr_worker(
+    domain_ids: frozenset[bytes], uniprot_acs: frozenset[bytes]
+) -> None:
+    """Store filter sets in a worker process, so that they're sent to each process
+    once rather than along with every byte range.
+
+    :param domain_ids: InterPro IDs to keep rows for
+    :param uniprot_acs: UniProt accessions to keep rows for
+    """
+    global _worker_domain_ids, _worker_uniprot_acs
+    _worker_domain_ids = domain_ids
+    _worker_uniprot_acs = uniprot_acs
+
+
+def _read_lines_until(f: BinaryIO, end: int) -> Iterator[bytes]:
+    """Read lines starting before a byte offset. The last line may run past it.
+
+    :param f: file positioned at the start of a line
+    :param end: byte offset to stop at
+    :return: iterator over raw lines
+    """
+    position = f.tell()
+    for line in f:
+        if position >= end:
+            break
+        position += len(line)
+        yield line
+
+
+def _filter_protein_ipr_range(path: Path, start: int, end: int) -> list[ProteinIprRow]:
+    """Filter the protein2ipr lines that start within a byte range. Run in a worker
+    process.
+
+    :param path: path to protein2ipr.dat
+    :param start: byte offset of range start
+    :param end: byte offset of range end
+    :return: relevant rows within range, in file order
+    """
+    with path.open("rb") as f:
+        if start:
+            # finish line in progress, which belongs to the preceding range
+            f.seek(start - 1)
+            f.readline()
+        return filter_protein_ipr_lines(
+            _read_lines_until(f, end), _worker_domain_ids, _worker_uniprot_acs
+        )
+
+
+def _filter_protein_ipr_block(block: bytes) -> list[ProteinIprRow]:
+    """Filter a block of complete protein2ipr lines. Run in a worker process.
+
+    :param block: raw lines
+    :return: relevant rows within block, in order
+    """
+    return filter_protein_ipr_lines(
+        block.split(b"\n"), _worker_domain_ids, _worker_uniprot_acs
+    )
+
+
+def _submit_protein_ipr_ranges(
+    pool: Executor, path: Path
+) -> Iterator[tuple[Future[list[ProteinIprRow]], int]]:
+    """Submit byte ranges of uncompressed protein2ipr file for filtering.
+
+    :param pool: worker pool
+    :param path: path to protein2ipr.dat
+    :return: iterator over pending results, in file order, with the number of file
+        bytes covered by each
+    """
+    size = path.stat().st_size
+    for start in range(0, size, PROTEIN_IPR_CHUNK_SIZE):
+        end = min(start + PROTEIN_IPR_CHUNK_SIZE, size)
+        yield pool.submit(_filter_protein_ipr_range, path, start, end), end - start
+
+
+def _submit_protein_ipr_gz_blocks(
+    pool: Executor, path: Path
+) -> Iterator[tuple[Future[list[ProteinIprRow]], int]]:
+    """Decompress gzipped protein2ipr file, submitting blocks of lines for filtering.
+    Compressed data can't be split at arbitrary offsets, so it's read in sequence
+    here, while workers filter the blocks already read.
+
+    :param pool: worker pool
+    :param path: path to protein2ipr.dat.gz
+    :return: iterator over pending results, in file order, with the number of
+        compressed file bytes covered by each
+    """
+    with path.open("rb") as raw, gzip.open(raw, "rb") as f:
+        position = 0
+        remainder = b""
+        while data := f.read(PROTEIN_IPR_CHUNK_SIZE):
+            data = remainder + data
+            cut = data.rfind(b"\n") + 1
+            remainder = data[cut:]
+            yield (
+                pool.submit(_filter_protein_ipr_block, data[:cut]),
+                raw.tell() - position,
+            )
+            position = raw.tell()
+        if remainder:
+            yield pool.submit(_filter_protein_ipr_block, remainder), 0
+
+
 def get_interpro_uniprot_rels(
     protein_ipr_path: Path | None,
     output_dir: Path,
     domain_ids: set[str],
     uniprot_refs: dict,
-) -> dict[str, dict[str, tuple[str, str, str, str, str]]]:
+    workers: int | None = None,
+    keep_gz: bool = False,
+) -> dict[tuple[str, str], dict[str, tuple[str, str, str, str, str]]]:
     """Process InterPro to UniProtKB relations, using UniProt references to connect
     genes with domains
 
-    :param protein_ipr_path: path to protein2ipr_YYYYMMDD.dat if given
+    The file is split into byte ranges (or, if gzipped, into blocks of lines as it's
+    decompressed) that are filtered in parallel, and results are merged in file order,
+    so output is the same as for a sequential scan.
+
+    :param protein_ipr_path: path to protein2ipr_YYYYMMDD.dat, optionally gzipped, if
+        given
     :param output_dir: Path to save output data in
     :param domain_ids: InterPro domain IDs to use
     :param uniprot_refs: UniProt references from gene normalizer DB
-    :return: Dict mapping Uniprot accession ID to collected domain data,
+    :param workers: number of worker processes. Defaults to number of CPUs.
+    :param keep_gz: if downloading protein2ipr, store and read it gzipped
+    :return: Dict mapping Uniprot accession ID and gene ID to collected domain data
     """
     if not protein_ipr_path:
-        download_protein2ipr(output_dir)
-        today = datetime.datetime.strftime(
-            datetime.datetime.now(tz=datetime.timezone.utc), DATE_FMT
-        )
-        protein_ipr_path = output_dir / f"protein2ipr_{today}.dat"
-    protein_ipr = protein_ipr_path.open()
-    protein_ipr_reader = csv.reader(protein_ipr, delimiter="\t")
+        protein_ipr_path = download_protein2ipr(output_dir, keep_gz)
+    start_time = timer()
 
+    if _is_gzipped(protein_ipr_path):
+        submit_protein_ipr = _submit_protein_ipr_gz_blocks
+    else:
+        submit_protein_ipr = _submit_protein_ipr_ranges
+    size = protein_ipr_path.stat().st_size
+    # bound the data read ahead of the results being merged
+    max_pending = 2 * (workers or os.cpu_count() or 1)
     interpro_uniprot = {}
-    for row in protein_ipr_reader:
-        # FIX HERE
-        domain_id = row[1]
-        if domain_id in domain_ids:
-            uniprot_ac = row[0]
+
+    def merge(future: Future[list[ProteinIprRow]]) -> None:
+        for uniprot_ac, domain_id, domain_name, dom_start, dom_end in future.result():
             normed_values = uniprot_refs.get(uniprot_ac)
             if not normed_values:
                 continue
-
             gene_id, gene_label = normed_values
-            key = (uniprot_ac, gene_id)
-            domain_name = row[2]
-            start = row[4]
-            end = row[5]
-            value = (gene_label, domain_id, domain_name, start, end)
-            if key not in interpro_uniprot:
-                interpro_uniprot[key] = {domain_id: value}
-            elif domain_id not in interpro_uniprot[key]:
-                interpro_uniprot[key][domain_id] = value
-
-    protein_ipr.close()
+            domains = interpro_uniprot.setdefault((uniprot_ac, gene_id), {})
+            if domain_id not in domains:
+                domains[domain_id] = (
+                    gene_label,
+                    domain_id,
+                    domain_name,
+                    dom_start,
+                    dom_end,
+                )
+
+    with (
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_protein_ipr_worker,
+            initargs=(
+                frozenset(domain_id.encode() for domain_id in domain_ids),
+                frozenset(uniprot_ac.encode() for uniprot_ac in uniprot_refs),
+            ),
+        ) as pool,
+        click.progressbar(length=size, label="Scanning protein2ipr") as progress,
+    ):
+        pending: deque[tuple[Future[list[ProteinIprRow]], int]] = deque()
+        for submitted in submit_protein_ipr(pool, protein_ipr_path):
+            pending.append(submitted)
+            if len(pending) >= max_pending:
+                future, n_bytes = pending.popleft()
+                merge(future)
+                progress.update(n_bytes)
+        while pending:
+            future, n_bytes = pending.popleft()
+            merge(future)
+            progress.update(n_bytes)
+
+    elapsed = timer() - start_time
+    msg = (
+        f"Scanned {size / 1e6:.1f} MB of protein2ipr in {elapsed:.5f} seconds "
+        f"({size / 1e6 / elapsed:.1f} MB/s)."
+    )
+    logger.info(msg)
+    click.echo(msg)
     msg = f"Extracted {len(interpro_uniprot)} UniProt-InterPro references"
     click.echo(msg)
     return interpro_uniprot
 
 
+def _get_entry_refseq_acs(entry: ET.Element) -> dict[str, str]:
+    """Get RefSeq protein accessions for the genes coding a UniProtKB entry's protein.
+
+    Where isoforms are distinguished, the RefSeq accession for the canonical sequence
+    is preferred.
+
+    :param entry: UniProtKB ``entry`` element
+    :return: RefSeq protein accession keyed by HGNC gene ID
+    """
+    refseq_acs = {}
+    refseq_ac = ""
+    gene_id = ""
+    molecule_id = ""
+    nucleotide_seq_id = ""
+    for node in entry.iter():
+        tag = node.tag
+        if tag == UNIPROT_DB_REFERENCE_TAG:
+            node_type = node.get("type")
+            if node_type == "RefSeq" and not molecule_id:
+                refseq_id = node.get("id")
+                if refseq_id.startswith("NP_"):
+                    refseq_ac = refseq_id
+            elif node_type == "HGNC":
+                gene_id = node.get("id").lower()
+        elif refseq_ac and tag == UNIPROT_MOLECULE_TAG:
+            tmp_molecule_id = node.get("id")
+            if "-" in tmp_molecule_id:
+                if tmp_molecule_id.endswith("-1"):  # canonical sequence
+                    molecule_id = tmp_molecule_id
+            else:
+                # TODO does this happen?
+                molecule_id = tmp_molecule_id
+        elif (
+            refseq_ac
+            and not molecule_id
+            and not nucleotide_seq_id
+            and tag == UNIPROT_PROPERTY_TAG
+        ):
+            nucleotide_seq_id = node.get("value")
+        if refseq_ac and gene_id and (molecule_id or nucleotide_seq_id):
+            refseq_acs.setdefault(gene_id, refseq_ac)
+    return refseq_acs
+
+
+# bytes of UniProtKB XML fed to the parser at a time
+UNIPROT_XML_CHUNK_SIZE = 1024 * 1024
+
+
+class _RelevantEntryBuilder:
+    """Build UniProtKB ``entry`` elements for relevant proteins only, as an XML parser
+    target.
+
+    Entries begin with their primary accession, so an entry's start tag is held back
+    until that accession has been read. Relevant entries are then replayed into a tree
+    builder, while no elements are created for the rest of an irrelevant entry.
+    """
+
+    def __init__(self, relevant_proteins: Container[str]) -> None:
+        """Initialize target.
+
+        :param relevant_proteins: UniProt accessions to build entries for
+        """
+        self.relevant_proteins = relevant_proteins
+        # built entries, to be taken by the caller as parsing proceeds
+        self.entries: list[ET.Element] = []
+        self.n_entries = 0
+        self._builder: ET.TreeBuilder | None = None
+        self._entry_attrib: dict[str, str] | None = None
+        self._accession_attrib: dict[str, str] | None = None
+        self._accession_text: list[str] = []
+        self._skipping = False
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        """Handle element start.
+
+        :param tag: element tag
+        :param attrib: element attributes
+        """
+        if self._builder is not None:
+            self._builder.start(tag, attrib)
+        elif tag == UNIPROT_ENTRY_TAG:
+            self._entry_attrib = attrib
+        elif (
+            tag == UNIPROT_ACCESSION_TAG
+            and self._entry_attrib is not None
+            and not self._skipping
+        ):
+            self._accession_attrib = attrib
+
+    def data(self, data: str) -> None:
+        """Handle element text.
+
+        :param data: text
+        """
+        if self._builder is not None:
+            self._builder.data(data)
+        elif self._accession_attrib is not None:
+            self._accession_text.append(data)
+
+    def end(self, tag: str) -> None:
+        """Handle element end.
+
+        :param tag: element tag
+        """
+        if tag == UNIPROT_ENTRY_TAG:
+            self.n_entries += 1
+            if self._builder is not None:
+                self._builder.end(tag)
+                self.entries.append(self._builder.close())
+            self._builder = None
+            self._entry_attrib = None
+            self._skipping = False
+        elif self._builder is not None:
+            self._builder.end(tag)
+        elif self._accession_attrib is not None:
+            accession = "".join(self._accession_text)
+            if accession in self.relevant_proteins:
+                self._builder = ET.TreeBuilder()
+                self._builder.start(UNIPROT_ENTRY_TAG, self._entry_attrib)
+                self._builder.start(UNIPROT_ACCESSION_TAG, self._accession_attrib)
+                self._builder.data(accession)
+                self._builder.end(UNIPROT_ACCESSION_TAG)
+            else:
+                self._skipping = True
+            self._accession_attrib = None
+            self._accession_text = []
+
+    def close(self) -> None:
+        """Finish parsing."""
+
+
+def _get_peak_rss_mb() -> float:
+    """Get peak resident memory use of this process.
+
+    :return: peak resident set size, in MB
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS, and in kilobytes elsewhere
+    return peak_rss / 1e6 if sys.platform == "darwin" else peak_rss / 1e3
+
+
 def get_protein_accessions(
-    relevant_proteins: set[str], uniprot_sprot_path: Path | None
+    relevant_proteins: set[str], uniprot_sprot_path: Path | None, keep_gz: bool = False
 ) -> dict[tuple[str, str], str]:
     """Scan uniprot_sprot.xml and extract RefSeq protein accession identifiers for
     relevant Uniprot accessions.
+
+    Elements are only built for entries whose primary (first) accession is relevant,
+    and each of those is dropped once its accessions are extracted, so memory use
+    doesn't grow with the document.
+
     :param relevant_proteins: captured Uniprot accessions, for proteins coded
         by human genes and containing InterPro functional domains
-    :param uniprot_sprot_path: path to local uniprot_sprot.xml file.
+    :param uniprot_sprot_path: path to local uniprot_sprot.xml file, optionally
+        gzipped.
+    :param keep_gz: if downloading UniProtKB data, store and read it gzipped
     :return: Dict where keys are tuple containing Uniprot accession ID and NCBI gene ID,
         and values are known RefSeq protein accessions
     """
     start = timer()
     if not uniprot_sprot_path:
-        uniprot_sprot_path = download_uniprot_sprot(APP_ROOT / "data")
-    parser = ET.iterparse(uniprot_sprot_path, ("start", "end"))  # noqa: S314
+        uniprot_sprot_path = download_uniprot_sprot(APP_ROOT / "data", keep_gz)
+    if _is_gzipped(uniprot_sprot_path):
+        uniprot_sprot = gzip.open(uniprot_sprot_path, "rb")
+    else:
+        uniprot_sprot = uniprot_sprot_path.open("rb")
+
     accessions_map = {}
-    cur_ac = ""
-    cur_refseq_ac = ""
-    cur_gene_id = ""
-    cur_molecule_id = ""
-    cur_nucleotide_seq_id = ""
-    for _, node in parser:
-        if node.tag == "{http://uniprot.org/uniprot}entry":
-            cur_refseq_ac = ""
-            cur_gene_id = ""
-            cur_ac = ""
-            cur_molecule_id = ""
-            cur_nucleotide_seq_id = ""
-        elif (
-            (node.tag == "{http://uniprot.org/uniprot}accession")
-            and (not cur_ac)
-            and node.text
-        ):
-            tmp_ac = node.text
-            if tmp_ac in relevant_proteins:
-                cur_ac = tmp_ac
-        elif cur_ac and (node.tag == "{http://uniprot.org/uniprot}dbReference"):
-            node_type = node.get("type")
-            if node_type == "RefSeq" and not cur_molecule_id:
-                tmp_refseq_id = node.get("id")
-                if tmp_refseq_id.startswith("NP_"):
-                    cur_refseq_ac = tmp_refseq_id
-            elif node_type == "HGNC":
-                cur_gene_id = node.get("id").lower()
-        elif (
-            cur_ac
-            and cur_refseq_ac
-            and (node.tag == "{http://uniprot.org/uniprot}molecule")
-        ):
-            tmp_molecule_id = node.get("id")
-            if "-" in tmp_molecule_id:
-                if tmp_molecule_id.endswith("-1"):  # canonical sequence
-                    cur_molecule_id = tmp_molecule_id
-            else:
-                # TODO does this happen?
-                cur_molecule_id = tmp_molecule_id
-        elif (
-            cur_ac
-            and cur_refseq_ac
-            and (not cur_molecule_id)
-            and (not cur_nucleotide_seq_id)
-            and (node.tag == "{http://uniprot.org/uniprot}property")
-        ):
-            cur_nucleotide_seq_id = node.get("value")
-        if all(
-            [
-                cur_ac,
-                cur_refseq_ac,
-                cur_gene_id,
-                (cur_molecule_id or cur_nucleotide_seq_id),
-                (cur_ac, cur_gene_id) not in accessions_map,
-            ]
-        ):
-            accessions_map[(cur_ac, cur_gene_id)] = cur_refseq_ac
-            # cur_ac = ""  # prevent further updates in this record
+    target = _RelevantEntryBuilder(relevant_proteins)
+    parser = ET.XMLParser(target=target)  # noqa: S314
+
+    def take_entries() -> None:
+        for entry in target.entries:
+            uniprot_ac = entry.findtext(UNIPROT_ACCESSION_TAG)
+            for gene_id, refseq_ac in _get_entry_refseq_acs(entry).items():
+                accessions_map.setdefault((uniprot_ac, gene_id), refseq_ac)
+        target.entries.clear()
+
+    with uniprot_sprot:
+        while data := uniprot_sprot.read(UNIPROT_XML_CHUNK_SIZE):
+            parser.feed(data)
+            take_entries()
+    parser.close()
+    take_entries()
 
     stop = timer()
-    msg = f"Retrieved accession values in {(stop - start):.5f} seconds."
+    msg = (
+        f"Retrieved accession values in {(stop - start):.5f} seconds "
+        f"({target.n_entries / (stop - start):.0f} entries/s, peak RSS "
+        f"{_get_peak_rss_mb():.0f} MB)."
+    )
     logger.info(msg)
     click.echo(msg)
     return accessions_map
 
 
+def get_domain_manifest_path(domains_path: Path) -> Path:
+    """Get path to manifest written alongside a gene-to-domain lookup table.
+
+    :param domains_path: path to domain_lookup_YYYYMMDD.tsv
+    :return: path to manifest, eg domain_lookup_YYYYMMDD.manifest.json
+    """
+    return domains_path.with_name(f"{domains_path.stem}.manifest.json")
+
+
+def _get_uniprot_digests(
+    interpro_uniprot: dict[tuple[str, str], dict[str, tuple[str, str, str, str, str]]],
+) -> dict[str, str]:
+    """Fingerprint the genes and domains associated with each UniProt accession, to
+    tell which accessions changed between builds.
+
+    :param interpro_uniprot: domain data keyed by UniProt accession and gene ID, as
+        produced by ``get_interpro_uniprot_rels``
+    :return: digest keyed by UniProt accession
+    """
+    by_accession: dict[str, list] = {}
+    for (uniprot_ac, gene_id), domains in interpro_uniprot.items():
+        by_accession.setdefault(uniprot_ac, []).append(
+            [gene_id, sorted(domains.values())]
+        )
+    return {
+        uniprot_ac: hashlib.sha256(json.dumps(sorted(values)).encode()).hexdigest()
+        for uniprot_ac, values in by_accession.items()
+    }
+
+
+def _get_uniprot_sprot_digest(uniprot_sprot_path: Path) -> str:
+    """Fingerprint local UniProtKB data of unknown release, to tell whether RefSeq
+    accessions looked up in it can be reused. Gzipped data is fingerprinted by its
+    uncompressed contents, so the same data matches whether or not it was kept
+    gzipped.
+
+    :param uniprot_sprot_path: path to uniprot_sprot.xml, optionally gzipped
+    :return: SHA-256 digest of file contents
+    """
+    if _is_gzipped(uniprot_sprot_path):
+        uniprot_sprot = gzip.open(uniprot_sprot_path, "rb")
+    else:
+        uniprot_sprot = uniprot_sprot_path.open("rb")
+    digest = hashlib.sha256()
+    with uniprot_sprot:
+        while data := uniprot_sprot.read(UNIPROT_XML_CHUNK_SIZE):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def _load_reusable_accessions(
+    previous_domains_path: Path, digests: dict[str, str], uniprot_sprot_version: str
+) -> dict[tuple[str, str], str]:
+    """Get RefSeq accessions from a previous build for UniProt accessions whose genes
+    and domains are unchanged. Nothing is reused if the previous build read different
+    UniProtKB data, and accessions that couldn't be found previously are looked up
+    again.
+
+    :param previous_domains_path: path to previous domain_lookup_YYYYMMDD.tsv. Its
+        manifest must be alongside it.
+    :param digests: current digest for each UniProt accession
+    :param uniprot_sprot_version: release or digest of current UniProtKB data
+    :return: RefSeq accession keyed by UniProt accession and gene ID
+    """
+    with get_domain_manifest_path(previous_domains_path).open() as f:
+        previous_manifest = json.load(f)
+    if previous_manifest.get("uniprot_sprot") != uniprot_sprot_version:
+        msg = "UniProtKB data changed since previous build, so no RefSeq accessions are reused"
+        logger.info(msg)
+        click.echo(msg)
+        return {}
+    reusable = {}
+    for uniprot_ac, digest in digests.items():
+        previous = previous_manifest["uniprot"].get(uniprot_ac)
+        if previous and previous["digest"] == digest:
+            for gene_id, refseq_ac in previous["refseq"].items():
+                if refseq_ac is not None:
+                    reusable[(uniprot_ac, gene_id)] = refseq_ac
+    return reusable
+
+
+def write_domain_diff(
+    previous_domains_path: Path, domains_path: Path, diff_path: Path
+) -> tuple[int, int, int]:
+    """Write report of rows added to and removed from a gene-to-domain lookup table.
+
+    :param previous_domains_path: path to previous table
+    :param domains_path: path to new table
+    :param diff_path: path to write report to. Each line holds ``+`` (added) or ``-``
+        (removed) followed by the table row, ordered by gene.
+    :return: number of genes changed, rows added, and rows removed
+    """
+    with previous_domains_path.open() as f:
+        previous_rows = set(f)
+    with domains_path.open() as f:
+        rows = set(f)
+    added = rows - previous_rows
+    removed = previous_rows - rows
+    changes = sorted(
+        [(row.split("\t", 1)[0], "+", row) for row in added]
+        + [(row.split("\t", 1)[0], "-", row) for row in removed],
+        key=lambda change: (change[0], change[2], change[1]),
+    )
+    with diff_path.open("w") as out:
+        for _, change, row in changes:
+            out.write(f"{change}\t{row}")
+    return len({gene_id for gene_id, _, _ in changes}), len(added), len(removed)
+
+
 def build_gene_domain_maps(
     interpro_types: set[str],
     protein_ipr_path: Path | None = None,
     uniprot_sprot_path: Path | None = None,
     uniprot_refs_path: Path | None = None,
     output_dir: Path = APP_ROOT / "data",
+    workers: int | None = None,
+    keep_gz: bool = False,
+    previous_domains_path: Path | None = None,
 ) -> None:
     """Produce the gene-to-domain lookup table at out_path using the Interpro-Uniprot
     translation table, the Interpro names table, and the VICC Gene Normalizer.
 
+    A manifest recording the UniProtKB data used, and each UniProt accession's genes,
+    domains, and RefSeq accessions, is saved alongside the table. Given a previous
+    table built from the same UniProtKB data, a build is incremental: RefSeq
+    accessions are only looked up in UniProtKB for accessions whose genes or domains
+    changed since, or that couldn't be found before. Downloaded UniProtKB data is
+    identified by its release, so it's only downloaded if there are any such
+    accessions; a local copy passed in is identified by a digest of its contents
+    instead. The Gene Normalizer scan and protein2ipr scan always run in full, since
+    they're what tell which accessions changed. A report of changed rows is saved as
+    well.
+
     :param interpro_types: types of interpro fields to check references for
     :param protein_ipr_path: path to protein2ipr_{date}.dat if available
+    :param uniprot_sprot_path: path to uniprot_sprot.xml if available. Otherwise, the
+        current release is downloaded if needed.
     :param uniprot_refs_path: path to existing uniprot_refs_<date>.tsv
         file if available.
     :param output_dir: location to save output file within. Defaults to app data
         directory.
+    :param workers: number of workers to scan the Gene Normalizer DB and protein2ipr
+        with. Defaults to number of CPUs.
+    :param keep_gz: if downloading protein2ipr or UniProtKB data, store and read it
+        gzipped rather than unpacking it
+    :param previous_domains_path: path to previous domain_lookup_YYYYMMDD.tsv to build
+        incrementally from. Its manifest must be alongside it.
     """
     start_time = timer()
-    today = datetime.strftime(datetime.datetime.now(tz=datetime.timezone.utc), DATE_FMT)
+    today = datetime.datetime.strftime(
+        datetime.datetime.now(tz=datetime.timezone.utc), DATE_FMT
+    )
 
     # get relevant Interpro IDs
     interpro_data_bin = []
@@ -310,7 +852,7 @@ def build_gene_domain_maps(
 
     # get Uniprot to gene references
     if not uniprot_refs_path:
-        uniprot_refs: UniprotRefs = get_uniprot_refs()
+        uniprot_refs: UniprotRefs = get_uniprot_refs(workers)
     else:
         uniprot_refs = {}
         with uniprot_refs_path.open() as f:
@@ -320,12 +862,40 @@ def build_gene_domain_maps(
 
     # associate InterPro domains to genes via Uniprot references
     interpro_uniprot = get_interpro_uniprot_rels(
-        protein_ipr_path, output_dir, domain_ids, uniprot_refs
+        protein_ipr_path, output_dir, domain_ids, uniprot_refs, workers, keep_gz
     )
+    digests = _get_uniprot_digests(interpro_uniprot)
 
-    # get refseq accessions for uniprot proteins
+    # get refseq accessions for uniprot proteins, reusing unchanged ones if possible
+    if uniprot_sprot_path:
+        uniprot_sprot_version = (
+            f"sha256:{_get_uniprot_sprot_digest(uniprot_sprot_path)}"
+        )
+    else:
+        uniprot_sprot_version = get_uniprot_release()
     uniprot_acs = {k[0] for k in interpro_uniprot}
-    prot_acs = get_protein_accessions(uniprot_acs, uniprot_sprot_path)
+    prot_acs: dict[tuple[str, str], str] = {}
+    if previous_domains_path:
+        prot_acs = _load_reusable_accessions(
+            previous_domains_path, digests, uniprot_sprot_version
+        )
+    stale_acs = {k[0] for k in interpro_uniprot if k not in prot_acs}
+    if stale_acs and not uniprot_sprot_path:
+        uniprot_sprot_path = download_uniprot_sprot(APP_ROOT / "data", keep_gz)
+        if get_uniprot_release() != uniprot_sprot_version:
+            # a new release came out during the download, so it's unclear which one
+            # was downloaded
+            logger.warning("UniProtKB release changed while downloading")
+            uniprot_sprot_version = (
+                f"sha256:{_get_uniprot_sprot_digest(uniprot_sprot_path)}"
+            )
+            prot_acs = {}
+            stale_acs = uniprot_acs
+    msg = f"Looking up RefSeq accessions for {len(stale_acs)} of {len(uniprot_acs)} UniProt accessions"
+    logger.info(msg)
+    click.echo(msg)
+    if stale_acs:
+        prot_acs.update(get_protein_accessions(stale_acs, uniprot_sprot_path, keep_gz))
 
     outfile_path = output_dir / f"domain_lookup_{today}.tsv"
     outfile = outfile_path.open("w")
@@ -341,7 +911,60 @@ def build_gene_domain_maps(
                 outfile.write(line)
     outfile.close()
 
+    manifest: dict = {"uniprot_sprot": uniprot_sprot_version, "uniprot": {}}
+    for uniprot_ac, gene_id in interpro_uniprot:
+        entry = manifest["uniprot"].setdefault(
+            uniprot_ac, {"digest": digests[uniprot_ac], "refseq": {}}
+        )
+        entry["refseq"][gene_id] = prot_acs.get((uniprot_ac, gene_id))
+    with get_domain_manifest_path(outfile_path).open("w") as f:
+        json.dump(manifest, f)
+
+    if previous_domains_path:
+        diff_path = output_dir / f"domain_diff_{today}.tsv"
+        n_genes, n_added, n_removed = write_domain_diff(
+            previous_domains_path, outfile_path, diff_path
+        )
+        msg = f"{n_genes} genes changed ({n_added} rows added, {n_removed} removed); see {diff_path.name}"
+        logger.info(msg)
+        click.echo(msg)
+
     stop_time = timer()
     msg = f"Wrote gene-domain table in {(stop_time - start_time):.5f} seconds."
     logger.info(msg)
     click.echo(msg)
+
+
+def build_domain_index_file(
+    domain_file: Path | None = None, output_dir: Path = APP_ROOT / "data"
+) -> Path:
+    """Build a binary snapshot of the gene-to-domain lookup table, which the domain
+    service memory-maps in preference to parsing the table as long as the table hasn't
+    changed since.
+
+    :param domain_file: path to domain lookup table to index. If not provided, will use
+        newest available file in expected location.
+    :param output_dir: location to save output file within. Defaults to app data
+        directory.
+    :return: path to saved snapshot
+    """
+    start_time = timer()
+
+    if not domain_file:
+        domain_file = get_data_file("domain_lookup")
+    # named for the lookup table rather than the build date, so that rebuilding from
+    # an older table doesn't replace the snapshot of a newer one
+    version = domain_file.stem.removeprefix("domain_lookup_")
+    outfile_path = output_dir / f"domain_index_{version}.bin"
+    write_snapshot(
+        outfile_path,
+        DOMAIN_INDEX_MAGIC,
+        DOMAIN_INDEX_VERSION,
+        DomainIndex.build(domain_file),
+    )
+
+    stop_time = timer()
+    msg = f"Built domain index snapshot from {domain_file.name} in {(stop_time - start_time):.5f} seconds."
+    logger.info(msg)
+    click.echo(msg)
+    return outfile_path
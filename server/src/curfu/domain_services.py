@@ -8,20 +8,240 @@ Todo:
 """
 
 import csv
-from typing import ClassVar
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
 
-from curfu import LookupServiceError, logger
-from curfu.utils import get_data_file
+from curfu import DOMAIN_CACHE_SIZE, LookupServiceError, logger
+from curfu.snapshot import (
+    SOURCE_SECTION,
+    Section,
+    SnapshotError,
+    StringTable,
+    get_source_fingerprint,
+    read_snapshot,
+)
+from curfu.utils import get_data_file, read_local_snapshot
+
+# identify domain index snapshot files, and the layout version this code reads/writes
+DOMAIN_INDEX_MAGIC = b"CURFUDIX"
+DOMAIN_INDEX_VERSION = 1
+
+
+class DomainRecord(NamedTuple):
+    """Describe a functional domain associated with a gene."""
+
+    interpro_id: str
+    domain_name: str
+    start: int
+    end: int
+    refseq_ac: str
+
+    def to_dict(self) -> dict:
+        """Get domain as a dict structured for client consumption."""
+        return {
+            "interproId": self.interpro_id,
+            "domainName": self.domain_name,
+            "start": self.start,
+            "end": self.end,
+            "refseqAc": self.refseq_ac,
+        }
+
+
+# number of columns in a row of the domain lookup table
+DOMAIN_ROW_COLUMNS = 7
+
+
+def _is_domain_row(row: Sequence[str | bytes]) -> bool:
+    """Check whether a line of the domain lookup table holds a domain, rather than
+    being e.g. blank or truncated.
+
+    :param row: fields of line, decoded or not
+    :return: True if the line has all the columns of a domain row
+    """
+    return len(row) >= DOMAIN_ROW_COLUMNS
+
+
+def _parse_row(row: list[str]) -> tuple[str, DomainRecord]:
+    """Parse a row of the domain lookup table.
+
+    :param row: fields of row (see ``DomainService.load_mapping`` for expected columns)
+    :return: lower-cased gene ID, and domain described by row
+    """
+    return row[0].lower(), DomainRecord(
+        f"interpro:{row[2]}", row[3], int(row[4]), int(row[5]), row[6]
+    )
+
+
+class DomainIndex:
+    """Provide columnar, read-only storage of domains grouped by gene.
+
+    Gene IDs are stored sorted, with each gene's domains occupying one contiguous run of
+    rows across the column arrays. Gene IDs, InterPro IDs, domain names, and RefSeq
+    accessions are stored once each in a shared string table, however many rows refer
+    to them.
+    """
+
+    def __init__(self, sections: dict[str, Section]) -> None:
+        """Initialize index.
+
+        :param sections: index contents, as built by ``build`` or loaded from a snapshot
+        """
+        self.strings = StringTable.from_sections(sections, "strings")
+        self.genes: Sequence[int] = sections["genes"]
+        self.gene_starts: Sequence[int] = sections["gene_starts"]
+        self.interpro_ids: Sequence[int] = sections["interpro_ids"]
+        self.domain_names: Sequence[int] = sections["domain_names"]
+        self.starts: Sequence[int] = sections["starts"]
+        self.ends: Sequence[int] = sections["ends"]
+        self.refseq_acs: Sequence[int] = sections["refseq_acs"]
+
+    @staticmethod
+    def build(domain_file: Path) -> dict[str, Section]:
+        """Construct index contents from domain lookup table.
+
+        :param domain_file: path to domain lookup TSV (see
+            ``DomainService.load_mapping`` for expected columns)
+        :return: index contents, in the layout used by snapshot files
+        """
+        gene_rows: dict[str, list[DomainRecord]] = {}
+        with domain_file.open() as df:
+            for row in csv.reader(df, delimiter="\t"):
+                if not _is_domain_row(row):
+                    continue
+                gene_id, domain = _parse_row(row)
+                gene_rows.setdefault(gene_id, []).append(domain)
+
+        all_strings = set(gene_rows)
+        for rows in gene_rows.values():
+            for interpro_id, domain_name, _, _, refseq_ac in rows:
+                all_strings.update((interpro_id, domain_name, refseq_ac))
+        strings, string_ids = StringTable.build(all_strings)
+
+        sections = strings.sections("strings")
+        sections[SOURCE_SECTION] = get_source_fingerprint(domain_file)
+        sections["genes"] = array("I")
+        sections["gene_starts"] = array("I", [0])
+        for name in ("interpro_ids", "domain_names", "starts", "ends", "refseq_acs"):
+            sections[name] = array("I")
+        for gene_id in sorted(gene_rows):
+            sections["genes"].append(string_ids[gene_id])
+            for interpro_id, domain_name, start, end, refseq_ac in gene_rows[gene_id]:
+                sections["interpro_ids"].append(string_ids[interpro_id])
+                sections["domain_names"].append(string_ids[domain_name])
+                sections["starts"].append(start)
+                sections["ends"].append(end)
+                sections["refseq_acs"].append(string_ids[refseq_ac])
+            sections["gene_starts"].append(len(sections["starts"]))
+        return sections
+
+    def get(self, gene_id: str) -> list[DomainRecord] | None:
+        """Get domains associated with gene.
+
+        :param gene_id: lower-cased normalized gene ID
+        :return: domain data if gene has any associated domains, None otherwise
+        """
+        string_id = self.strings.find(gene_id)
+        if string_id is None:
+            return None
+        position = bisect_left(self.genes, string_id)
+        if position == len(self.genes) or self.genes[position] != string_id:
+            return None
+        strings = self.strings
+        return [
+            DomainRecord(
+                strings[self.interpro_ids[i]],
+                strings[self.domain_names[i]],
+                self.starts[i],
+                self.ends[i],
+                strings[self.refseq_acs[i]],
+            )
+            for i in range(self.gene_starts[position], self.gene_starts[position + 1])
+        ]
+
+
+class LazyDomainIndex:
+    """Provide on-demand parsing of the domain lookup table.
+
+    At initialization, the table is only scanned to record the byte ranges occupied by
+    each gene's rows. A gene's rows are parsed when first requested, and the most
+    recently requested genes are kept parsed in memory.
+    """
+
+    def __init__(self, domain_file: Path, cache_size: int = DOMAIN_CACHE_SIZE) -> None:
+        """Index domain lookup table.
+
+        :param domain_file: path to domain lookup TSV
+        :param cache_size: max number of genes to keep parsed domains for
+        """
+        self.domain_file = domain_file
+        # gene ID -> list of (start, end) byte ranges containing its rows
+        self.ranges: dict[str, list[tuple[int, int]]] = {}
+        offset = 0
+        with domain_file.open("rb") as df:
+            for line in df:
+                end = offset + len(line)
+                fields = line.split(b"\t", DOMAIN_ROW_COLUMNS - 1)
+                if not _is_domain_row(fields):
+                    offset = end
+                    continue
+                gene_id = fields[0].decode().lower()
+                gene_ranges = self.ranges.setdefault(gene_id, [])
+                if gene_ranges and gene_ranges[-1][1] == offset:
+                    gene_ranges[-1] = (gene_ranges[-1][0], end)
+                else:
+                    gene_ranges.append((offset, end))
+                offset = end
+        self._get_cached = lru_cache(maxsize=cache_size)(self._parse_gene)
+
+    def _parse_gene(self, gene_id: str) -> list[DomainRecord]:
+        """Read and parse all rows for a gene.
+
+        :param gene_id: lower-cased normalized gene ID, known to be in the table
+        :return: domains associated with gene
+        """
+        lines = []
+        with self.domain_file.open("rb") as df:
+            for start, end in self.ranges[gene_id]:
+                df.seek(start)
+                # ranges span whole rows, so only the final terminator is dropped
+                lines.extend(df.read(end - start).rstrip(b"\n").split(b"\n"))
+        return [
+            _parse_row(row)[1]
+            for row in csv.reader((line.decode() for line in lines), delimiter="\t")
+            if _is_domain_row(row)
+        ]
+
+    def get(self, gene_id: str) -> list[DomainRecord] | None:
+        """Get domains associated with gene.
+
+        :param gene_id: lower-cased normalized gene ID
+        :return: domain data if gene has any associated domains, None otherwise
+        """
+        if gene_id not in self.ranges:
+            return None
+        return list(self._get_cached(gene_id))
 
 
 class DomainService:
     """Handler class providing requisite services for functional domain lookup."""
 
-    domains: ClassVar[dict[str, list[dict]]] = {}
+    def __init__(self) -> None:
+        """Initialize domain service provider class."""
+        self.index: DomainIndex | LazyDomainIndex | None = None
 
-    def load_mapping(self) -> None:
+    def load_mapping(self, index_file: Path | None = None, lazy: bool = False) -> None:
         """Load mapping file.
 
+        If available, a prebuilt index snapshot (see ``curfu_devtools domain-index``)
+        is memory-mapped instead of parsing the mapping file, so that its contents are
+        shared between processes rather than copied into each one. Otherwise, the
+        mapping file is parsed into the same columnar layout in memory, or, in lazy
+        mode, only indexed by gene and parsed a gene at a time as domains are requested.
+
         Domain map file should be tab separated with a column for each:
         * UniProt accession
         * Normalized gene ID
@@ -31,33 +251,45 @@ class DomainService:
         * Start coordinate
         * Stop coordinate
         * RefSeq protein accession
+
+        :param index_file: path to existing index snapshot. If not provided, will use
+            newest local snapshot that was built from the newest local domain map file.
+        :param lazy: if True and no snapshot is available, defer parsing each gene's
+            domains until they're first requested
         """
+        sections = None
+        if index_file:
+            try:
+                sections = read_snapshot(
+                    index_file, DOMAIN_INDEX_MAGIC, DOMAIN_INDEX_VERSION
+                )
+            except SnapshotError as e:
+                logger.warning(f"Unable to load domain index snapshot: {e}")
+        else:
+            sections = read_local_snapshot(
+                "domain_index",
+                "domain_lookup",
+                DOMAIN_INDEX_MAGIC,
+                DOMAIN_INDEX_VERSION,
+            )
+        if sections is not None:
+            self.index = DomainIndex(sections)
+            return
+
         domain_file = get_data_file("domain_lookup")
-        with domain_file.open() as df:
-            reader = csv.reader(df, delimiter="\t")
-            for row in reader:
-                gene_id = row[0].lower()
-                domain_data = {
-                    "interproId": f"interpro:{row[2]}",
-                    "domainName": row[3],
-                    "start": int(row[4]),
-                    "end": int(row[5]),
-                    "refseqAc": f"{row[6]}",
-                }
-                if gene_id in self.domains:
-                    self.domains[gene_id].append(domain_data)
-                else:
-                    self.domains[gene_id] = [domain_data]
+        if lazy:
+            self.index = LazyDomainIndex(domain_file)
+        else:
+            self.index = DomainIndex(DomainIndex.build(domain_file))
 
-    def get_possible_domains(self, gene_id: str) -> list[dict]:
+    def get_possible_domains(self, gene_id: str) -> list[DomainRecord]:
         """Given normalized gene ID, return associated domain names and IDs
 
         :return: List of valid domain names (up to n names) paired with domain IDs
         :raise: ServiceWarning if no matches are available for gene ID
         """
-        try:
-            domains = self.domains[gene_id.lower()]
-        except KeyError as e:
+        domains = self.index.get(gene_id.lower()) if self.index else None
+        if domains is None:
             logger.warning(f"Unable to retrieve associated domains for {gene_id}")
-            raise LookupServiceError from e
+            raise LookupServiceError
         return domains
@@ -1,63 +1,145 @@
 """Wrapper for required Gene Normalization services."""
 
 import csv
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from functools import cached_property
 from pathlib import Path
 
 from gene.query import QueryHandler
-from gene.schemas import MatchType
+from gene.schemas import MatchType, NormalizeService
 
-from curfu import LookupServiceError, logger
-from curfu.utils import get_data_file
+from curfu import (
+    NORMALIZER_CACHE_SIZE,
+    NORMALIZER_CACHE_TTL,
+    LookupServiceError,
+    logger,
+)
+from curfu.cache import CachingProxy, TTLCache
+from curfu.snapshot import (
+    SOURCE_SECTION,
+    Section,
+    SnapshotError,
+    StringTable,
+    get_source_fingerprint,
+    read_snapshot,
+    write_snapshot,
+)
+from curfu.utils import get_data_file, read_local_snapshot
 
 # term -> (normalized ID, normalized label)
 Map = dict[str, tuple[str, str, str]]
 
-# term -> (normalized ID, normalized label)
-Map = dict[str, tuple[str, str, str]]
 # term, symbol, concept ID, chromosome, strand
 Suggestion = tuple[str, str, str, str, str]
 
+# identify gene index snapshot files, and the layout version this code reads/writes
+GENE_INDEX_MAGIC = b"CURFUGIX"
+GENE_INDEX_VERSION = 1
 
-class GeneService:
-    """Provide gene ID resolution and term autocorrect suggestions."""
+MATCH_TYPES = ("concept_id", "symbol", "prev_symbols", "aliases")
 
-    def __init__(self, suggestions_file: Path | None = None) -> None:
-        """Initialize gene service provider class.
+# number of string IDs stored per gene: symbol, concept ID, chromosome, strand
+_GENE_WIDTH = 4
 
-        :param suggestions_file: path to existing suggestions file. If not provided,
-            will use newest available file in expected location.
+
+class PrefixIndex:
+    """Provide prefix range lookups over one type of gene term.
+
+    Keys are stored as string table IDs in ascending order. Since IDs are assigned in
+    sorted string order, all keys sharing a prefix occupy one contiguous run that can be
+    located with binary searches over integers.
+    """
+
+    def __init__(
+        self,
+        strings: StringTable,
+        genes: Sequence[int],
+        keys: Sequence[int],
+        terms: Sequence[int],
+        gene_positions: Sequence[int],
+    ) -> None:
+        """Initialize index.
+
+        :param strings: table containing all keys, terms, and gene values
+        :param genes: flattened (symbol, concept ID, chromosome, strand) string IDs for
+            each gene
+        :param keys: sorted string IDs of upper-cased terms
+        :param terms: string ID of the correctly-cased term for each key
+        :param gene_positions: position within ``genes`` of the gene for each key
         """
-        if not suggestions_file:
-            suggestions_file = get_data_file("gene_suggest")
-
-        self.concept_id_map: dict[str, Suggestion] = {}
-        self.symbol_map: dict[str, Suggestion] = {}
-        self.aliases_map: dict[str, Suggestion] = {}
-        self.prev_symbols_map: dict[str, Suggestion] = {}
-
-        for row in csv.DictReader(suggestions_file.open()):
-            symbol = row["symbol"]
-            concept_id = row["concept_id"]
-            suggestion = [symbol, concept_id, row["chromosome"], row["strand"]]
-            self.concept_id_map[concept_id.upper()] = (concept_id, *suggestion)
-            self.symbol_map[symbol.upper()] = (symbol, *suggestion)
-            for alias in row.get("aliases", []):
-                self.aliases_map[alias.upper()] = (alias, *suggestion)
-            for prev_symbol in row.get("previous_symbols", []):
-                self.prev_symbols_map[prev_symbol.upper()] = (prev_symbol, *suggestion)
+        self.strings = strings
+        self.genes = genes
+        self.keys = keys
+        self.terms = terms
+        self.gene_positions = gene_positions
 
-    @staticmethod
-    def get_normalized_gene(
-        term: str, normalizer: QueryHandler
-    ) -> tuple[str, str, str | None]:
-        """Get normalized ID given gene symbol/label/alias.
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Locate the run of keys beginning with ``prefix``.
 
-        :param term: user-entered gene term
-        :param normalizer:  gene normalizer instance
-        :return: concept ID, str, if successful
-        :raise ServiceWarning: if lookup fails
+        :param prefix: upper-cased term prefix
+        :return: start (inclusive) and end (exclusive) positions within the index
         """
-        response = normalizer.normalize(term)
+        first_id, last_id = self.strings.prefix_range(prefix)
+        start = bisect_left(self.keys, first_id)
+        return start, bisect_left(self.keys, last_id, start)
+
+    def key(self, position: int) -> str:
+        """Get upper-cased term at given position."""
+        return self.strings[self.keys[position]]
+
+    def suggestions(self, start: int, end: int) -> list[Suggestion]:
+        """Get suggestions for a run of index positions.
+
+        :param start: first position (inclusive)
+        :param end: last position (exclusive)
+        :return: suggestions, ordered by key
+        """
+        strings = self.strings
+        results = []
+        for i in range(start, end):
+            gene_start = self.gene_positions[i] * _GENE_WIDTH
+            gene = self.genes[gene_start : gene_start + _GENE_WIDTH]
+            results.append((strings[self.terms[i]], *(strings[g] for g in gene)))
+        return results
+
+    def search(self, prefix: str) -> list[Suggestion]:
+        """Get all suggestions whose key begins with ``prefix``.
+
+        :param prefix: upper-cased term prefix
+        :return: matching suggestions, ordered by key
+        """
+        return self.suggestions(*self.prefix_range(prefix))
+
+
+class NormalizedTerm:
+    """Hold the gene normalizer response for a term, along with the concept ID, symbol,
+    and correctly-cased term derived from it.
+
+    Entries are shared by every lookup of the term, so neither the response nor the
+    derived values are modified after caching.
+    """
+
+    def __init__(self, term: str, response: NormalizeService) -> None:
+        """Initialize entry.
+
+        :param term: stripped gene term, as it was normalized
+        :param response: gene normalizer response for term
+        """
+        self.term = term
+        self.response = response
+
+    @cached_property
+    def gene(self) -> tuple[str, str, str | None] | None:
+        """Get concept ID, symbol, and the correctly-cased version of the term.
+
+        :return: concept ID, symbol, and cased term if successful, or None if no match
+        :raise LookupServiceError: if normalized response is missing required
+            properties
+        """
+        term = self.term
+        response = self.response
         if response.match_type != MatchType.NO_MATCH:
             concept_id = response.normalized_id
             gene = response.gene
@@ -109,41 +191,213 @@ class GeneService:
                     f"Couldn't find cased version for search term {term} matching gene ID {response.normalized_id}"
                 )
             return (concept_id, symbol, term_cased)
-        warn = f"Lookup of gene term {term} failed."
-        logger.warning(warn)
-        raise LookupServiceError(warn)
+        return None
+
+
+class CachedNormalizer(CachingProxy):
+    """Provide gene normalization through one app-wide cache, shared by the gene
+    service, every router, and FUSOR.
+
+    Results are cached by stripped, case-insensitive term, including failed lookups.
+    Since FUSOR modifies the genes in the responses it receives, ``normalize`` provides
+    each caller with its own copy of the cached response.
+    """
+
+    def __init__(
+        self,
+        query_handler: QueryHandler,
+        max_size: int = NORMALIZER_CACHE_SIZE,
+        ttl: float | None = NORMALIZER_CACHE_TTL,
+    ) -> None:
+        """Initialize cached normalizer.
+
+        :param query_handler: gene normalizer instance to wrap
+        :param max_size: max number of terms to hold normalization results for
+        :param ttl: seconds after which a cached result expires
+        """
+        super().__init__(query_handler)
+        self.cache = TTLCache(max_size, ttl)
+
+    def lookup(self, query: str) -> NormalizedTerm:
+        """Get cached normalization result for gene term, normalizing it if it isn't
+        already cached.
+
+        :param query: gene term
+        :return: shared cache entry for term. Must not be modified.
+        """
+        term = query.strip()
+        key = term.upper()
+        try:
+            return self.cache[key]
+        except KeyError:
+            entry = NormalizedTerm(term, self.wrapped.normalize(term))
+            self.cache[key] = entry
+            return entry
+
+    def normalize(self, query: str) -> NormalizeService:
+        """Normalize gene term, reusing a cached response if available.
+
+        :param query: gene term
+        :return: normalized gene response, free for the caller to modify
+        """
+        response = self.lookup(query).response
+        return response.model_copy(update={"query": query}, deep=True)
+
+
+class GeneService:
+    """Provide gene ID resolution and term autocorrect suggestions."""
+
+    def __init__(
+        self, suggestions_file: Path | None = None, index_file: Path | None = None
+    ) -> None:
+        """Initialize gene service provider class.
+
+        Suggestions are loaded from a prebuilt index snapshot (see
+        ``curfu_devtools gene-index``) when one is available, and otherwise built from
+        the suggestions file.
+
+        :param suggestions_file: path to existing suggestions file. If not provided,
+            will use newest available file in expected location.
+        :param index_file: path to existing index snapshot. If neither this nor
+            ``suggestions_file`` is provided, will use newest local snapshot that was
+            built from the newest local suggestions file.
+        """
+        sections = None
+        if index_file:
+            try:
+                sections = read_snapshot(
+                    index_file, GENE_INDEX_MAGIC, GENE_INDEX_VERSION
+                )
+            except SnapshotError as e:
+                logger.warning(f"Unable to load gene index snapshot: {e}")
+        elif not suggestions_file:
+            sections = read_local_snapshot(
+                "gene_index", "gene_suggest", GENE_INDEX_MAGIC, GENE_INDEX_VERSION
+            )
+        if sections is None:
+            if not suggestions_file:
+                suggestions_file = get_data_file("gene_suggest")
+            sections = self._build_index(suggestions_file)
+        self._sections = sections
+
+        strings = StringTable.from_sections(sections, "strings")
+        self.indexes = {
+            match_type: PrefixIndex(
+                strings,
+                sections["genes"],
+                sections[f"{match_type}_keys"],
+                sections[f"{match_type}_terms"],
+                sections[f"{match_type}_genes"],
+            )
+            for match_type in MATCH_TYPES
+        }
 
     @staticmethod
-    def _get_completion_results(term: str, lookup: dict) -> list[Suggestion]:
-        """Filter valid completions for term.
+    def _build_index(suggestions_file: Path) -> dict[str, Section]:
+        """Construct index sections from gene suggestions file.
 
-        :param term: user-entered text
-        :param lookup: stored mapping where key is a name (e.g. symbol or alias) and
-            value is the complete suggestion
-        :return: List of suggested completions along with relevant metadata
+        :param suggestions_file: path to suggestions file
+        :return: index contents, in the layout used by snapshot files
         """
-        matches = []
-        for key, data in lookup.items():
-            if key.startswith(term):
-                matches.append(data)
-        return sorted(matches, key=lambda s: s[0])
+        genes: list[tuple[str, str, str, str]] = []
+        # upper-cased term -> (term, gene position)
+        lookups: dict[str, dict[str, tuple[str, int]]] = {
+            match_type: {} for match_type in MATCH_TYPES
+        }
+        with suggestions_file.open() as f:
+            for row in csv.DictReader(f):
+                symbol = row["symbol"]
+                concept_id = row["concept_id"]
+                position = len(genes)
+                genes.append((symbol, concept_id, row["chromosome"], row["strand"]))
+                lookups["concept_id"][concept_id.upper()] = (concept_id, position)
+                lookups["symbol"][symbol.upper()] = (symbol, position)
+                for alias in row.get("aliases", []):
+                    lookups["aliases"][alias.upper()] = (alias, position)
+                for prev_symbol in row.get("previous_symbols", []):
+                    lookups["prev_symbols"][prev_symbol.upper()] = (
+                        prev_symbol,
+                        position,
+                    )
 
-    def suggest_genes(self, query: str) -> dict[str, list[Suggestion]]:
+        all_strings = {value for gene in genes for value in gene}
+        for lookup in lookups.values():
+            all_strings.update(lookup)
+            all_strings.update(term for term, _ in lookup.values())
+        strings, string_ids = StringTable.build(all_strings)
+
+        sections = strings.sections("strings")
+        sections[SOURCE_SECTION] = get_source_fingerprint(suggestions_file)
+        sections["genes"] = array(
+            "I", (string_ids[value] for gene in genes for value in gene)
+        )
+        for match_type, lookup in lookups.items():
+            keys = sorted(lookup)
+            sections[f"{match_type}_keys"] = array("I", (string_ids[k] for k in keys))
+            sections[f"{match_type}_terms"] = array(
+                "I", (string_ids[lookup[k][0]] for k in keys)
+            )
+            sections[f"{match_type}_genes"] = array("I", (lookup[k][1] for k in keys))
+        return sections
+
+    def save_index(self, path: Path) -> None:
+        """Save a binary snapshot of the suggestion index, for faster loading by later
+        instances.
+
+        :param path: location to save snapshot to
+        """
+        write_snapshot(path, GENE_INDEX_MAGIC, GENE_INDEX_VERSION, self._sections)
+
+    @staticmethod
+    def get_normalized_gene(
+        term: str, normalizer: CachedNormalizer
+    ) -> tuple[str, str, str | None]:
+        """Get normalized ID given gene symbol/label/alias.
+
+        Results, including failed lookups, are cached by the normalizer.
+
+        :param term: user-entered gene term
+        :param normalizer:  gene normalizer instance
+        :return: concept ID, str, if successful
+        :raise ServiceWarning: if lookup fails
+        """
+        result = normalizer.lookup(term).gene
+        if result is None:
+            warn = f"Lookup of gene term {term} failed."
+            logger.warning(warn)
+            raise LookupServiceError(warn)
+        return result
+
+    def suggest_genes(
+        self, query: str, limit: int | None = None
+    ) -> tuple[dict[str, list[Suggestion]], int]:
         """Provide autocomplete suggestions based on submitted term.
 
+        Match counts are taken from index positions, so suggestions are only
+        materialized once it's known whether they fit within ``limit``.
+
         :param query: text entered by user
-        :return: dict returning list containing any number of suggestion tuples, where
-            each is the correctly-cased term, normalized ID, normalized label, for each
-            item type
+        :param limit: maximum number of suggestions to provide. If the total number of
+            matches exceeds this value, only exact matches are returned.
+        :return: tuple containing a dict returning list containing any number of
+            suggestion tuples, where each is the correctly-cased term, normalized ID,
+            normalized label, for each item type (each list is ordered
+            case-insensitively by term), and the total number of prefix matches
         """
         q_upper = query.upper()
+        ranges = {
+            match_type: index.prefix_range(q_upper)
+            for match_type, index in self.indexes.items()
+        }
+        n = sum(end - start for start, end in ranges.values())
+        exceeds_limit = limit is not None and n > limit
+
         suggestions = {}
-        suggestions["concept_id"] = self._get_completion_results(
-            q_upper, self.concept_id_map
-        )
-        suggestions["symbol"] = self._get_completion_results(q_upper, self.symbol_map)
-        suggestions["prev_symbols"] = self._get_completion_results(
-            q_upper, self.prev_symbols_map
-        )
-        suggestions["aliases"] = self._get_completion_results(q_upper, self.aliases_map)
-        return suggestions
+        for match_type, index in self.indexes.items():
+            start, end = ranges[match_type]
+            if exceeds_limit:
+                # an exact match, if present, sorts first within its prefix run
+                is_exact = start < end and index.key(start) == q_upper
+                end = start + 1 if is_exact else start
+            suggestions[match_type] = index.suggestions(start, end)
+        return suggestions, n
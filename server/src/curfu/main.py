@@ -1,7 +1,9 @@
 """Provide FastAPI application and route declarations."""
 
 import logging
+import multiprocessing
 from collections.abc import AsyncGenerator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -11,10 +13,13 @@ from fastapi.templating import Jinja2Templates
 from fusor import FUSOR
 from starlette.templating import _TemplateResponse as TemplateResponse
 
-from curfu import APP_ROOT
+from curfu import APP_ROOT, BLOCKING_WORKERS, LAZY_DOMAINS, VALIDATION_WORKERS
 from curfu import __version__ as curfu_version
+from curfu.batch import init_validation_worker
+from curfu.coordinate_services import CachedExonCoordsMapper
+from curfu.demo_services import DemoService
 from curfu.domain_services import DomainService
-from curfu.gene_services import GeneService
+from curfu.gene_services import CachedNormalizer, GeneService
 from curfu.routers import (
     complete,
     constructors,
@@ -25,6 +30,8 @@ from curfu.routers import (
     utilities,
     validate,
 )
+from curfu.sequence_services import CachedSeqRepo
+from curfu.transcript_services import GeneTranscriptsService, ManeIndex
 
 _logger = logging.getLogger(__name__)
 
@@ -36,11 +43,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     :param app: FastAPI app instance
     :return: async context handler
     """
+    app.state.executor = get_blocking_executor()
+    app.state.validation_pool = get_validation_pool()
     app.state.fusor = await start_fusor()
+    app.state.normalizer = get_normalizer_service(app.state.fusor)
+    app.state.seqrepo = get_seqrepo_service(app.state.fusor)
+    app.state.exon_coords = get_exon_coords_service(app.state.fusor)
+    app.state.mane = get_mane_index(app.state.fusor)
+    app.state.transcripts = get_transcripts_service(app.state.fusor)
+    app.state.demos = get_demo_service(app.state.fusor)
     app.state.genes = get_gene_services()
     app.state.domains = get_domain_services()
     yield
     await app.state.fusor.cool_seq_tool.uta_db._connection_pool.close()  # noqa: SLF001
+    app.state.executor.shutdown(cancel_futures=True)
+    app.state.validation_pool.shutdown(cancel_futures=True)
 
 
 fastapi_app = FastAPI(
@@ -132,6 +149,32 @@ def serve_react_app(app: FastAPI) -> FastAPI:
 app = serve_react_app(fastapi_app)
 
 
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Initialize thread pool for blocking normalizer, SeqRepo, and FUSOR calls. Its
+    size is set by the env var ``CURFU_BLOCKING_WORKERS``.
+
+    :return: executor instance
+    """
+    return ThreadPoolExecutor(
+        max_workers=BLOCKING_WORKERS, thread_name_prefix="curfu-blocking"
+    )
+
+
+def get_validation_pool() -> ProcessPoolExecutor:
+    """Initialize process pool for batch fusion validation. Its size is set by the env
+    var ``CURFU_VALIDATION_WORKERS``, defaulting to 2 per server process. Worker
+    processes are started on demand, and are spawned rather than forked so that they
+    don't inherit the server's threads and connections.
+
+    :return: executor instance
+    """
+    return ProcessPoolExecutor(
+        max_workers=VALIDATION_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_validation_worker,
+    )
+
+
 async def start_fusor() -> FUSOR:
     """Initialize FUSOR instance and create UTA thread pool.
 
@@ -142,8 +185,78 @@ async def start_fusor() -> FUSOR:
     return fusor_instance
 
 
+def get_normalizer_service(fusor_instance: FUSOR) -> CachedNormalizer:
+    """Initialize shared gene normalizer cache, and install it in place of FUSOR's
+    own normalizer so that lookups made within FUSOR use it too.
+
+    :param fusor_instance: FUSOR instance
+    :return: CachedNormalizer instance
+    """
+    normalizer = CachedNormalizer(fusor_instance.gene_normalizer)
+    fusor_instance.gene_normalizer = normalizer
+    return normalizer
+
+
+def get_seqrepo_service(fusor_instance: FUSOR) -> CachedSeqRepo:
+    """Initialize shared SeqRepo identifier translation cache, and install it in place
+    of the SeqRepo instance used by FUSOR nomenclature generation and Cool-Seq-Tool
+    sequence lookups.
+
+    :param fusor_instance: FUSOR instance
+    :return: CachedSeqRepo instance
+    """
+    seqrepo = CachedSeqRepo(fusor_instance.seqrepo)
+    fusor_instance.seqrepo = seqrepo
+    fusor_instance.cool_seq_tool.seqrepo_access.sr = seqrepo
+    return seqrepo
+
+
+def get_exon_coords_service(fusor_instance: FUSOR) -> CachedExonCoordsMapper:
+    """Initialize shared transcript exon structure cache, and install it in place of
+    Cool-Seq-Tool's exon/genomic coordinates mapper so that coordinate utilities and
+    FUSOR transcript segment construction all use it.
+
+    :param fusor_instance: FUSOR instance
+    :return: CachedExonCoordsMapper instance
+    """
+    mapper = CachedExonCoordsMapper(fusor_instance.cool_seq_tool.ex_g_coords_mapper)
+    fusor_instance.cool_seq_tool.ex_g_coords_mapper = mapper
+    return mapper
+
+
+def get_mane_index(fusor_instance: FUSOR) -> ManeIndex:
+    """Build MANE transcript index from the MANE summary data already loaded by
+    Cool-Seq-Tool.
+
+    :param fusor_instance: FUSOR instance
+    :return: ManeIndex instance
+    """
+    return ManeIndex(fusor_instance.cool_seq_tool.mane_transcript_mappings)
+
+
+def get_transcripts_service(fusor_instance: FUSOR) -> GeneTranscriptsService:
+    """Initialize gene transcripts service, sharing FUSOR's UTA connection pool.
+
+    :param fusor_instance: FUSOR instance
+    :return: GeneTranscriptsService instance
+    """
+    return GeneTranscriptsService(fusor_instance.cool_seq_tool.uta_db)
+
+
+def get_demo_service(fusor_instance: FUSOR) -> DemoService:
+    """Initialize demo service, rendering all demos up front.
+
+    :param fusor_instance: FUSOR instance
+    :return: DemoService instance
+    """
+    demos = DemoService(fusor_instance)
+    demos.render_all()
+    return demos
+
+
 def get_gene_services() -> GeneService:
-    """Initialize gene services instance. Retrieve and load mappings.
+    """Initialize gene services instance. Retrieve and load mappings, memory-mapping
+    the prebuilt index snapshot if one is available so that all workers share it.
 
     :return: GeneService instance
     """
@@ -151,10 +264,13 @@ def get_gene_services() -> GeneService:
 
 
 def get_domain_services() -> DomainService:
-    """Initialize domain services instance. Retrieve and load mappings.
+    """Initialize domain services instance. Retrieve and load mappings, memory-mapping
+    the prebuilt index snapshot if one is available so that all workers share it.
+    Set env var ``CURFU_LAZY_DOMAINS`` to defer parsing of the domain lookup file when
+    no snapshot is available.
 
     :return: DomainService instance
     """
     domain_service = DomainService()
-    domain_service.load_mapping()
+    domain_service.load_mapping(lazy=LAZY_DOMAINS)
     return domain_service
@@ -1,5 +1,15 @@
 """Provide specific routing methods for API endpoints."""
 
+import asyncio
+from collections.abc import Callable
+from functools import partial
+from typing import ParamSpec, TypeVar
+
+from fastapi import BackgroundTasks, Request
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
 
 def parse_identifier(identifier: str) -> str:
     """Restructure ID value to mesh with serverside requirements
@@ -10,3 +20,38 @@ def parse_identifier(identifier: str) -> str:
     if ":" in identifier:
         identifier = identifier.split(":")[1]
     return identifier
+
+
+async def run_blocking(
+    request: Request, func: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run a blocking call (e.g. to the gene normalizer, SeqRepo, or FUSOR) on the
+    app's dedicated executor, so that it doesn't stall the event loop.
+
+    :param request: the HTTP request context, supplied by FastAPI. Used to access the
+        app executor.
+    :param func: function to call
+    :param args: positional arguments to pass to ``func``
+    :param kwargs: keyword arguments to pass to ``func``
+    :return: result of ``func``
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        request.app.state.executor, partial(func, *args, **kwargs)
+    )
+
+
+def prefetch_transcripts(
+    request: Request, background_tasks: BackgroundTasks, symbol: str
+) -> None:
+    """If enabled, warm the gene's transcript list after the response is sent, so
+    that it's ready by the time the client asks for it.
+
+    :param request: the HTTP request context, supplied by FastAPI. Used to access the
+        transcripts service.
+    :param background_tasks: background tasks for the request, supplied by FastAPI
+    :param symbol: HGNC gene symbol
+    """
+    transcripts = request.app.state.transcripts
+    if transcripts.prefetch_enabled:
+        background_tasks.add_task(transcripts.prefetch, symbol)
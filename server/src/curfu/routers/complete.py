@@ -2,9 +2,10 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Query, Request
 
 from curfu import MAX_SUGGESTIONS, LookupServiceError
+from curfu.routers import prefetch_transcripts
 from curfu.schemas import (
     AssociatedDomainResponse,
     ResponseDict,
@@ -22,35 +23,46 @@ router = APIRouter()
     response_model_exclude_none=True,
     tags=[RouteTag.COMPLETION],
 )
-def suggest_gene(request: Request, term: str = Query("")) -> ResponseDict:
+def suggest_gene(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    term: str = Query(""),
+    limit: int = Query(MAX_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+) -> ResponseDict:
     """Provide completion suggestions for term provided by user.
     \f
     :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
         and UTA-associated tools.
+    :param background_tasks: tasks to run after responding, supplied by FastAPI. Used
+        to prefetch transcripts for a gene matching the term exactly.
     :param term: entered gene term
+    :param limit: maximum number of suggestions to return. If more matches are
+        available, only exact matches are returned, along with a warning.
     :return: JSON response with suggestions listed, or warnings if unable to provide
         suggestions.
     """
     response: ResponseDict = {"term": term}
-    possible_matches = request.app.state.genes.suggest_genes(term)
-    n = (
-        len(possible_matches["concept_id"])
-        + len(possible_matches["symbol"])
-        + len(possible_matches["prev_symbols"])
-        + len(possible_matches["aliases"])
-    )
+    possible_matches, n = request.app.state.genes.suggest_genes(term, limit)
 
     response["matches_count"] = n
-    if n > MAX_SUGGESTIONS:
-        warn = f"Exceeds max matches: Got {n} possible matches for {term} (limit: {MAX_SUGGESTIONS})"
+    if n > limit:
+        warn = (
+            f"Exceeds max matches: Got {n} possible matches for {term} (limit: {limit})"
+        )
         response["warnings"] = [warn]
-        term_upper = term.upper()
-        for match_type in ("concept_id", "symbol", "prev_symbols", "aliases"):
-            reduced = [
-                m for m in possible_matches[match_type] if m[0].upper() == term_upper
-            ]
-            possible_matches[match_type] = reduced
     response.update(possible_matches)
+
+    exact_match = next(
+        (
+            suggestion
+            for suggestions in possible_matches.values()
+            for suggestion in suggestions
+            if suggestion[0].upper() == term.upper()
+        ),
+        None,
+    )
+    if exact_match:
+        prefetch_transcripts(request, background_tasks, exact_match[1])
     return response
 
 
@@ -73,7 +85,7 @@ def suggest_domain(request: Request, gene_id: str = Query("")) -> ResponseDict:
     response: dict[str, Any] = {"gene_id": gene_id}
     try:
         possible_matches = request.app.state.domains.get_possible_domains(gene_id)
-        response["suggestions"] = possible_matches
+        response["suggestions"] = [domain.to_dict() for domain in possible_matches]
     except LookupServiceError:
         response["warnings"] = [f"No associated domains for {gene_id}"]
     return response
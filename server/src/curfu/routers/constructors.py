@@ -5,7 +5,7 @@ from fusor.models import DomainStatus, RegulatoryClass
 from pydantic import ValidationError
 
 from curfu import logger
-from curfu.routers import parse_identifier
+from curfu.routers import parse_identifier, run_blocking
 from curfu.schemas import (
     GeneElementResponse,
     GetDomainResponse,
@@ -27,7 +27,9 @@ router = APIRouter()
     response_model_exclude_none=True,
     tags=[RouteTag.CONSTRUCTORS],
 )
-def build_gene_element(request: Request, term: str = Query("")) -> GeneElementResponse:
+async def build_gene_element(
+    request: Request, term: str = Query("")
+) -> GeneElementResponse:
     """Construct valid gene element given user-provided term.
 
     \f
@@ -36,7 +38,9 @@ def build_gene_element(request: Request, term: str = Query("")) -> GeneElementRe
     :param term: gene symbol/alias/name/etc
     :return: Pydantic class with gene element if successful and warnings otherwise
     """
-    gene_element, warnings = request.app.state.fusor.gene_element(term)
+    gene_element, warnings = await run_blocking(
+        request, request.app.state.fusor.gene_element, term
+    )
     return GeneElementResponse(
         element=gene_element, warnings=[] if not warnings else [warnings]
     )
@@ -127,7 +131,7 @@ async def build_tx_segment_gc(
     response_model_exclude_none=True,
     tags=[RouteTag.CONSTRUCTORS],
 )
-def build_templated_sequence_element(
+async def build_templated_sequence_element(
     request: Request, start: int, end: int, sequence_id: str, strand: str
 ) -> TemplatedSequenceElementResponse:
     """Construct templated sequence element
@@ -147,7 +151,9 @@ def build_templated_sequence_element(
         warning = f"Received invalid strand value: {strand}"
         logger.warning(warning)
         return TemplatedSequenceElementResponse(warnings=[warning], element=None)
-    element = request.app.state.fusor.templated_sequence_element(
+    element = await run_blocking(
+        request,
+        request.app.state.fusor.templated_sequence_element,
         start=start,
         end=end,
         sequence_id=parse_identifier(sequence_id),
@@ -163,7 +169,7 @@ def build_templated_sequence_element(
     response_model_exclude_none=True,
     tags=[RouteTag.CONSTRUCTORS],
 )
-def build_domain(
+async def build_domain(
     request: Request,
     status: DomainStatus,
     name: str,
@@ -190,8 +196,16 @@ def build_domain(
     """
     response: ResponseDict = {}
     try:
-        domain, warnings = request.app.state.fusor.functional_domain(
-            status, name, domain_id, gene_id, sequence_id, start, end
+        domain, warnings = await run_blocking(
+            request,
+            request.app.state.fusor.functional_domain,
+            status,
+            name,
+            domain_id,
+            gene_id,
+            sequence_id,
+            start,
+            end,
         )
         if warnings:
             response["warnings"] = [warnings]
@@ -209,7 +223,7 @@ def build_domain(
     response_model_exclude_none=True,
     tags=[RouteTag.CONSTRUCTORS],
 )
-def build_regulatory_element(
+async def build_regulatory_element(
     request: Request, element_class: RegulatoryClass, gene_name: str
 ) -> ResponseDict:
     """Construct regulatory element from given params.
@@ -224,7 +238,7 @@ def build_regulatory_element(
         normalized_class = RegulatoryClass[element_class.upper()]
     except KeyError:
         return {"warnings": [f"unrecognized regulatory class value: {element_class}"]}
-    element, warnings = request.app.state.fusor.regulatory_element(
-        normalized_class, gene_name
+    element, warnings = await run_blocking(
+        request, request.app.state.fusor.regulatory_element, normalized_class, gene_name
     )
     return {"regulatoryElement": element, "warnings": warnings}
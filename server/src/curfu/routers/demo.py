@@ -1,271 +1,80 @@
 """Provide routes for accessing demo objects to client."""
 
-from uuid import uuid4
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from fastapi import APIRouter, Request
-from fusor import FUSOR, examples
-from fusor.models import (
-    AssayedFusion,
-    CategoricalFusion,
-    FUSORTypes,
-    RegulatoryElement,
-    StructuralElementType,
-)
-from fusor.nomenclature import (
-    gene_nomenclature,
-    reg_element_nomenclature,
-    templated_seq_nomenclature,
-    tx_segment_nomenclature,
-)
-
-from curfu.schemas import (
-    ClientAssayedFusion,
-    ClientCategoricalFusion,
-    ClientGeneElement,
-    ClientLinkerElement,
-    ClientMultiplePossibleGenesElement,
-    ClientTemplatedSequenceElement,
-    ClientTranscriptSegmentElement,
-    ClientUnknownGeneElement,
-    DemoResponse,
-    GeneElement,
-    LinkerElement,
-    MultiplePossibleGenesElement,
-    RouteTag,
-    TemplatedSequenceElement,
-    TranscriptSegmentElement,
-    UnknownGeneElement,
-)
+from curfu import LookupServiceError
+from curfu.schemas import DemoResponse, RouteTag
 
 router = APIRouter()
 
-
-ElementUnion = (
-    TranscriptSegmentElement
-    | LinkerElement
-    | TemplatedSequenceElement
-    | GeneElement
-    | UnknownGeneElement
-    | MultiplePossibleGenesElement
-)
-ClientElementUnion = (
-    ClientTranscriptSegmentElement
-    | ClientLinkerElement
-    | ClientTemplatedSequenceElement
-    | ClientGeneElement
-    | ClientUnknownGeneElement
-    | ClientMultiplePossibleGenesElement
-)
-Fusion = CategoricalFusion | AssayedFusion
-ClientFusion = ClientCategoricalFusion | ClientAssayedFusion
-
-
-def clientify_structural_element(
-    element: ElementUnion,
-    fusor_instance: FUSOR,
-) -> ClientElementUnion:
-    """Add fields required by client to structural element object.
-
-    :param element: a structural element object
-    :param fusor_instance: instantiated FUSOR object, passed down from FastAPI request
-        context
-    :return: client-ready structural element
+# routes for each FUSOR example, keeping the operation IDs that generated client code
+# refers to. Other demos are served by the generic route below.
+EXAMPLE_DEMO_ROUTES = {
+    "alk": ("alkDemo", "Retrieve ALK assayed fusion."),
+    "ewsr1": ("ewsr1Demo", "Retrieve EWSR1 assayed fusion."),
+    "bcr_abl1": ("bcrAbl1Demo", "Retrieve BCR-ABL1 categorical fusion."),
+    "tpm3_ntrk1": ("tpm3Ntrk1Demo", "Retrieve TPM3-NTRK1 assayed fusion."),
+    "tpm3_pdgfrb": ("tpm3PdgfrbDemo", "Retrieve TPM3-PDGFRB assayed fusion."),
+    "igh_myc": ("ighMycDemo", "Retrieve IGH-MYC assayed fusion."),
+}
+
+
+def get_demo_response(request: Request, name: str) -> Response:
+    """Get client-ready demo fusion response.
+
+    :param request: the HTTP request context. Use to access the demo registry.
+    :param name: demo name
+    :return: JSON response containing client-ready demo fusion
+    :raise HTTPException: if no demo by that name is available
     """
-    element_args = element.model_dump()
-    element_args["elementId"] = str(uuid4())
-
-    if element.type == StructuralElementType.UNKNOWN_GENE_ELEMENT:
-        element_args["nomenclature"] = "?"
-        return ClientUnknownGeneElement(**element_args)
-    if element.type == StructuralElementType.MULTIPLE_POSSIBLE_GENES_ELEMENT:
-        element_args["nomenclature"] = "v"
-        return ClientMultiplePossibleGenesElement(**element_args)
-    if element.type == StructuralElementType.LINKER_SEQUENCE_ELEMENT:
-        nm = element.linkerSequence.sequence.root
-        element_args["nomenclature"] = nm
-        return ClientLinkerElement(**element_args)
-    if element.type == StructuralElementType.TEMPLATED_SEQUENCE_ELEMENT:
-        nm = templated_seq_nomenclature(element, fusor_instance.seqrepo)
-        element_args["nomenclature"] = nm
-        element_args["inputChromosome"] = element.region.sequenceReference.id.split(
-            ":"
-        )[1]
-        element_args["inputStart"] = element.region.start
-        element_args["inputEnd"] = element.region.end
-        return ClientTemplatedSequenceElement(**element_args)
-    if element.type == StructuralElementType.GENE_ELEMENT:
-        nm = gene_nomenclature(element)
-        element_args["nomenclature"] = nm
-        return ClientGeneElement(**element_args)
-    if element.type == StructuralElementType.TRANSCRIPT_SEGMENT_ELEMENT:
-        nm = tx_segment_nomenclature(element)
-        element_args["nomenclature"] = nm
-        element_args["inputType"] = "exon_coords"
-        element_args["inputTx"] = element.transcript.split(":")[1]
-        element_args["inputExonStart"] = str(element.exonStart)
-        element_args["inputExonStartOffset"] = str(element.exonStartOffset)
-        element_args["inputExonEnd"] = str(element.exonEnd)
-        element_args["inputExonEndOffset"] = str(element.exonEndOffset)
-        element_args["inputGene"] = element.gene.label
-        return ClientTranscriptSegmentElement(**element_args)
-    msg = "Unknown element type provided"
-    raise ValueError(msg)
+    try:
+        content = request.app.state.demos.get_response(name)
+    except LookupServiceError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    return Response(content, media_type="application/json")
 
 
-def clientify_fusion(fusion: Fusion, fusor_instance: FUSOR) -> ClientFusion:
-    """Add client-required properties to fusion object.
+def _add_example_demo_route(name: str, operation_id: str, description: str) -> None:
+    """Register route for a FUSOR example demo.
 
-    :param fusion: fusion to append to
-    :param fusor_instance: FUSOR object instance provided by FastAPI request context
-    :return: completed client-ready fusion
+    :param name: demo name
+    :param operation_id: OpenAPI operation ID
+    :param description: route description
     """
-    fusion_args = fusion.model_dump()
-    client_elements = [
-        clientify_structural_element(element, fusor_instance)
-        for element in fusion.structure
-    ]
-    fusion_args["structure"] = client_elements
-
-    if fusion_args.get("regulatoryElement"):
-        reg_element_args = fusion_args["regulatoryElement"]
-        nomenclature = reg_element_nomenclature(
-            RegulatoryElement(**reg_element_args), fusor_instance.seqrepo
-        )
-        reg_element_args["nomenclature"] = nomenclature
-        regulatory_class = fusion_args["regulatoryElement"]["regulatoryClass"]
-        if regulatory_class == "enhancer":
-            reg_element_args["displayClass"] = "Enhancer"
-        else:
-            msg = "Undefined reg element class used in demo"
-            raise Exception(msg)
-        reg_element_args["elementId"] = str(uuid4())
-        fusion_args["regulatoryElement"] = reg_element_args
-
-    if fusion.type == FUSORTypes.CATEGORICAL_FUSION:
-        if fusion.criticalFunctionalDomains:
-            client_domains = []
-            for domain in fusion.criticalFunctionalDomains:
-                client_domain = domain.model_dump()
-                client_domain["domainId"] = str(uuid4())
-                client_domains.append(client_domain)
-            fusion_args["criticalFunctionalDomains"] = client_domains
-        return ClientCategoricalFusion(**fusion_args)
-    if fusion.type == FUSORTypes.ASSAYED_FUSION:
-        return ClientAssayedFusion(**fusion_args)
-    msg = "Unknown fusion type provided"
-    raise ValueError(msg)
 
-
-@router.get(
-    "/api/demo/alk",
-    operation_id="alkDemo",
-    response_model=DemoResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.DEMOS],
-)
-def get_alk(request: Request) -> DemoResponse:
-    """Retrieve ALK assayed fusion.
-
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access
-        FUSOR and UTA-associated tools.
-    """
-    return DemoResponse(
-        fusion=clientify_fusion(examples.alk, request.app.state.fusor), warnings=[]
+    def get_example_demo(request: Request) -> Response:
+        return get_demo_response(request, name)
+
+    router.add_api_route(
+        f"/api/demo/{name}",
+        get_example_demo,
+        methods=["GET"],
+        operation_id=operation_id,
+        description=description,
+        response_model=DemoResponse,
+        response_model_exclude_none=True,
+        tags=[RouteTag.DEMOS],
     )
 
 
-@router.get(
-    "/api/demo/ewsr1",
-    operation_id="ewsr1Demo",
-    response_model=DemoResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.DEMOS],
-)
-def get_ewsr1(request: Request) -> DemoResponse:
-    """Retrieve EWSR1 assayed fusion.
-
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
-        and UTA-associated tools.
-    """
-    return DemoResponse(
-        fusion=clientify_fusion(examples.ewsr1, request.app.state.fusor), warnings=[]
-    )
+for demo_name, (demo_operation_id, demo_description) in EXAMPLE_DEMO_ROUTES.items():
+    _add_example_demo_route(demo_name, demo_operation_id, demo_description)
 
 
 @router.get(
-    "/api/demo/bcr_abl1",
-    operation_id="bcrAbl1Demo",
+    "/api/demo/{name}",
+    operation_id="getDemo",
     response_model=DemoResponse,
     response_model_exclude_none=True,
     tags=[RouteTag.DEMOS],
 )
-def get_bcr_abl1(request: Request) -> DemoResponse:
-    """Retrieve BCR-ABL1 categorical fusion.
+def get_demo(request: Request, name: str) -> Response:
+    """Retrieve demo fusion by name, including any added to the local demo directory.
     \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
-        and UTA-associated tools.
+    :param request: the HTTP request context, supplied by FastAPI. Use to access the
+        demo registry.
+    :param name: demo name
+    :return: client-ready demo fusion
+    :raise HTTPException: if no demo by that name is available
     """
-    return DemoResponse(
-        fusion=clientify_fusion(examples.bcr_abl1, request.app.state.fusor), warnings=[]
-    )
-
-
-@router.get(
-    "/api/demo/tpm3_ntrk1",
-    operation_id="tpm3Ntrk1Demo",
-    response_model=DemoResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.DEMOS],
-)
-def get_tpm3_ntrk1(request: Request) -> DemoResponse:
-    """Retrieve TPM3-NTRK1 assayed fusion.
-
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
-        and UTA-associated tools.
-    """
-    return DemoResponse(
-        fusion=clientify_fusion(examples.tpm3_ntrk1, request.app.state.fusor),
-        warnings=[],
-    )
-
-
-@router.get(
-    "/api/demo/tpm3_pdgfrb",
-    operation_id="tpm3PdgfrbDemo",
-    response_model=DemoResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.DEMOS],
-)
-def get_tpm3_pdgfrb(request: Request) -> DemoResponse:
-    """Retrieve TPM3-PDGFRB assayed fusion.
-
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
-        and UTA-associated tools.
-    """
-    return DemoResponse(
-        fusion=clientify_fusion(examples.tpm3_pdgfrb, request.app.state.fusor),
-        warnings=[],
-    )
-
-
-@router.get(
-    "/api/demo/igh_myc",
-    operation_id="ighMycDemo",
-    response_model=DemoResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.DEMOS],
-)
-def get_igh_myc(request: Request) -> DemoResponse:
-    """Retrieve IGH-MYC assayed fusion.
-
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
-        and UTA-associated tools.
-    """
-    return DemoResponse(
-        fusion=clientify_fusion(examples.igh_myc, request.app.state.fusor), warnings=[]
-    )
+    return get_demo_response(request, name)
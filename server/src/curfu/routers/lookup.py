@@ -1,11 +1,16 @@
 """Provide routes for basic data lookup endpoints"""
 
-from fastapi import APIRouter, Query, Request
+import asyncio
+
+from fastapi import APIRouter, BackgroundTasks, Query, Request
 
 from curfu import LookupServiceError
+from curfu.routers import prefetch_transcripts, run_blocking
 from curfu.schemas import (
     GetGeneTranscriptsResponse,
     NormalizeGeneResponse,
+    NormalizeGenesRequest,
+    NormalizeGenesResponse,
     ResponseDict,
     RouteTag,
 )
@@ -13,25 +18,21 @@ from curfu.schemas import (
 router = APIRouter()
 
 
-@router.get(
-    "/api/lookup/gene",
-    operation_id="normalizeGene",
-    response_model=NormalizeGeneResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.LOOKUP],
-)
-def normalize_gene(request: Request, term: str = Query("")) -> NormalizeGeneResponse:
-    """Normalize gene term provided by user.
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
-        and UTA-associated tools.
+async def _normalize_gene_term(request: Request, term: str) -> NormalizeGeneResponse:
+    """Normalize a single gene term.
+
+    :param request: the HTTP request context, supplied by FastAPI. Use to access gene
+        services and normalizer.
     :param term: gene symbol/alias/name/etc
-    :return: JSON response with normalized ID if successful and warnings otherwise
+    :return: response with normalized ID if successful and warnings otherwise
     """
     response: ResponseDict = {"term": term}
     try:
-        concept_id, symbol, cased = request.app.state.genes.get_normalized_gene(
-            term.strip(), request.app.state.fusor.gene_normalizer
+        concept_id, symbol, cased = await run_blocking(
+            request,
+            request.app.state.genes.get_normalized_gene,
+            term.strip(),
+            request.app.state.normalizer,
         )
         response["concept_id"] = concept_id
         response["symbol"] = symbol
@@ -44,6 +45,61 @@ def normalize_gene(request: Request, term: str = Query("")) -> NormalizeGeneResp
     return NormalizeGeneResponse(**response)
 
 
+@router.get(
+    "/api/lookup/gene",
+    operation_id="normalizeGene",
+    response_model=NormalizeGeneResponse,
+    response_model_exclude_none=True,
+    tags=[RouteTag.LOOKUP],
+)
+async def normalize_gene(
+    request: Request, background_tasks: BackgroundTasks, term: str = Query("")
+) -> NormalizeGeneResponse:
+    """Normalize gene term provided by user.
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
+        and UTA-associated tools.
+    :param background_tasks: tasks to run after responding, supplied by FastAPI. Used
+        to prefetch transcripts for the normalized gene.
+    :param term: gene symbol/alias/name/etc
+    :return: JSON response with normalized ID if successful and warnings otherwise
+    """
+    response = await _normalize_gene_term(request, term)
+    if response.symbol:
+        prefetch_transcripts(request, background_tasks, response.symbol)
+    return response
+
+
+@router.post(
+    "/api/lookup/genes",
+    operation_id="normalizeGenes",
+    response_model=NormalizeGenesResponse,
+    response_model_exclude_none=True,
+    tags=[RouteTag.LOOKUP],
+)
+async def normalize_genes(
+    request: Request, genes_request: NormalizeGenesRequest
+) -> NormalizeGenesResponse:
+    """Normalize many gene terms at once.
+
+    Repeated terms are only looked up once, and distinct terms are looked up
+    concurrently. Results are returned in the same order as the provided terms.
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
+        and UTA-associated tools.
+    :param genes_request: gene symbols/aliases/names/etc to normalize
+    :return: JSON response with a normalization result for each provided term
+    """
+    unique_terms = list(dict.fromkeys(genes_request.terms))
+    unique_results = await asyncio.gather(
+        *(_normalize_gene_term(request, term) for term in unique_terms)
+    )
+    results = dict(zip(unique_terms, unique_results, strict=True))
+    return NormalizeGenesResponse(
+        results=[results[term] for term in genes_request.terms]
+    )
+
+
 @router.get(
     "/api/utilities/get_transcripts_for_gene",
     operation_id="getTranscriptsFromGene",
@@ -58,12 +114,11 @@ async def get_transcripts_for_gene(request: Request, gene: str) -> dict:
     :param str gene: gene term provided by user
     :return: Dict containing transcripts if lookup succeeds, or warnings upon failure
     """
-    normalized = request.app.state.fusor.gene_normalizer.normalize(gene)
-    symbol = normalized.gene.label
-    transcripts = await request.app.state.fusor.cool_seq_tool.uta_db.get_transcripts(
-        gene=symbol
+    normalized = await run_blocking(
+        request, request.app.state.normalizer.normalize, gene
     )
-    tx_for_gene = list(transcripts.rows_by_key("tx_ac"))
-    if transcripts.is_empty():
+    symbol = normalized.gene.label
+    tx_for_gene = await request.app.state.transcripts.get_transcripts(symbol)
+    if not tx_for_gene:
         return {"warnings": [f"No matching transcripts: {gene}"], "transcripts": []}
-    return {"transcripts": tx_for_gene}
+    return {"transcripts": list(tx_for_gene)}
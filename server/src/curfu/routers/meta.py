@@ -1,11 +1,11 @@
 """Provide service meta information"""
 
 from cool_seq_tool import __version__ as cool_seq_tool_version
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fusor import __version__ as fusor_version
 
 from curfu import __version__ as curfu_version
-from curfu.schemas import RouteTag, ServiceInfoResponse
+from curfu.schemas import CacheInfoResponse, RouteTag, ServiceInfoResponse
 
 router = APIRouter()
 
@@ -24,3 +24,26 @@ def get_service_info() -> ServiceInfoResponse:
         fusor_version=fusor_version,
         warnings=[],
     )
+
+
+@router.get(
+    "/api/cache_info",
+    operation_id="cacheInfo",
+    response_model=CacheInfoResponse,
+    tags=[RouteTag.META],
+)
+def get_cache_info(request: Request) -> CacheInfoResponse:
+    """Return usage statistics for in-memory lookup caches.
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access
+        app-level services.
+    """
+    return CacheInfoResponse(
+        caches={
+            "gene_normalization": request.app.state.normalizer.cache.stats(),
+            "seqrepo_identifiers": request.app.state.seqrepo.cache.stats(),
+            "exon_coords": request.app.state.exon_coords.cache.stats(),
+            "gene_transcripts": request.app.state.transcripts.cache.stats(),
+        },
+        warnings=[],
+    )
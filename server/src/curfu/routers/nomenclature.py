@@ -1,6 +1,9 @@
 """Provide routes for nomenclature generation."""
 
-from fastapi import APIRouter, Body, Request
+from functools import partial
+
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fusor.exceptions import FUSORParametersException
 from fusor.models import (
     GeneElement,
@@ -16,7 +19,9 @@ from fusor.nomenclature import (
 )
 from pydantic import ValidationError
 
-from curfu import logger
+from curfu import BLOCKING_WORKERS, logger
+from curfu.batch import chunked, generate_nomenclature_chunk, map_ordered, parse_batch
+from curfu.routers import run_blocking
 from curfu.schemas import NomenclatureResponse, ResponseDict, RouteTag
 from curfu.sequence_services import get_strand
 
@@ -30,7 +35,7 @@ router = APIRouter()
     response_model_exclude_none=True,
     tags=[RouteTag.NOMENCLATURE],
 )
-def generate_regulatory_element_nomenclature(
+async def generate_regulatory_element_nomenclature(
     request: Request, regulatory_element: dict = Body()
 ) -> ResponseDict:
     """Build regulatory element nomenclature.
@@ -50,8 +55,11 @@ def generate_regulatory_element_nomenclature(
         )
         return {"nomenclature": "", "warnings": [error_msg]}
     try:
-        nomenclature = reg_element_nomenclature(
-            structured_reg_element, request.app.state.fusor.seqrepo
+        nomenclature = await run_blocking(
+            request,
+            reg_element_nomenclature,
+            structured_reg_element,
+            request.app.state.fusor.seqrepo,
         )
     except ValueError:
         logger.warning(
@@ -101,7 +109,7 @@ def generate_tx_segment_nomenclature(tx_segment: dict = Body()) -> ResponseDict:
     response_model_exclude_none=True,
     tags=[RouteTag.NOMENCLATURE],
 )
-def generate_templated_seq_nomenclature(
+async def generate_templated_seq_nomenclature(
     request: Request, templated_sequence: dict = Body()
 ) -> ResponseDict:
     """Build templated sequence element nomenclature.
@@ -127,8 +135,11 @@ def generate_templated_seq_nomenclature(
         )
         return {"nomenclature": "", "warnings": [error_msg]}
     try:
-        nomenclature = templated_seq_nomenclature(
-            structured_templated_seq, request.app.state.fusor.seqrepo
+        nomenclature = await run_blocking(
+            request,
+            templated_seq_nomenclature,
+            structured_templated_seq,
+            request.app.state.fusor.seqrepo,
         )
     except ValueError:
         logger.warning(
@@ -186,7 +197,7 @@ def generate_gene_nomenclature(gene_element: dict = Body()) -> ResponseDict:
     response_model_exclude_none=True,
     tags=[RouteTag.NOMENCLATURE],
 )
-def generate_fusion_nomenclature(
+async def generate_fusion_nomenclature(
     request: Request, fusion: dict = Body()
 ) -> ResponseDict:
     """Generate nomenclature for complete fusion.
@@ -197,8 +208,61 @@ def generate_fusion_nomenclature(
     :return: response with fusion nomenclature
     """
     try:
-        valid_fusion = request.app.state.fusor.fusion(**fusion)
+        valid_fusion = await run_blocking(
+            request, request.app.state.fusor.fusion, **fusion
+        )
     except FUSORParametersException as e:
         return {"nomenclature": "", "warnings": [str(e)]}
-    nomenclature = request.app.state.fusor.generate_nomenclature(valid_fusion)
+    nomenclature = await run_blocking(
+        request, request.app.state.fusor.generate_nomenclature, valid_fusion
+    )
     return {"nomenclature": nomenclature}
+
+
+@router.post(
+    "/api/nomenclature/batch",
+    operation_id="fusionNomenclatureBatch",
+    response_class=StreamingResponse,
+    tags=[RouteTag.NOMENCLATURE],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"type": "object"}}
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def generate_fusion_nomenclature_batch(request: Request) -> StreamingResponse:
+    """Generate nomenclature for many complete fusions.
+
+    Fusions may be submitted as a JSON array, or as newline-delimited JSON with one
+    fusion per line. Each should be structured as for the single-fusion nomenclature
+    endpoint. The request body is received in full before processing starts. Fusions
+    are then validated and rendered concurrently, and a nomenclature response for each
+    is streamed back as newline-delimited JSON, in input order.
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access
+        FUSOR and SeqRepo.
+    :return: streamed NDJSON, one line per submitted fusion, containing its
+        nomenclature if successful or a list of warnings if not
+    :raise HTTPException: if request body can't be parsed as a batch of fusions
+    """
+    try:
+        fusions = parse_batch(await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Unable to parse fusion batch: {e}"
+        ) from e
+    return StreamingResponse(
+        map_ordered(
+            request.app.state.executor,
+            partial(generate_nomenclature_chunk, request.app.state.fusor),
+            chunked(fusions),
+            max_pending=BLOCKING_WORKERS * 2,
+        ),
+        media_type="application/x-ndjson",
+    )
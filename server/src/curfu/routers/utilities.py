@@ -1,17 +1,21 @@
 """Provide routes for app utility endpoints"""
 
-import tempfile
-from pathlib import Path
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
+from cool_seq_tool.mappers import ExonGenomicCoordsMapper
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 from gene import schemas as gene_schemas
-from starlette.background import BackgroundTasks
 
 from curfu import logger
+from curfu.routers import run_blocking
 from curfu.schemas import (
+    CoordsUtilsBatchResponse,
     CoordsUtilsResponse,
+    GetExonCoordsBatchRequest,
+    GetGenomicCoordsBatchRequest,
     GetTranscriptsResponse,
     RouteTag,
     SequenceIDResponse,
@@ -19,6 +23,14 @@ from curfu.schemas import (
 
 router = APIRouter()
 
+# residues per line of FASTA output
+FASTA_LINE_LENGTH = 60
+# residues fetched from SeqRepo per chunk of streamed output. A multiple of the line
+# length, so that chunks always end on a line break.
+FASTA_CHUNK_SIZE = FASTA_LINE_LENGTH * 4096
+# namespaces of sequence aliases to list in FASTA headers, in order
+FASTA_HEADER_NAMESPACES = ("refseq", "ensembl", "ga4gh")
+
 
 @router.get(
     "/api/utilities/get_transcripts",
@@ -27,7 +39,7 @@ router = APIRouter()
     response_model_exclude_none=True,
     tags=[RouteTag.UTILITIES],
 )
-def get_mane_transcripts(request: Request, term: str) -> dict:
+async def get_mane_transcripts(request: Request, term: str) -> dict | Response:
     """Get MANE transcripts for gene term.
     \f
     :param request: the HTTP request context, supplied by FastAPI. Use to access
@@ -35,29 +47,24 @@ def get_mane_transcripts(request: Request, term: str) -> dict:
     :param term: gene term provided by user
     :return: Dict containing transcripts if lookup succeeds, or warnings upon failure
     """
-    normalized = request.app.state.fusor.gene_normalizer.normalize(term)
+    normalized = await run_blocking(
+        request, request.app.state.normalizer.normalize, term
+    )
     if normalized.match_type == gene_schemas.MatchType.NO_MATCH:
         return {"warnings": [f"Normalization error: {term}"], "transcripts": None}
     if not normalized.normalized_id.startswith("hgnc"):
         return {"warnings": [f"No HGNC symbol: {term}"], "transcripts": None}
-    symbol = normalized.gene.label
-    transcripts = request.app.state.fusor.cool_seq_tool.mane_transcript_mappings.get_gene_mane_data(
-        symbol
+    transcripts = request.app.state.mane.get(
+        normalized.normalized_id, normalized.gene.label
     )
     if not transcripts:
         return {"warnings": [f"No matching transcripts: {term}"]}
-    return {"transcripts": transcripts}
+    # served as prebuilt by the MANE index, skipping response model validation
+    return Response(content=transcripts, media_type="application/json")
 
 
-@router.get(
-    "/api/utilities/get_genomic",
-    operation_id="getGenomicCoords",
-    response_model=CoordsUtilsResponse,
-    response_model_exclude_none=True,
-    tags=[RouteTag.UTILITIES],
-)
-async def get_genome_coords(
-    request: Request,
+async def _get_genome_coords(
+    mapper: ExonGenomicCoordsMapper,
     gene: str | None = None,
     transcript: str | None = None,
     exon_start: int | None = None,
@@ -65,10 +72,9 @@ async def get_genome_coords(
     exon_start_offset: int | None = None,
     exon_end_offset: int | None = None,
 ) -> CoordsUtilsResponse:
-    """Convert provided exon positions to genomic coordinates
-    \f
-    :param request: the HTTP request context, supplied by FastAPI. Use to access
-        FUSOR and UTA-associated tools.
+    """Convert provided exon positions to genomic coordinates.
+
+    :param mapper: Cool-Seq-Tool coordinates mapper to convert with
     :param gene: gene symbol/ID on which exons lie
     :param transcript: transcript accession ID
     :param exon_start: starting exon number. 1-indexed
@@ -106,7 +112,7 @@ async def get_genome_coords(
     if exon_end is not None and exon_end_offset is None:
         exon_end_offset = 0
 
-    response = await request.app.state.fusor.cool_seq_tool.ex_g_coords_mapper.tx_segment_to_genomic(
+    response = await mapper.tx_segment_to_genomic(
         transcript=transcript,
         gene=gene,
         exon_start=exon_start,
@@ -121,25 +127,130 @@ async def get_genome_coords(
     return CoordsUtilsResponse(coordinates_data=response, warnings=None)
 
 
+async def _convert_batch(
+    conversion: Callable[..., Awaitable[CoordsUtilsResponse]],
+    mapper: ExonGenomicCoordsMapper,
+    queries: list[tuple],
+) -> list[CoordsUtilsResponse]:
+    """Run coordinate conversions concurrently, converting each distinct query once.
+
+    A conversion that fails unexpectedly is reported in its result's warnings rather
+    than failing the whole batch.
+
+    :param conversion: function performing a single conversion
+    :param mapper: Cool-Seq-Tool coordinates mapper to convert with
+    :param queries: positional args for ``conversion`` for each conversion
+    :return: conversion results, in the same order as ``queries``
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    unique_results = await asyncio.gather(
+        *(conversion(mapper, *query) for query in unique_queries),
+        return_exceptions=True,
+    )
+    results = {}
+    for query, result in zip(unique_queries, unique_results, strict=True):
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            # don't mask cancellation or interpreter exit as a failed conversion
+            raise result
+        if isinstance(result, Exception):
+            logger.error(f"Unable to convert coordinates for {query}: {result}")
+            result = CoordsUtilsResponse(
+                warnings=[f"Unable to convert coordinates: {result}"],
+                coordinates_data=None,
+            )
+        results[query] = result
+    return [results[query] for query in queries]
+
+
 @router.get(
-    "/api/utilities/get_exon",
-    operation_id="getExonCoords",
+    "/api/utilities/get_genomic",
+    operation_id="getGenomicCoords",
     response_model=CoordsUtilsResponse,
     response_model_exclude_none=True,
     tags=[RouteTag.UTILITIES],
 )
-async def get_exon_coords(
+async def get_genome_coords(
     request: Request,
-    chromosome: str,
-    start: int | None = None,
-    end: int | None = None,
     gene: str | None = None,
     transcript: str | None = None,
+    exon_start: int | None = None,
+    exon_end: int | None = None,
+    exon_start_offset: int | None = None,
+    exon_end_offset: int | None = None,
 ) -> CoordsUtilsResponse:
-    """Convert provided genomic coordinates to exon coordinates
+    """Convert provided exon positions to genomic coordinates
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access
+        FUSOR and UTA-associated tools.
+    :param gene: gene symbol/ID on which exons lie
+    :param transcript: transcript accession ID
+    :param exon_start: starting exon number. 1-indexed
+    :param exon_end: ending exon number. 1-indexed
+    :param exon_start_offset: base offset count from starting exon
+    :param exon_end_offset: base offset count from end exon
+    :return: CoordsUtilsResponse containing relevant data or warnings if unsuccesful
+    """
+    return await _get_genome_coords(
+        request.app.state.fusor.cool_seq_tool.ex_g_coords_mapper,
+        gene,
+        transcript,
+        exon_start,
+        exon_end,
+        exon_start_offset,
+        exon_end_offset,
+    )
+
+
+@router.post(
+    "/api/utilities/get_genomic/batch",
+    operation_id="getGenomicCoordsBatch",
+    response_model=CoordsUtilsBatchResponse,
+    response_model_exclude_none=True,
+    tags=[RouteTag.UTILITIES],
+)
+async def get_genome_coords_batch(
+    request: Request, batch_request: GetGenomicCoordsBatchRequest
+) -> CoordsUtilsBatchResponse:
+    """Convert many sets of exon positions to genomic coordinates.
+
+    Conversions run concurrently on the UTA connection pool. Each transcript's exon
+    structure, and the genomic alignment of each exon, is looked up once and shared
+    by every conversion on it. Results are returned in the same order as the queries,
+    each with its own warnings if it couldn't be converted.
     \f
     :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
         and UTA-associated tools.
+    :param batch_request: exon positions to convert
+    :return: response with genomic coordinates or warnings for each query
+    """
+    mapper = request.app.state.fusor.cool_seq_tool.ex_g_coords_mapper
+    queries = [
+        (
+            q.gene,
+            q.transcript,
+            q.exon_start,
+            q.exon_end,
+            q.exon_start_offset,
+            q.exon_end_offset,
+        )
+        for q in batch_request.queries
+    ]
+    return CoordsUtilsBatchResponse(
+        results=await _convert_batch(_get_genome_coords, mapper, queries)
+    )
+
+
+async def _get_exon_coords(
+    mapper: ExonGenomicCoordsMapper,
+    chromosome: str,
+    start: int | None = None,
+    end: int | None = None,
+    gene: str | None = None,
+    transcript: str | None = None,
+) -> CoordsUtilsResponse:
+    """Convert provided genomic coordinates to exon coordinates.
+
+    :param mapper: Cool-Seq-Tool coordinates mapper to convert with
     :param chromosome: chromosome, either as a number/X/Y or as an accession
     :param start: genomic start position
     :param end: genomic end position
@@ -157,7 +268,7 @@ async def get_exon_coords(
             logger.warning(warning)
         return CoordsUtilsResponse(warnings=warnings, coordinates_data=None)
 
-    response = await request.app.state.fusor.cool_seq_tool.ex_g_coords_mapper.genomic_to_tx_segment(
+    response = await mapper.genomic_to_tx_segment(
         genomic_ac=chromosome,
         seg_start_genomic=start,
         seg_end_genomic=end,
@@ -172,6 +283,73 @@ async def get_exon_coords(
     return CoordsUtilsResponse(coordinates_data=response, warnings=None)
 
 
+@router.get(
+    "/api/utilities/get_exon",
+    operation_id="getExonCoords",
+    response_model=CoordsUtilsResponse,
+    response_model_exclude_none=True,
+    tags=[RouteTag.UTILITIES],
+)
+async def get_exon_coords(
+    request: Request,
+    chromosome: str,
+    start: int | None = None,
+    end: int | None = None,
+    gene: str | None = None,
+    transcript: str | None = None,
+) -> CoordsUtilsResponse:
+    """Convert provided genomic coordinates to exon coordinates
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
+        and UTA-associated tools.
+    :param chromosome: chromosome, either as a number/X/Y or as an accession
+    :param start: genomic start position
+    :param end: genomic end position
+    :param gene: gene symbol or ID
+    :param transcript: transcript accession ID
+    :return: response with exon coordinates if successful, or warnings if failed
+    """
+    return await _get_exon_coords(
+        request.app.state.fusor.cool_seq_tool.ex_g_coords_mapper,
+        chromosome,
+        start,
+        end,
+        gene,
+        transcript,
+    )
+
+
+@router.post(
+    "/api/utilities/get_exon/batch",
+    operation_id="getExonCoordsBatch",
+    response_model=CoordsUtilsBatchResponse,
+    response_model_exclude_none=True,
+    tags=[RouteTag.UTILITIES],
+)
+async def get_exon_coords_batch(
+    request: Request, batch_request: GetExonCoordsBatchRequest
+) -> CoordsUtilsBatchResponse:
+    """Convert many sets of genomic coordinates to exon coordinates.
+
+    Conversions run concurrently on the UTA connection pool. Conversions on the same
+    transcript share a single lookup of its exon structure, and repeated queries are
+    only converted once. Results are returned in the same order as the queries.
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
+        and UTA-associated tools.
+    :param batch_request: genomic coordinates to convert
+    :return: response with exon coordinates or warnings for each query
+    """
+    mapper = request.app.state.fusor.cool_seq_tool.ex_g_coords_mapper
+    queries = [
+        (q.chromosome, q.start, q.end, q.gene, q.transcript)
+        for q in batch_request.queries
+    ]
+    return CoordsUtilsBatchResponse(
+        results=await _convert_batch(_get_exon_coords, mapper, queries)
+    )
+
+
 @router.get(
     "/api/utilities/get_sequence_id",
     operation_id="getSequenceId",
@@ -190,7 +368,7 @@ async def get_sequence_id(request: Request, sequence: str) -> SequenceIDResponse
     params: dict[str, Any] = {"sequence": sequence}
     sr = request.app.state.fusor.cool_seq_tool.seqrepo_access
 
-    sr_ids, errors = sr.translate_identifier(sequence)
+    sr_ids, errors = await run_blocking(request, sr.translate_identifier, sequence)
     if errors:
         params["warnings"] = [f"Identifier {sequence} could not be retrieved"]
         return SequenceIDResponse(**params)
@@ -221,52 +399,131 @@ async def get_sequence_id(request: Request, sequence: str) -> SequenceIDResponse
     return SequenceIDResponse(**params)
 
 
+async def _stream_fasta(
+    request: Request,
+    uri: str,
+    header: str,
+    first_chunk: str,
+    start: int,
+    end: int | None,
+) -> AsyncIterator[str]:
+    """Yield FASTA-formatted sequence, fetching it from SeqRepo a chunk at a time.
+
+    :param request: the HTTP request context, supplied by FastAPI
+    :param uri: namespaced identifier to fetch sequence by
+    :param header: FASTA header line
+    :param first_chunk: already-fetched sequence beginning at ``start``
+    :param start: inter-residue start position of requested region
+    :param end: inter-residue end position of requested region, or None to read to the
+        end of the sequence
+    """
+    sr = request.app.state.fusor.cool_seq_tool.seqrepo_access.sr
+    yield header
+    chunk = first_chunk
+    position = start
+    while True:
+        yield "".join(
+            f"{chunk[i : i + FASTA_LINE_LENGTH]}\n"
+            for i in range(0, len(chunk), FASTA_LINE_LENGTH)
+        )
+        position += len(chunk)
+        if len(chunk) < FASTA_CHUNK_SIZE or position == end:
+            return
+        chunk_end = position + FASTA_CHUNK_SIZE
+        if end is not None:
+            chunk_end = min(chunk_end, end)
+        chunk = await run_blocking(request, sr.fetch_uri, uri, position, chunk_end)
+
+
 @router.get(
     "/api/utilities/download_sequence",
     summary="Get sequence for ID",
     description="Given a known accession identifier, retrieve sequence data and return as a FASTA file",
-    response_class=FileResponse,
+    response_class=StreamingResponse,
     tags=[RouteTag.UTILITIES],
 )
 async def get_sequence(
     request: Request,
-    background_tasks: BackgroundTasks,
     sequence_id: str = Query(
         ..., description="ID of sequence to retrieve, sans namespace"
     ),
-) -> FileResponse:
+    start: int = Query(
+        0, ge=0, description="Inter-residue start position of region to retrieve"
+    ),
+    end: int | None = Query(
+        None,
+        ge=0,
+        description="Inter-residue end position of region to retrieve. If not provided, retrieve through the end of the sequence",
+    ),
+) -> StreamingResponse:
     """Get sequence for requested sequence ID.
 
+    Sequence is streamed from SeqRepo in fixed-size chunks rather than being
+    assembled in full before responding, so whole chromosomes can be downloaded
+    without holding them in memory.
+
     \f
     :param request: the HTTP request context, supplied by FastAPI. Use to access FUSOR
         and UTA-associated tools.
-    :param background_tasks: Starlette background tasks object. Use to clean up
-        tempfile after get method returns.
     :param sequence_id: accession ID, sans namespace, eg `NM_152263.3`
-    :return: FASTA file if successful, or 404 if unable to find matching resource
+    :param start: inter-residue start position of region to retrieve
+    :param end: inter-residue end position of region to retrieve. If not provided,
+        retrieve through the end of the sequence.
+    :return: FASTA file if successful, 404 if unable to find matching resource, or 400
+        if requested region is invalid
     """
-    _, path = tempfile.mkstemp(suffix=".fasta")
-    try:
-        request.app.state.fusor.cool_seq_tool.seqrepo_access.get_fasta_file(
-            sequence_id, Path(path)
+    if end is not None and end <= start:
+        raise HTTPException(
+            status_code=400, detail=f"end ({end}) must be greater than start ({start})"
         )
-    except KeyError as ke:
-        resp = (
-            request.app.state.fusor.cool_seq_tool.seqrepo_access.translate_identifier(
-                sequence_id, "refseq"
-            )
+    seqrepo_access = request.app.state.fusor.cool_seq_tool.seqrepo_access
+    aliases, _ = await run_blocking(
+        request, seqrepo_access.translate_identifier, sequence_id
+    )
+    if not aliases:
+        raise HTTPException(
+            status_code=404, detail="No sequence available for requested identifier"
         )
-        if len(resp[0]) < 1:
-            raise HTTPException(
-                status_code=404, detail="No sequence available for requested identifier"
-            ) from ke
-        try:
-            new_seq_id = resp[0][0].split(":")[1]
-            request.app.state.fusor.cool_seq_tool.get_fasta_file(new_seq_id, Path(path))
-        except KeyError as e:
+    header_aliases = [
+        alias
+        for namespace in FASTA_HEADER_NAMESPACES
+        for alias in aliases
+        if alias.lower().startswith(f"{namespace}:")
+    ]
+    # list the requested ID first, e.g. `ensembl:` aliases for Ensembl IDs
+    header_aliases.sort(key=lambda alias: alias.split(":", 1)[1] != sequence_id)
+    uri = next((a for a in aliases if a.startswith("ga4gh:")), aliases[0])
+
+    # check region bounds up front so that an unusable region is reported as an error
+    # rather than as a truncated or empty file
+    if end is not None:
+        last_residue = await run_blocking(
+            request, seqrepo_access.sr.fetch_uri, uri, end - 1, end
+        )
+        if not last_residue:
             raise HTTPException(
-                status_code=404,
-                detail="No sequence available for requested identifier",
-            ) from e
-    background_tasks.add_task(lambda p: Path(p).unlink(), path)
-    return FileResponse(path, filename=f"{sequence_id}.FASTA")
+                status_code=400,
+                detail=f"end ({end}) is beyond the end of sequence {sequence_id}",
+            )
+    chunk_end = start + FASTA_CHUNK_SIZE
+    if end is not None:
+        chunk_end = min(chunk_end, end)
+    first_chunk = await run_blocking(
+        request, seqrepo_access.sr.fetch_uri, uri, start, chunk_end
+    )
+    if not first_chunk:
+        raise HTTPException(
+            status_code=400,
+            detail=f"start ({start}) is beyond the end of sequence {sequence_id}",
+        )
+
+    header = ">" + "|".join(header_aliases or [uri])
+    filename = sequence_id
+    if start or end is not None:
+        header += f" {start}-{end if end is not None else ''}"
+        filename += f"_{start}-{end if end is not None else ''}"
+    return StreamingResponse(
+        _stream_fasta(request, uri, f"{header}\n", first_chunk, start, end),
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.FASTA"'},
+    )
@@ -1,8 +1,12 @@
 """Provide validation endpoint to confirm correctness of fusion object structure."""
 
-from fastapi import APIRouter, Body, Request
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fusor.exceptions import FUSORParametersException
 
+from curfu import VALIDATION_WORKERS
+from curfu.batch import chunked, map_ordered, parse_batch, validate_fusion_chunk
+from curfu.routers import run_blocking
 from curfu.schemas import ResponseDict, RouteTag, ValidateFusionResponse
 
 router = APIRouter()
@@ -15,7 +19,7 @@ router = APIRouter()
     response_model_exclude_none=True,
     tags=[RouteTag.VALIDATORS],
 )
-def validate_fusion(request: Request, fusion: dict = Body()) -> ResponseDict:
+async def validate_fusion(request: Request, fusion: dict = Body()) -> ResponseDict:
     """Validate proposed Fusion object. Return warnings if invalid.
 
     For reasons that hopefully change someday, messages transmitted to this endpoint
@@ -30,9 +34,58 @@ def validate_fusion(request: Request, fusion: dict = Body()) -> ResponseDict:
     fusor = request.app.state.fusor
     response = {}
     try:
-        verified_fusion = fusor.fusion(**fusion)
+        verified_fusion = await run_blocking(request, fusor.fusion, **fusion)
     except FUSORParametersException as e:
         response["warnings"] = str(e).split("\n")
     else:
         response["fusion"] = verified_fusion
     return response
+
+
+@router.post(
+    "/api/validate/batch",
+    operation_id="validateFusions",
+    response_class=StreamingResponse,
+    tags=[RouteTag.VALIDATORS],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"type": "object"}}
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def validate_fusions(request: Request) -> StreamingResponse:
+    """Validate many proposed Fusion objects.
+
+    Fusions may be submitted as a JSON array, or as newline-delimited JSON with one
+    fusion per line. Each should be structured as for the single-fusion validation
+    endpoint. The request body is received in full before validation starts. Fusions
+    are then validated in parallel worker processes, and a validation response for
+    each is streamed back as newline-delimited JSON, in input order.
+    \f
+    :param request: the HTTP request context, supplied by FastAPI. Use to access the
+        validation process pool.
+    :return: streamed NDJSON, one line per submitted fusion, containing the validated
+        Fusion object if correct or a list of warnings if not
+    :raise HTTPException: if request body can't be parsed as a batch of fusions
+    """
+    try:
+        fusions = parse_batch(await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Unable to parse fusion batch: {e}"
+        ) from e
+    return StreamingResponse(
+        map_ordered(
+            request.app.state.validation_pool,
+            validate_fusion_chunk,
+            chunked(fusions),
+            max_pending=VALIDATION_WORKERS * 2,
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -32,6 +32,8 @@ from pydantic import (
     field_validator,
 )
 
+from curfu import MAX_COORDS_BATCH_SIZE, MAX_GENE_BATCH_SIZE
+
 ResponseWarnings = list[StrictStr] | None
 
 ResponseDict = dict[
@@ -140,6 +142,18 @@ class NormalizeGeneResponse(Response):
     cased: StrictStr | None
 
 
+class NormalizeGenesRequest(BaseModel):
+    """Request model for batch gene normalization endpoint."""
+
+    terms: list[StrictStr] = Field(..., max_length=MAX_GENE_BATCH_SIZE)
+
+
+class NormalizeGenesResponse(Response):
+    """Response model for batch gene normalization endpoint."""
+
+    results: list[NormalizeGeneResponse]
+
+
 class SuggestGeneResponse(Response):
     """Response model for gene autocomplete suggestions endpoint."""
 
@@ -212,6 +226,45 @@ class CoordsUtilsResponse(Response):
     coordinates_data: GenomicTxSegService | None
 
 
+class GenomicCoordsQuery(BaseModel):
+    """Genomic coordinates to convert to exon coordinates."""
+
+    chromosome: StrictStr
+    start: StrictInt | None = None
+    end: StrictInt | None = None
+    gene: StrictStr | None = None
+    transcript: StrictStr | None = None
+
+
+class GetExonCoordsBatchRequest(BaseModel):
+    """Request model for batch genomic-to-exon coordinates conversion."""
+
+    queries: list[GenomicCoordsQuery] = Field(..., max_length=MAX_COORDS_BATCH_SIZE)
+
+
+class TxSegmentQuery(BaseModel):
+    """Exon positions to convert to genomic coordinates."""
+
+    gene: StrictStr | None = None
+    transcript: StrictStr | None = None
+    exon_start: StrictInt | None = None
+    exon_end: StrictInt | None = None
+    exon_start_offset: StrictInt | None = None
+    exon_end_offset: StrictInt | None = None
+
+
+class GetGenomicCoordsBatchRequest(BaseModel):
+    """Request model for batch exon-to-genomic coordinates conversion."""
+
+    queries: list[TxSegmentQuery] = Field(..., max_length=MAX_COORDS_BATCH_SIZE)
+
+
+class CoordsUtilsBatchResponse(Response):
+    """Response model for batch coordinates conversion."""
+
+    results: list[CoordsUtilsResponse]
+
+
 class SequenceIDResponse(Response):
     """Response model for sequence ID retrieval endpoint."""
 
@@ -265,6 +318,22 @@ class ServiceInfoResponse(Response):
     # - the gene normalizer
 
 
+class CacheStats(BaseModel):
+    """Usage statistics for an in-memory lookup cache."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+    ttl: float | None
+
+
+class CacheInfoResponse(Response):
+    """Response model for cache statistics endpoint."""
+
+    caches: dict[str, CacheStats]
+
+
 class ClientCategoricalFusion(CategoricalFusion):
     """Categorial fusion with client-oriented structural element models. Used in
     global FusionContext.
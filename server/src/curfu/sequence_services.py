@@ -2,8 +2,12 @@
 
 import logging
 
+from biocommons.seqrepo import SeqRepo
 from cool_seq_tool.schemas import Strand
 
+from curfu import SEQREPO_CACHE_SIZE
+from curfu.cache import CachingProxy, TTLCache
+
 logger = logging.getLogger("curfu")
 logger.setLevel(logging.DEBUG)
 
@@ -24,3 +28,51 @@ def get_strand(strand_input: str) -> int:
     if strand_input == "-":
         return Strand.NEGATIVE
     raise InvalidInputError
+
+
+class CachedSeqRepo(CachingProxy):
+    """Provide SeqRepo access through a shared cache of identifier translations.
+
+    Translations are the SeqRepo lookup FUSOR nomenclature generation repeats most.
+    Sequence fetches pass straight through to the wrapped SeqRepo instance, since
+    they're rarely repeated and too large to hold on to.
+    """
+
+    def __init__(self, sr: SeqRepo, max_size: int = SEQREPO_CACHE_SIZE) -> None:
+        """Initialize cached SeqRepo.
+
+        :param sr: SeqRepo instance to wrap
+        :param max_size: max number of translations to hold
+        """
+        super().__init__(sr)
+        self.cache = TTLCache(max_size)
+
+    def translate_identifier(
+        self,
+        identifier: str,
+        target_namespaces: str | list[str] | None = None,
+        translate_ncbi_namespace: bool | None = None,
+    ) -> list[str]:
+        """Translate sequence identifier, reusing a cached translation if available.
+        Failed translations aren't cached.
+
+        :param identifier: sequence identifier, optionally namespaced
+        :param target_namespaces: namespace(s) to restrict translations to
+        :param translate_ncbi_namespace: whether to report ``NCBI`` namespace as
+            ``refseq``
+        :return: translated identifiers
+        :raise KeyError: if identifier is unknown
+        """
+        if isinstance(target_namespaces, list):
+            target_namespaces = tuple(target_namespaces)
+        key = (identifier, target_namespaces, translate_ncbi_namespace)
+        try:
+            return list(self.cache[key])
+        except KeyError:
+            translations = self.wrapped.translate_identifier(
+                identifier,
+                target_namespaces=target_namespaces,
+                translate_ncbi_namespace=translate_ncbi_namespace,
+            )
+            self.cache[key] = tuple(translations)
+            return translations
@@ -0,0 +1,252 @@
+"""Provide a compact binary container for prebuilt, read-only lookup tables.
+
+A snapshot file consists of a header, a section directory, and a sequence of named
+sections. Each section is either a byte blob or an array of unsigned 32-bit integers,
+aligned so that it can be used in place as a ``memoryview`` without any parsing.
+Integer arrays are stored in native byte order.
+
+Snapshots are read through a read-only memory map, so every process that opens the
+same file (e.g. each worker of a multi-worker server) shares one copy of its pages via
+the OS page cache.
+
+Snapshots built from a data file record which one in a ``source`` section, so that a
+snapshot can be checked against the data file it's meant to stand in for.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+# magic, format version, section count
+_HEADER = struct.Struct("<8sII")
+# name, typecode, byte offset, item count
+_SECTION = struct.Struct("<32sc7xQQ")
+_ALIGNMENT = 8
+_TYPECODES = {"B", "I"}
+
+# name of section describing the data file a snapshot was built from
+SOURCE_SECTION = "source"
+_SOURCE_READ_SIZE = 1024 * 1024
+
+Section = array | bytes | memoryview
+
+
+class SnapshotError(Exception):
+    """Raise when a snapshot file can't be read or doesn't match expected format."""
+
+
+def write_snapshot(
+    path: Path, magic: bytes, version: int, sections: dict[str, Section]
+) -> None:
+    """Write lookup table sections to a snapshot file.
+
+    :param path: location to save snapshot to
+    :param magic: 8-byte identifier for the kind of table stored
+    :param version: table layout version
+    :param sections: mapping of section name to byte blob or unsigned int array
+    :raise ValueError: if a section name is too long or its contents aren't a
+        supported type
+    """
+    data_start = _HEADER.size + _SECTION.size * len(sections)
+    directory = bytearray()
+    payload = bytearray()
+    for name, data in sections.items():
+        view = memoryview(data)
+        if len(name.encode()) > 32:
+            msg = f"Snapshot section name {name} exceeds 32 bytes"
+            raise ValueError(msg)
+        if view.format not in _TYPECODES:
+            msg = f"Unsupported format `{view.format}` for snapshot section {name}"
+            raise ValueError(msg)
+        payload += b"\0" * (-(data_start + len(payload)) % _ALIGNMENT)
+        directory += _SECTION.pack(
+            name.encode(), view.format.encode(), data_start + len(payload), len(view)
+        )
+        payload += view.tobytes()
+    with path.open("wb") as f:
+        f.write(_HEADER.pack(magic, version, len(sections)))
+        f.write(directory)
+        f.write(payload)
+
+
+def read_snapshot(path: Path, magic: bytes, version: int) -> dict[str, memoryview]:
+    """Memory-map lookup table sections from a snapshot file.
+
+    :param path: location of snapshot file
+    :param magic: expected 8-byte table identifier
+    :param version: expected table layout version
+    :return: mapping of section name to typed memoryview over section contents
+    :raise SnapshotError: if file is unreadable, truncated, or of the wrong kind or
+        version
+    """
+    try:
+        with path.open("rb") as f:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError) as e:
+        msg = f"Unable to map snapshot file {path}"
+        raise SnapshotError(msg) from e
+    if len(data) < _HEADER.size:
+        msg = f"Snapshot file {path} is truncated"
+        raise SnapshotError(msg)
+    file_magic, file_version, n_sections = _HEADER.unpack_from(data)
+    if file_magic != magic:
+        msg = f"Snapshot file {path} doesn't contain the expected table type"
+        raise SnapshotError(msg)
+    if file_version != version:
+        msg = f"Snapshot file {path} has version {file_version} (expected {version})"
+        raise SnapshotError(msg)
+
+    sections = {}
+    for i in range(n_sections):
+        name, typecode, offset, count = _SECTION.unpack_from(
+            data, _HEADER.size + i * _SECTION.size
+        )
+        typecode = typecode.decode()
+        end = offset + count * struct.calcsize(typecode)
+        if end > len(data):
+            msg = f"Snapshot file {path} is truncated"
+            raise SnapshotError(msg)
+        sections[name.rstrip(b"\0").decode()] = data[offset:end].cast(typecode)
+    return sections
+
+
+def get_source_fingerprint(source_file: Path) -> bytes:
+    """Describe a data file, for storage in the source section of a snapshot built
+    from it.
+
+    :param source_file: path to data file
+    :return: JSON-encoded file name, size, and SHA-256 digest of contents
+    """
+    digest = hashlib.sha256()
+    with source_file.open("rb") as f:
+        while data := f.read(_SOURCE_READ_SIZE):
+            digest.update(data)
+    return json.dumps(
+        {
+            "name": source_file.name,
+            "size": source_file.stat().st_size,
+            "sha256": digest.hexdigest(),
+        }
+    ).encode()
+
+
+def is_built_from(sections: dict[str, Section], source_file: Path) -> bool:
+    """Check whether snapshot contents were built from a data file.
+
+    :param sections: snapshot contents
+    :param source_file: path to data file
+    :return: True if the snapshot's source section describes the data file as it
+        currently is, False otherwise (including if the snapshot has no source section)
+    """
+    if SOURCE_SECTION not in sections:
+        return False
+    try:
+        source = json.loads(bytes(sections[SOURCE_SECTION]))
+    except ValueError:
+        return False
+    if source.get("name") != source_file.name:
+        return False
+    if source.get("size") != source_file.stat().st_size:
+        return False
+    return json.loads(get_source_fingerprint(source_file)) == source
+
+
+class StringTable:
+    """Provide deduplicated UTF-8 string storage addressed by integer ID.
+
+    IDs are assigned in sorted order, so comparing IDs is equivalent to comparing the
+    strings themselves.
+    """
+
+    def __init__(self, offsets: Sequence[int], blob: bytes | memoryview) -> None:
+        """Initialize table.
+
+        :param offsets: start position of each string within ``blob``, followed by the
+            end position of the last string
+        :param blob: concatenated UTF-8 encoded strings
+        """
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def build(cls, strings: Iterable[str]) -> tuple["StringTable", dict[str, int]]:
+        """Construct table from arbitrary strings.
+
+        :param strings: strings to store. Duplicates are stored once.
+        :return: new table, and mapping from each string to its ID
+        """
+        unique = sorted(set(strings))
+        offsets = array("I", [0])
+        blob = bytearray()
+        for value in unique:
+            blob += value.encode()
+            offsets.append(len(blob))
+        return cls(offsets, bytes(blob)), {value: i for i, value in enumerate(unique)}
+
+    def sections(self, name: str) -> dict[str, Section]:
+        """Get snapshot sections needed to reconstruct this table.
+
+        :param name: prefix for section names
+        :return: mapping of section name to contents
+        """
+        return {f"{name}_offsets": self.offsets, f"{name}_blob": self.blob}
+
+    @classmethod
+    def from_sections(cls, sections: dict[str, Section], name: str) -> "StringTable":
+        """Reconstruct table from snapshot sections.
+
+        :param sections: snapshot contents
+        :param name: prefix used for section names
+        :return: table backed by the given sections
+        """
+        return cls(sections[f"{name}_offsets"], sections[f"{name}_blob"])
+
+    def __len__(self) -> int:
+        """Get number of stored strings."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, string_id: int) -> str:
+        """Get string by ID."""
+        return str(
+            self.blob[self.offsets[string_id] : self.offsets[string_id + 1]], "utf-8"
+        )
+
+    def raw(self, string_id: int) -> bytes:
+        """Get UTF-8 encoded string by ID."""
+        return bytes(self.blob[self.offsets[string_id] : self.offsets[string_id + 1]])
+
+    def find(self, value: str) -> int | None:
+        """Get ID of a stored string.
+
+        :param value: string to look up
+        :return: ID if string is stored, None otherwise
+        """
+        encoded = value.encode()
+        string_id = bisect_left(range(len(self)), encoded, key=self.raw)
+        if string_id < len(self) and self.raw(string_id) == encoded:
+            return string_id
+        return None
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Locate the run of string IDs whose values begin with ``prefix``.
+
+        UTF-8 preserves code point order under bytewise comparison, so the search runs
+        directly over encoded values.
+
+        :param prefix: string prefix
+        :return: first (inclusive) and last (exclusive) matching ID
+        """
+        encoded = prefix.encode()
+        ids = range(len(self))
+        start = bisect_left(ids, encoded, key=self.raw)
+        if not encoded:
+            return start, len(self)
+        # smallest byte string greater than every string beginning with prefix.
+        # 0xFF never occurs in UTF-8, so the last byte can always be incremented.
+        upper_bound = encoded[:-1] + bytes([encoded[-1] + 1])
+        return start, bisect_left(ids, upper_bound, start, key=self.raw)
@@ -0,0 +1,118 @@
+"""Provide lookup services for gene transcripts."""
+
+from functools import partial
+
+from cool_seq_tool.sources import ManeTranscriptMappings, UtaDatabase
+
+from curfu import (
+    PREFETCH_TRANSCRIPTS,
+    TRANSCRIPTS_CACHE_SIZE,
+    TRANSCRIPTS_CACHE_TTL,
+    logger,
+)
+from curfu.cache import TTLCache
+from curfu.schemas import GetTranscriptsResponse
+
+
+class ManeIndex:
+    """Provide MANE transcript lookup by gene, with responses serialized in advance.
+
+    Each gene's transcripts are validated and rendered to JSON once, when the index is
+    built, so that a lookup is a dictionary access returning ready-to-send bytes.
+    """
+
+    def __init__(self, mappings: ManeTranscriptMappings) -> None:
+        """Build index.
+
+        :param mappings: Cool-Seq-Tool MANE summary data
+        """
+        rows_by_symbol: dict[str, list[dict]] = {}
+        concept_ids: dict[str, str] = {}
+        for row in mappings.df.to_dicts():
+            symbol = row["symbol"].upper()
+            rows_by_symbol.setdefault(symbol, []).append(row)
+            concept_ids[row["HGNC_ID"].lower()] = symbol
+
+        self.by_symbol: dict[str, bytes] = {}
+        for symbol, rows in rows_by_symbol.items():
+            # match ManeTranscriptMappings.get_gene_mane_data: MANE Select first
+            rows.sort(key=lambda row: row["MANE_status"], reverse=True)
+            self.by_symbol[symbol] = (
+                GetTranscriptsResponse(transcripts=rows)
+                .model_dump_json(by_alias=True, exclude_none=True)
+                .encode()
+            )
+        self.by_concept_id = {
+            concept_id: self.by_symbol[symbol]
+            for concept_id, symbol in concept_ids.items()
+        }
+
+    def get(self, concept_id: str, symbol: str) -> bytes | None:
+        """Get serialized MANE transcripts response for gene.
+
+        :param concept_id: normalized gene concept ID, e.g. ``hgnc:1097``
+        :param symbol: gene symbol. Used if concept ID isn't recognized.
+        :return: JSON-encoded ``GetTranscriptsResponse`` if gene has MANE transcripts,
+            None otherwise
+        """
+        response = self.by_concept_id.get(concept_id.lower())
+        if response is None:
+            response = self.by_symbol.get(symbol.upper())
+        return response
+
+
+class GeneTranscriptsService:
+    """Provide the transcript accessions UTA holds for each gene, caching lists once
+    retrieved.
+
+    Lookups are single-flight, so a client request arriving while a prefetch for the
+    same gene is underway awaits that prefetch rather than querying UTA again. Failed
+    lookups aren't cached.
+    """
+
+    def __init__(
+        self,
+        uta_db: UtaDatabase,
+        max_size: int = TRANSCRIPTS_CACHE_SIZE,
+        ttl: float | None = TRANSCRIPTS_CACHE_TTL,
+        prefetch: bool = PREFETCH_TRANSCRIPTS,
+    ) -> None:
+        """Initialize service.
+
+        :param uta_db: Cool-Seq-Tool UTA database access
+        :param max_size: max number of genes to hold transcript lists for
+        :param ttl: seconds to hold each transcript list for
+        :param prefetch: whether routes resolving a gene should warm its transcript
+            list in the background
+        """
+        self.uta_db = uta_db
+        self.cache = TTLCache(max_size, ttl)
+        self.prefetch_enabled = prefetch
+
+    async def get_transcripts(self, symbol: str) -> tuple[str, ...]:
+        """Get transcript accessions for gene, querying UTA only if not already cached.
+
+        :param symbol: HGNC gene symbol
+        :return: transcript accessions, empty if none are available
+        """
+        return await self.cache.shared(symbol, partial(self._query_transcripts, symbol))
+
+    async def _query_transcripts(self, symbol: str) -> tuple[str, ...]:
+        """Query UTA for transcript accessions for gene.
+
+        :param symbol: HGNC gene symbol
+        :return: distinct transcript accessions, in the order UTA provides them
+        """
+        transcripts = await self.uta_db.get_transcripts(gene=symbol)
+        return tuple(transcripts.rows_by_key("tx_ac"))
+
+    async def prefetch(self, symbol: str) -> None:
+        """Warm cached transcript list for gene. Failures are logged rather than
+        raised, since nobody is waiting on the result yet.
+
+        :param symbol: HGNC gene symbol
+        """
+        try:
+            await self.get_transcripts(symbol)
+        except Exception as e:
+            logger.warning(f"Unable to prefetch transcripts for {symbol}: {e}")
@@ -9,6 +9,7 @@ from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from curfu import APP_ROOT, logger
+from curfu.snapshot import SnapshotError, is_built_from, read_snapshot
 
 ObjectSummary = TypeVar("ObjectSummary")
 
@@ -85,3 +86,35 @@ def get_data_file(filename_prefix: str) -> Path:
     if not files:
         return download_s3_file(get_latest_s3_file(filename_prefix))
     return get_latest_data_file(filename_prefix, files)
+
+
+def read_local_snapshot(
+    snapshot_prefix: str, source_prefix: str, magic: bytes, version: int
+) -> dict[str, memoryview] | None:
+    """Load most recent local binary snapshot of a data file that was built from the
+    newest local copy of that data file.
+
+    :param snapshot_prefix: leading text of snapshot filename, eg `gene_index`
+    :param source_prefix: leading text of source data filename, eg `gene_suggest`
+    :param magic: expected 8-byte table identifier
+    :param version: expected table layout version
+    :return: snapshot contents if a current snapshot is available, None otherwise
+    """
+    data_dir = APP_ROOT / "data"
+    snapshots = sorted(data_dir.glob(f"{snapshot_prefix}_*.bin"), reverse=True)
+    if not snapshots:
+        return None
+    sources = sorted(data_dir.glob(f"{source_prefix}_*sv"))
+    for snapshot in snapshots:
+        try:
+            sections = read_snapshot(snapshot, magic, version)
+        except SnapshotError as e:
+            logger.warning(f"Unable to load {snapshot.name}: {e}")
+            continue
+        if not sources or is_built_from(sections, sources[-1]):
+            return sections
+    if sources:
+        logger.warning(
+            f"Ignoring {snapshot_prefix} snapshots: none were built from {sources[-1].name}"
+        )
+    return None
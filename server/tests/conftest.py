@@ -5,7 +5,20 @@ from collections.abc import Callable
 
 import pytest
 import pytest_asyncio
-from curfu.main import app, get_domain_services, get_gene_services, start_fusor
+from curfu.main import (
+    app,
+    get_blocking_executor,
+    get_demo_service,
+    get_domain_services,
+    get_exon_coords_service,
+    get_gene_services,
+    get_mane_index,
+    get_normalizer_service,
+    get_seqrepo_service,
+    get_transcripts_service,
+    get_validation_pool,
+    start_fusor,
+)
 from httpx import ASGITransport, AsyncClient
 
 
@@ -20,12 +33,22 @@ def event_loop():
 @pytest_asyncio.fixture(scope="session")
 async def async_client():
     """Provide httpx async client fixture."""
+    app.state.executor = get_blocking_executor()
+    app.state.validation_pool = get_validation_pool()
     app.state.fusor = await start_fusor()
+    app.state.normalizer = get_normalizer_service(app.state.fusor)
+    app.state.seqrepo = get_seqrepo_service(app.state.fusor)
+    app.state.exon_coords = get_exon_coords_service(app.state.fusor)
+    app.state.mane = get_mane_index(app.state.fusor)
+    app.state.transcripts = get_transcripts_service(app.state.fusor)
+    app.state.demos = get_demo_service(app.state.fusor)
     app.state.genes = get_gene_services()
     app.state.domains = get_domain_services()
     client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
     yield client
     await client.aclose()
+    app.state.executor.shutdown(cancel_futures=True)
+    app.state.validation_pool.shutdown(cancel_futures=True)
 
 
 response_callback_type = Callable[[dict, dict], None]
@@ -52,6 +52,28 @@ async def test_complete_gene(async_client: AsyncClient):
     assert response_json["prev_symbols"] == []
     assert response_json["aliases"] == []
 
+    # test client-provided limit
+    response = await async_client.get("/api/complete/gene?term=NTRK&limit=2")
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["matches_count"] == 4
+    assert response_json["warnings"] == [
+        "Exceeds max matches: Got 4 possible matches for NTRK (limit: 2)"
+    ]
+    assert response_json["symbol"] == []
+
+    response = await async_client.get("/api/complete/gene?term=NTRK1&limit=1")
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["matches_count"] == 1
+    assert "warnings" not in response_json
+    assert response_json["symbol"] == [
+        ["NTRK1", "NTRK1", "hgnc:8031", "NCBI:NC_000001.11", "+"]
+    ]
+
+    response = await async_client.get("/api/complete/gene?term=NTRK&limit=0")
+    assert response.status_code == 422
+
 
 @pytest.mark.asyncio()
 async def test_complete_domain(async_client: AsyncClient):
@@ -1,6 +1,12 @@
 """Test demo endpoints"""
 
+import json
+
 import pytest
+from curfu import LookupServiceError, demo_services
+from curfu.demo_services import DemoService, get_example_demos, load_demo_dir
+from curfu.main import app
+from fusor import examples
 from httpx import AsyncClient
 
 
@@ -34,3 +40,96 @@ async def test_demo(async_client: AsyncClient):
     response = await async_client.get("/api/demo/igh_myc")
     assert response.status_code == 200
     assert response.json()["fusion"]
+
+
+@pytest.mark.asyncio()
+async def test_demo_ids(async_client: AsyncClient):
+    """Test that cached demos get fresh element/domain IDs for each request, unless
+    deterministic IDs are requested.
+    """
+    first = (await async_client.get("/api/demo/bcr_abl1")).json()["fusion"]
+    second = (await async_client.get("/api/demo/bcr_abl1")).json()["fusion"]
+    assert first["structure"][0]["elementId"] != second["structure"][0]["elementId"]
+    assert (
+        first["criticalFunctionalDomains"][0]["domainId"]
+        != second["criticalFunctionalDomains"][0]["domainId"]
+    )
+    for fusion in (first, second):
+        for element in fusion["structure"]:
+            del element["elementId"]
+        for domain in fusion["criticalFunctionalDomains"]:
+            del domain["domainId"]
+    assert first == second
+
+    demos = app.state.demos
+    demos.deterministic_ids = True
+    try:
+        first = await async_client.get("/api/demo/bcr_abl1")
+        second = await async_client.get("/api/demo/bcr_abl1")
+    finally:
+        demos.deterministic_ids = False
+    assert first.content == second.content
+
+
+@pytest.mark.asyncio()
+async def test_unknown_demo(async_client: AsyncClient):
+    """Test that unregistered demos aren't found."""
+    response = await async_client.get("/api/demo/not_a_demo")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio()
+async def test_demo_dir(async_client: AsyncClient, tmp_path):
+    """Test that fusions in a local demo directory are added to the demo registry."""
+    (tmp_path / "teaching_alk.json").write_text(examples.alk.model_dump_json())
+    (tmp_path / "broken.json").write_text("{")
+    demos = load_demo_dir(tmp_path)
+    assert list(demos) == ["teaching_alk"]
+
+    service = DemoService(app.state.fusor, demos=get_example_demos() | demos)
+    assert {"alk", "ewsr1", "bcr_abl1", "teaching_alk"} <= set(service.demos)
+    response = json.loads(service.get_response("teaching_alk"))
+    assert response["fusion"]["type"] == "CategoricalFusion"
+    assert len(response["fusion"]["structure"]) == len(examples.alk.structure)
+
+
+@pytest.mark.asyncio()
+async def test_demo_operation_ids(async_client: AsyncClient):
+    """Test that the per-example demo routes keep their original operation IDs."""
+    schema = (await async_client.get("/openapi.json")).json()
+    operation_ids = {
+        path: operations["get"]["operationId"]
+        for path, operations in schema["paths"].items()
+        if path.startswith("/api/demo/")
+    }
+    assert operation_ids == {
+        "/api/demo/alk": "alkDemo",
+        "/api/demo/ewsr1": "ewsr1Demo",
+        "/api/demo/bcr_abl1": "bcrAbl1Demo",
+        "/api/demo/tpm3_ntrk1": "tpm3Ntrk1Demo",
+        "/api/demo/tpm3_pdgfrb": "tpm3PdgfrbDemo",
+        "/api/demo/igh_myc": "ighMycDemo",
+        "/api/demo/{name}": "getDemo",
+    }
+
+
+@pytest.mark.asyncio()
+async def test_demo_render_error(async_client: AsyncClient, monkeypatch):
+    """Test that demos that can't be rendered are dropped, with the error reported."""
+    clientify_fusion = demo_services.clientify_fusion
+
+    def clientify_fusion_or_fail(fusion, fusor_instance):
+        if fusion is examples.ewsr1:
+            msg = "bad demo"
+            raise ValueError(msg)
+        return clientify_fusion(fusion, fusor_instance)
+
+    monkeypatch.setattr(demo_services, "clientify_fusion", clientify_fusion_or_fail)
+    service = DemoService(
+        app.state.fusor, demos={"alk": examples.alk, "ewsr1": examples.ewsr1}
+    )
+    service.render_all()
+    assert list(service.demos) == ["alk"]
+    assert json.loads(service.get_response("alk"))["fusion"]
+    with pytest.raises(LookupServiceError, match="Unable to render demo ewsr1: bad"):
+        service.get_response("ewsr1")
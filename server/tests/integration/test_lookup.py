@@ -1,6 +1,7 @@
 """Test lookup endpoints"""
 
 import pytest
+from curfu.main import app
 from httpx import AsyncClient
 
 
@@ -51,3 +52,70 @@ async def test_normalize_gene(async_client: AsyncClient):
         "term": "sdfliuwer",
         "warnings": ["Lookup of gene term sdfliuwer failed."],
     }, "Failed lookup should still respond successfully"
+
+
+@pytest.mark.asyncio()
+async def test_normalize_genes(async_client: AsyncClient):
+    """Test /api/lookup/genes endpoint"""
+    response = await async_client.post(
+        "/api/lookup/genes",
+        json={"terms": ["NTRK1", "acee", "sdfliuwer", "NTRK1", "ntrk1"]},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            {
+                "term": "NTRK1",
+                "concept_id": "hgnc:8031",
+                "symbol": "NTRK1",
+                "cased": "NTRK1",
+            },
+            {
+                "term": "acee",
+                "concept_id": "hgnc:108",
+                "symbol": "ACHE",
+                "cased": "ACEE",
+            },
+            {
+                "term": "sdfliuwer",
+                "warnings": ["Lookup of gene term sdfliuwer failed."],
+            },
+            {
+                "term": "NTRK1",
+                "concept_id": "hgnc:8031",
+                "symbol": "NTRK1",
+                "cased": "NTRK1",
+            },
+            {
+                "term": "ntrk1",
+                "concept_id": "hgnc:8031",
+                "symbol": "NTRK1",
+                "cased": "NTRK1",
+            },
+        ]
+    }, "Results should be returned per term, in request order"
+
+    response = await async_client.post("/api/lookup/genes", json={"terms": []})
+    assert response.status_code == 200
+    assert response.json() == {"results": []}
+
+    response = await async_client.post(
+        "/api/lookup/genes", json={"terms": ["NTRK1"] * 1001}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio()
+async def test_normalizer_cache_copies(async_client: AsyncClient):
+    """Test that cached normalizer responses can't be modified by their recipients"""
+    normalizer = app.state.normalizer
+    response = normalizer.normalize("braf")
+    assert response.query == "braf"
+    response.gene.label = "modified"
+
+    response = normalizer.normalize(" BRAF")
+    assert response.query == " BRAF"
+    assert response.gene.label == "BRAF"
+
+    response = await async_client.get("/api/lookup/gene?term=braf")
+    assert response.json()["symbol"] == "BRAF"
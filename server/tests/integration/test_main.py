@@ -1,6 +1,8 @@
 """Test main service routes."""
 
 import pytest
+from curfu.main import app
+from curfu.transcript_services import GeneTranscriptsService
 
 
 @pytest.mark.asyncio()
@@ -13,3 +15,69 @@ async def test_service_info(async_client):
     assert response_json["curfu_version"]
     assert response_json["fusor_version"]
     assert response_json["cool_seq_tool_version"]
+
+
+@pytest.mark.asyncio()
+async def test_cache_info(async_client):
+    """Test that /cache_info endpoint reports lookup cache usage"""
+    await async_client.get("/api/lookup/gene?term=BRAF")
+    await async_client.get("/api/lookup/gene?term=braf")
+    response = await async_client.get("/api/cache_info")
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["warnings"] == []
+    stats = response_json["caches"]["gene_normalization"]
+    assert stats["hits"] >= 1, "repeated lookup should be served from cache"
+    assert stats["misses"] >= 1
+    assert 1 <= stats["size"] <= stats["max_size"]
+
+
+@pytest.mark.asyncio()
+async def test_exon_coords_cache(async_client):
+    """Test that transcript exon structures are shared between coordinate lookups"""
+    response = await async_client.get("/api/cache_info")
+    before = response.json()["caches"]["exon_coords"]
+    for exon_end_offset in (0, -5):
+        response = await async_client.get(
+            "/api/utilities/get_genomic",
+            params={
+                "transcript": "NM_152263.3",
+                "exon_start": 1,
+                "exon_end": 8,
+                "exon_end_offset": exon_end_offset,
+            },
+        )
+        assert response.status_code == 200
+        assert "coordinates_data" in response.json()
+    response = await async_client.get("/api/cache_info")
+    after = response.json()["caches"]["exon_coords"]
+    assert after["hits"] > before["hits"], "second lookup should reuse exon data"
+    assert 1 <= after["size"] <= after["max_size"]
+
+
+@pytest.mark.asyncio()
+async def test_prefetch_transcripts(async_client):
+    """Test that resolving a gene warms its transcript list when prefetch is enabled"""
+    original = app.state.transcripts
+    transcripts = GeneTranscriptsService(original.uta_db, prefetch=True)
+    app.state.transcripts = transcripts
+    try:
+        response = await async_client.get("/api/lookup/gene?term=tpm3")
+        assert response.json()["symbol"] == "TPM3"
+        stats = transcripts.cache.stats()
+        assert (stats["size"], stats["hits"], stats["misses"]) == (1, 0, 1)
+
+        response = await async_client.get(
+            "/api/utilities/get_transcripts_for_gene?gene=TPM3"
+        )
+        assert response.status_code == 200
+        expected = await original.uta_db.get_transcripts(gene="TPM3")
+        assert response.json()["transcripts"] == list(expected.rows_by_key("tx_ac"))
+        stats = transcripts.cache.stats()
+        assert (stats["size"], stats["hits"], stats["misses"]) == (
+            1,
+            1,
+            1,
+        ), "prefetched list should be reused"
+    finally:
+        app.state.transcripts = original
@@ -1,5 +1,7 @@
 """Test /nomenclature/ endpoints."""
 
+import json
+
 import pytest
 from fusor.examples import bcr_abl1
 from httpx import AsyncClient
@@ -230,3 +232,41 @@ async def test_fusion_nomenclature(async_client: AsyncClient):
         response.json().get("nomenclature", "")
         == "NM_004327.3(BCR):e.2+182::ACTAAAGCG::NM_005157.5(ABL1):e.2-173"
     )
+
+
+@pytest.mark.asyncio()
+async def test_fusion_nomenclature_batch(async_client: AsyncClient):
+    """Test correctness of batch fusion nomenclature endpoint."""
+    bcr_abl1_formatted = bcr_abl1.model_dump()
+    bcr_abl1_json = {
+        "structure": bcr_abl1_formatted.get("structure"),
+        "fusion_type": "CategoricalFusion",
+        "reading_frame_preserved": True,
+        "regulatory_element": None,
+        "critical_functional_domains": bcr_abl1_formatted.get(
+            "criticalFunctionalDomains"
+        ),
+    }
+    expected = "NM_004327.3(BCR):e.2+182::ACTAAAGCG::NM_005157.5(ABL1):e.2-173"
+    response = await async_client.post(
+        "/api/nomenclature/batch",
+        json=[bcr_abl1_json, {"type": "NotAFusion", "structure": []}, bcr_abl1_json],
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert len(results) == 3
+    assert results[0] == {"nomenclature": expected}
+    assert results[1]["nomenclature"] == ""
+    assert results[1]["warnings"] == ["Invalid type parameter: NotAFusion"]
+    assert results[2] == {"nomenclature": expected}
+
+    response = await async_client.post(
+        "/api/nomenclature/batch",
+        content=f"{json.dumps(bcr_abl1_json)}\n{{\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert len(results) == 2
+    assert results[0] == {"nomenclature": expected}
+    assert results[1]["warnings"][0].startswith("Unable to parse line 2")
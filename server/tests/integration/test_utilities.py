@@ -3,6 +3,8 @@
 from collections.abc import Callable
 
 import pytest
+from curfu.main import app
+from curfu.schemas import GetTranscriptsResponse
 
 response_callback_type = Callable[[dict, dict], None]
 
@@ -74,6 +76,25 @@ async def test_get_mane_transcript(check_response):
     )
 
 
+@pytest.mark.asyncio()
+async def test_mane_index(async_client):
+    """Test that indexed MANE transcripts match those found by MANE data lookup."""
+    mappings = app.state.fusor.cool_seq_tool.mane_transcript_mappings
+    for symbol in ("BRAF", "ALK", "TPM3"):
+        expected = GetTranscriptsResponse(
+            transcripts=mappings.get_gene_mane_data(symbol)
+        ).model_dump(by_alias=True, exclude_none=True)
+        response = await async_client.get(
+            "/api/utilities/get_transcripts", params={"term": symbol}
+        )
+        assert response.json() == expected
+        hgnc_id = expected["transcripts"][0]["HGNC_ID"]
+        response = await async_client.get(
+            "/api/utilities/get_transcripts", params={"term": hgnc_id}
+        )
+        assert response.json() == expected
+
+
 @pytest.mark.asyncio()
 async def test_get_genomic_coords(check_response):
     """Test coordinates utility endpoint using genomic coords."""
@@ -153,6 +174,41 @@ async def test_get_genomic_coords(check_response):
     )
 
 
+@pytest.mark.asyncio()
+async def test_get_genomic_coords_batch(async_client):
+    """Test /utilities/get_genomic/batch endpoint"""
+    queries = [
+        {"gene": "TPM3", "transcript": "NM_152263.3", "exon_start": 1, "exon_end": 8},
+        {"gene": "TPM3", "transcript": "NM_152263.3", "exon_end": 8},
+        {"transcript": "NM_152263.3", "exon_start": 8, "exon_end": 1},
+        {
+            "gene": "TPM3",
+            "transcript": "NM_152263.3",
+            "exon_start": 1,
+            "exon_end": 8,
+            "exon_end_offset": -5,
+        },
+        {"transcript": "NM_152263.3", "exon_start": 100},
+    ]
+    response = await async_client.post(
+        "/api/utilities/get_genomic/batch", json={"queries": queries}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == len(queries)
+    for query, result in zip(queries, results, strict=True):
+        single_response = await async_client.get(
+            "/api/utilities/get_genomic", params=query
+        )
+        assert result == single_response.json(), f"mismatch for {query}"
+    assert results[0]["coordinates_data"]["genomic_ac"] == "NC_000001.11"
+    assert results[2]["warnings"] == [
+        "Invalid order: exon_end 1 must be >= exon_start 8"
+    ]
+    assert "coordinates_data" not in results[4]
+    assert results[4]["warnings"]
+
+
 @pytest.mark.asyncio()
 async def test_get_exon_coords(check_response):
     """Test /utilities/get_exon endpoint"""
@@ -240,6 +296,38 @@ async def test_get_exon_coords(check_response):
     )
 
 
+@pytest.mark.asyncio()
+async def test_get_exon_coords_batch(async_client):
+    """Test /utilities/get_exon/batch endpoint"""
+    queries = [
+        {"chromosome": "NC_000001.11", "transcript": "NM_152263.3", "start": 154192135},
+        {"chromosome": "NC_000001.11"},
+        {"chromosome": "NC_000001.11", "transcript": "NM_152263.3", "end": 154191900},
+        {"chromosome": "NC_000001.11", "transcript": "NM_152263.3", "start": 154192135},
+    ]
+    response = await async_client.post(
+        "/api/utilities/get_exon/batch", json={"queries": queries}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == len(queries)
+    for query, result in zip(queries, results, strict=True):
+        single_response = await async_client.get(
+            "/api/utilities/get_exon", params=query
+        )
+        assert result == single_response.json(), f"mismatch for {query}"
+    assert results[1]["warnings"] == [
+        "Must provide start and/or end coordinates",
+        "Must provide gene and/or transcript",
+    ]
+
+    response = await async_client.post(
+        "/api/utilities/get_exon/batch", json={"queries": []}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"results": []}
+
+
 @pytest.mark.asyncio()
 async def test_get_sequence_id(check_response):
     """Test sequence ID lookup utility endpoint"""
@@ -289,3 +377,62 @@ async def test_get_sequence_id(check_response):
         },
         check_sequence_id_response,
     )
+
+
+@pytest.mark.asyncio()
+async def test_download_sequence(async_client):
+    """Test sequence download endpoint."""
+    response = await async_client.get(
+        "/api/utilities/download_sequence?sequence_id=NP_001278445.1"
+    )
+    assert response.status_code == 200
+    assert 'filename="NP_001278445.1.FASTA"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert lines[0].startswith(">refseq:NP_001278445.1|")
+    assert "ga4gh:SQ." in lines[0]
+    aliases, _ = app.state.fusor.cool_seq_tool.seqrepo_access.translate_identifier(
+        "NP_001278445.1"
+    )
+    for alias in aliases:
+        if alias.lower().startswith(("ensembl:", "ga4gh:")):
+            assert alias in lines[0].split("|")
+    assert all(len(line) == 60 for line in lines[1:-1])
+    full_sequence = "".join(lines[1:])
+    assert full_sequence.startswith("M")
+
+    # test sub-range
+    response = await async_client.get(
+        "/api/utilities/download_sequence?sequence_id=NP_001278445.1&start=10&end=75"
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].endswith(" 10-75")
+    assert "".join(lines[1:]) == full_sequence[10:75]
+    assert [len(line) for line in lines[1:]] == [60, 5]
+
+    response = await async_client.get(
+        "/api/utilities/download_sequence?sequence_id=NP_001278445.1&start=10&end=10"
+    )
+    assert response.status_code == 400
+
+    response = await async_client.get(
+        f"/api/utilities/download_sequence?sequence_id=NP_001278445.1&start={len(full_sequence)}"
+    )
+    assert response.status_code == 400
+
+    # test end bounds
+    response = await async_client.get(
+        f"/api/utilities/download_sequence?sequence_id=NP_001278445.1&start=10&end={len(full_sequence)}"
+    )
+    assert response.status_code == 200
+    assert "".join(response.text.splitlines()[1:]) == full_sequence[10:]
+    response = await async_client.get(
+        f"/api/utilities/download_sequence?sequence_id=NP_001278445.1&start=10&end={len(full_sequence) + 1}"
+    )
+    assert response.status_code == 400
+    assert "beyond the end of sequence" in response.json()["detail"]
+
+    response = await async_client.get(
+        "/api/utilities/download_sequence?sequence_id=NP_001278445.11"
+    )
+    assert response.status_code == 404
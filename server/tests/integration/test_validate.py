@@ -1,5 +1,7 @@
 """Test /validate endpoint."""
 
+import json
+
 import pytest
 from httpx import AsyncClient
 
@@ -204,3 +206,49 @@ async def test_validate_fusion(
     await check_validated_fusion_response(
         async_client, wrong_type_fusion, "Wrong fusion type case"
     )
+
+
+@pytest.mark.asyncio()
+async def test_validate_fusions(
+    async_client: AsyncClient, alk_fusion, ewsr1_fusion, wrong_type_fusion
+):
+    """Test the batch fusion validation endpoint."""
+    fixtures = [alk_fusion, wrong_type_fusion, ewsr1_fusion, alk_fusion]
+
+    def check_results(response, case_name: str):
+        assert response.status_code == 200, f"{case_name}: status code failed"
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert len(results) == len(fixtures), f"{case_name}: result count incorrect"
+        for i, (result, fixture) in enumerate(zip(results, fixtures, strict=True)):
+            assert (
+                result.get("fusion") == fixture["output"]
+            ), f"{case_name}: fusion {i} incorrect"
+            assert (
+                result.get("warnings") == fixture["warnings"]
+            ), f"{case_name}: warnings {i} incorrect"
+
+    response = await async_client.post(
+        "/api/validate/batch", json=[f["input"] for f in fixtures]
+    )
+    check_results(response, "JSON array")
+
+    response = await async_client.post(
+        "/api/validate/batch",
+        content="\n".join(json.dumps(f["input"]) for f in fixtures),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    check_results(response, "NDJSON")
+
+    response = await async_client.post(
+        "/api/validate/batch",
+        content='{"type": "CategoricalFusion"\n"not json"\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert len(results) == 2
+    assert results[0]["warnings"][0].startswith("Unable to parse line 1")
+    assert results[1] == {"warnings": ["Fusion must be a JSON object"]}
+
+    response = await async_client.post("/api/validate/batch", content="[{}")
+    assert response.status_code == 400
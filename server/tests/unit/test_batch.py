@@ -0,0 +1,98 @@
+"""Test batch parsing and per-item processing."""
+
+from types import SimpleNamespace
+
+import pytest
+from curfu.batch import (
+    InvalidItem,
+    chunked,
+    generate_nomenclature_item,
+    parse_batch,
+    validate_fusion_item,
+)
+from fusor.exceptions import FUSORParametersException, IDTranslationException
+
+
+def test_parse_batch_ndjson():
+    """Test that NDJSON lines are parsed in order, with invalid lines flagged in place"""
+    data = b'{"a": 1}\r\n\n  \n{"b": 2}\nnot json\n\xff\n{"c": 3}'
+    items = list(parse_batch(data))
+    assert items[0] == {"a": 1}
+    assert items[1] == {"b": 2}
+    assert isinstance(items[2], InvalidItem)
+    assert items[2].warning.startswith("Unable to parse line 5:")
+    assert isinstance(items[3], InvalidItem)
+    assert items[3].warning.startswith("Unable to parse line 6:")
+    assert items[4] == {"c": 3}
+    assert len(items) == 5
+    assert list(parse_batch(b"")) == []
+
+
+def test_parse_batch_array():
+    """Test that JSON arrays are parsed whole, and rejected if malformed"""
+    assert list(parse_batch(b' \n[{"a": 1}, {"b": 2}]')) == [{"a": 1}, {"b": 2}]
+    with pytest.raises(ValueError, match="Expecting"):
+        parse_batch(b'[{"a": 1}')
+
+
+def test_chunked():
+    """Test that items are grouped into chunks of at most the given size"""
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+FUSION_ERRORS = {
+    "parameters": FUSORParametersException("first\nsecond"),
+    "type": TypeError("unexpected keyword argument"),
+    "value": ValueError("invalid value"),
+}
+NOMENCLATURE_ERRORS = {
+    "translation": IDTranslationException("untranslatable"),
+    "key": KeyError("missing"),
+}
+
+
+class FakeFusor:
+    """Validate fusions, raising the error named by a fusion's ``raise`` key."""
+
+    def fusion(self, **kwargs):
+        """Validate fusion."""
+        if kwargs.get("raise") in FUSION_ERRORS:
+            raise FUSION_ERRORS[kwargs["raise"]]
+        return kwargs
+
+    def generate_nomenclature(self, fusion):
+        """Generate nomenclature, raising the error named by the fusion."""
+        raise NOMENCLATURE_ERRORS[fusion]
+
+
+@pytest.mark.parametrize(
+    ("item", "warnings"),
+    [
+        ({"raise": "parameters"}, ["first", "second"]),
+        ({"raise": "type"}, ["Unable to validate fusion: unexpected keyword argument"]),
+        ({"raise": "value"}, ["Unable to validate fusion: invalid value"]),
+        (InvalidItem("Unable to parse line 1"), ["Unable to parse line 1"]),
+        ([], ["Fusion must be a JSON object"]),
+    ],
+)
+def test_validate_fusion_item_errors(item, warnings):
+    """Test that every error validating an item is reported as its warnings"""
+    assert validate_fusion_item(FakeFusor(), item).warnings == warnings
+
+
+@pytest.mark.parametrize("error", ["translation", "key"])
+def test_generate_nomenclature_item_errors(monkeypatch, error):
+    """Test that every error validating an item or generating its nomenclature is
+    reported as a warning
+    """
+    assert generate_nomenclature_item(FakeFusor(), {"raise": "type"}).warnings == [
+        "Unable to validate fusion: unexpected keyword argument"
+    ]
+    monkeypatch.setattr(
+        "curfu.batch.validate_fusion_item",
+        lambda *_: SimpleNamespace(warnings=None, fusion=error),
+    )
+    response = generate_nomenclature_item(FakeFusor(), {})
+    assert response.nomenclature == ""
+    assert response.warnings == ["Unable to generate nomenclature for provided fusion"]
@@ -0,0 +1,548 @@
+"""Test construction of the gene-to-domain lookup table."""
+
+import gzip
+import json
+import xml.etree.ElementTree as ET  # noqa: N817
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from curfu.devtools import build_interpro
+from curfu.devtools.build_interpro import (
+    UNIPROT_ENTRY_TAG,
+    _filter_protein_ipr_range,
+    _get_entry_refseq_acs,
+    _get_uniprot_digests,
+    _get_uniprot_sprot_digest,
+    _load_reusable_accessions,
+    _RelevantEntryBuilder,
+    _scan_uniprot_ids,
+    _submit_protein_ipr_gz_blocks,
+    build_gene_domain_maps,
+    filter_protein_ipr_lines,
+    get_domain_manifest_path,
+    get_interpro_uniprot_rels,
+    get_protein_accessions,
+    get_uniprot_refs,
+    write_domain_diff,
+)
+
+PROTEIN_IPR = (
+    b"A0A000\tIPR000001\tKringle\tPF00051\t1\t80\n"
+    b"P15056\tIPR000719\tProtein kinase domain\tPS50011\t457\t717\n"
+    b"P15056\tIPR003116\tRaf-like Ras-binding domain\tPF02196\t155\t227\n"
+    b"P15056\tIPR999999\tIrrelevant domain\tPF99999\t1\t10\n"
+    b"P04629\tIPR000372\tLeucine-rich repeat N-terminal\tSM00013\t33\t64\n"
+    b"Q00000\tIPR000719\tProtein kinase domain\tPS50011\t1\t250\n"
+    b"P04629\tIPR000719\tProtein kinase domain\tPS50011\t510\t781\n"
+)
+DOMAIN_IDS = {"IPR000719", "IPR003116", "IPR000372"}
+UNIPROT_REFS = {
+    "P15056": ("hgnc:1097", "BRAF"),
+    "P04629": ("hgnc:8031", "NTRK1"),
+}
+EXPECTED_ROWS = [
+    ("P15056", "IPR000719", "Protein kinase domain", "457", "717"),
+    ("P15056", "IPR003116", "Raf-like Ras-binding domain", "155", "227"),
+    ("P04629", "IPR000372", "Leucine-rich repeat N-terminal", "33", "64"),
+    ("P04629", "IPR000719", "Protein kinase domain", "510", "781"),
+]
+
+UNIPROT_SPROT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<uniprot xmlns="http://uniprot.org/uniprot">
+<entry dataset="Swiss-Prot" version="1">
+  <accession>P15056</accession>
+  <accession>A4D1T4</accession>
+  <name>BRAF_HUMAN</name>
+  <dbReference type="RefSeq" id="NP_004324.2">
+    <property type="nucleotide sequence ID" value="NM_004333.4"/>
+  </dbReference>
+  <dbReference type="HGNC" id="HGNC:1097">
+    <property type="gene designation" value="BRAF"/>
+  </dbReference>
+</entry>
+<entry dataset="Swiss-Prot" version="2">
+  <accession>Q00000</accession>
+  <accession>P15056</accession>
+  <dbReference type="RefSeq" id="NP_000000.1">
+    <property type="nucleotide sequence ID" value="NM_000000.1"/>
+  </dbReference>
+  <dbReference type="HGNC" id="HGNC:1"/>
+</entry>
+<entry dataset="Swiss-Prot" version="3">
+  <accession>P04629</accession>
+  <name>NTRK1_HUMAN</name>
+  <dbReference type="RefSeq" id="NP_001007793.1">
+    <molecule id="P04629-2"/>
+    <property type="nucleotide sequence ID" value="NM_001007792.1"/>
+  </dbReference>
+  <dbReference type="RefSeq" id="NP_002520.2">
+    <molecule id="P04629-1"/>
+    <property type="nucleotide sequence ID" value="NM_002529.4"/>
+  </dbReference>
+  <dbReference type="HGNC" id="HGNC:8031"/>
+</entry>
+<entry dataset="Swiss-Prot" version="4">
+  <accession>P00001</accession>
+  <dbReference type="RefSeq" id="NP_000001.1"/>
+</entry>
+</uniprot>
+"""
+RELEVANT_PROTEINS = {"P15056", "P04629", "P00001"}
+
+
+@pytest.fixture()
+def _protein_ipr_worker(monkeypatch):
+    """Set filters as held by a protein2ipr worker process."""
+    monkeypatch.setattr(
+        build_interpro,
+        "_worker_domain_ids",
+        frozenset(domain_id.encode() for domain_id in DOMAIN_IDS),
+    )
+    monkeypatch.setattr(
+        build_interpro,
+        "_worker_uniprot_acs",
+        frozenset(uniprot_ac.encode() for uniprot_ac in UNIPROT_REFS),
+    )
+
+
+def test_filter_protein_ipr_lines():
+    """Test that only rows for relevant accessions and domains are kept, in order"""
+    domain_ids = {domain_id.encode() for domain_id in DOMAIN_IDS}
+    uniprot_acs = {uniprot_ac.encode() for uniprot_ac in UNIPROT_REFS}
+    lines = PROTEIN_IPR.splitlines(keepends=True)
+    assert filter_protein_ipr_lines(lines, domain_ids, uniprot_acs) == EXPECTED_ROWS
+    # lines split without line endings, as from a block of lines
+    assert (
+        filter_protein_ipr_lines(PROTEIN_IPR.split(b"\n"), domain_ids, uniprot_acs)
+        == EXPECTED_ROWS
+    )
+    # CRLF line endings
+    lines = PROTEIN_IPR.replace(b"\n", b"\r\n").splitlines(keepends=True)
+    assert filter_protein_ipr_lines(lines, domain_ids, uniprot_acs) == EXPECTED_ROWS
+    assert filter_protein_ipr_lines(lines, domain_ids, set()) == []
+    assert filter_protein_ipr_lines([], domain_ids, uniprot_acs) == []
+
+
+@pytest.mark.usefixtures("_protein_ipr_worker")
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_filter_protein_ipr_range(tmp_path, trailing_newline):
+    """Test that byte ranges of every size, with boundaries falling anywhere within
+    lines, together yield the same rows as a sequential scan
+    """
+    data = PROTEIN_IPR if trailing_newline else PROTEIN_IPR.rstrip(b"\n")
+    path = tmp_path / "protein2ipr_20240101.dat"
+    path.write_bytes(data)
+    assert _filter_protein_ipr_range(path, 0, len(data)) == EXPECTED_ROWS
+
+    for chunk_size in range(1, len(data) + 1):
+        rows = []
+        for start in range(0, len(data), chunk_size):
+            end = min(start + chunk_size, len(data))
+            rows += _filter_protein_ipr_range(path, start, end)
+        assert rows == EXPECTED_ROWS, f"chunk size {chunk_size}"
+
+
+@pytest.mark.usefixtures("_protein_ipr_worker")
+@pytest.mark.parametrize("chunk_size", [1, 10, 50, len(PROTEIN_IPR)])
+def test_submit_protein_ipr_gz_blocks(tmp_path, monkeypatch, chunk_size):
+    """Test that blocks of lines read from multi-member gzip data yield the same rows
+    as a sequential scan, and account for all of the compressed data
+    """
+    monkeypatch.setattr(build_interpro, "PROTEIN_IPR_CHUNK_SIZE", chunk_size)
+    path = tmp_path / "protein2ipr_20240101.dat.gz"
+    path.write_bytes(
+        gzip.compress(PROTEIN_IPR[:100]) + gzip.compress(PROTEIN_IPR[100:])
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        submitted = list(_submit_protein_ipr_gz_blocks(pool, path))
+        rows = [row for future, _ in submitted for row in future.result()]
+    assert rows == EXPECTED_ROWS
+    assert sum(n_bytes for _, n_bytes in submitted) == path.stat().st_size
+
+
+@pytest.mark.parametrize("gzipped", [False, True])
+def test_get_interpro_uniprot_rels(tmp_path, monkeypatch, gzipped):
+    """Test that rows are merged by accession and gene across parallel chunks, from
+    plain or gzipped files
+    """
+    monkeypatch.setattr(build_interpro, "PROTEIN_IPR_CHUNK_SIZE", 50)
+    if gzipped:
+        path = tmp_path / "protein2ipr_20240101.dat.gz"
+        path.write_bytes(gzip.compress(PROTEIN_IPR))
+    else:
+        path = tmp_path / "protein2ipr_20240101.dat"
+        path.write_bytes(PROTEIN_IPR)
+    assert get_interpro_uniprot_rels(
+        path, tmp_path, DOMAIN_IDS, UNIPROT_REFS, workers=2
+    ) == {
+        ("P15056", "hgnc:1097"): {
+            "IPR000719": ("BRAF", "IPR000719", "Protein kinase domain", "457", "717"),
+            "IPR003116": (
+                "BRAF",
+                "IPR003116",
+                "Raf-like Ras-binding domain",
+                "155",
+                "227",
+            ),
+        },
+        ("P04629", "hgnc:8031"): {
+            "IPR000372": (
+                "NTRK1",
+                "IPR000372",
+                "Leucine-rich repeat N-terminal",
+                "33",
+                "64",
+            ),
+            "IPR000719": ("NTRK1", "IPR000719", "Protein kinase domain", "510", "781"),
+        },
+    }
+
+
+def test_get_entry_refseq_acs():
+    """Test that RefSeq accessions are taken for the canonical isoform where
+    isoforms are distinguished, and only for entries with an HGNC reference
+    """
+    entries = ET.fromstring(UNIPROT_SPROT).iter(UNIPROT_ENTRY_TAG)  # noqa: S314
+    assert [_get_entry_refseq_acs(entry) for entry in entries] == [
+        {"hgnc:1097": "NP_004324.2"},
+        {"hgnc:1": "NP_000000.1"},
+        {"hgnc:8031": "NP_002520.2"},
+        {},
+    ]
+
+
+def _get_contents(element):
+    """Get element tags, attributes, and text, ignoring whitespace between elements."""
+    return [(e.tag, e.attrib, (e.text or "").strip()) for e in element.iter()]
+
+
+def test_relevant_entry_builder():
+    """Test that elements are built only for entries whose primary accession is
+    relevant, and that they match those of a full parse
+    """
+    target = _RelevantEntryBuilder(RELEVANT_PROTEINS)
+    parser = ET.XMLParser(target=target)  # noqa: S314
+    for i in range(0, len(UNIPROT_SPROT), 16):
+        parser.feed(UNIPROT_SPROT[i : i + 16])
+    parser.close()
+    assert target.n_entries == 4
+
+    entries = ET.fromstring(UNIPROT_SPROT).findall(UNIPROT_ENTRY_TAG)  # noqa: S314
+    expected = [entries[0], entries[2], entries[3]]
+    assert [_get_contents(entry) for entry in target.entries] == [
+        _get_contents(entry) for entry in expected
+    ]
+
+
+@pytest.mark.parametrize("gzipped", [False, True])
+def test_get_protein_accessions(tmp_path, monkeypatch, gzipped):
+    """Test that RefSeq accessions are extracted for relevant entries only"""
+    monkeypatch.setattr(build_interpro, "UNIPROT_XML_CHUNK_SIZE", 64)
+    if gzipped:
+        path = tmp_path / "uniprot_sprot_20240101.dat.gz"
+        path.write_bytes(gzip.compress(UNIPROT_SPROT))
+    else:
+        path = tmp_path / "uniprot_sprot_20240101.dat"
+        path.write_bytes(UNIPROT_SPROT)
+    assert get_protein_accessions(RELEVANT_PROTEINS, path) == {
+        ("P15056", "hgnc:1097"): "NP_004324.2",
+        ("P04629", "hgnc:8031"): "NP_002520.2",
+    }
+
+
+class FakeDynamoDbClient:
+    """Serve scan pages for a Gene Normalizer table split into segments, recording
+    the scan parameters used.
+    """
+
+    def __init__(self, segments):
+        """Initialize client.
+
+        :param segments: label_and_type values for each item, by segment
+        """
+        self.segments = segments
+        self.scans = []
+
+    def get_paginator(self, operation_name):
+        """Get paginator for operation."""
+        assert operation_name == "scan"
+        return self
+
+    def paginate(self, **kwargs):
+        """Get pages of scan results, one item per page."""
+        self.scans.append(kwargs)
+        for label_and_type in self.segments[kwargs["Segment"]]:
+            yield {"Items": [{"label_and_type": {"S": label_and_type}}]}
+
+
+SEGMENTS = [
+    ["uniprot:p15056##associated_with", "uniprot:p04629##associated_with"],
+    [],
+    ["uniprot:p15056##associated_with"],
+]
+
+
+def test_scan_uniprot_ids():
+    """Test that one segment's references are collected, filtering server-side"""
+    client = FakeDynamoDbClient(SEGMENTS)
+    assert _scan_uniprot_ids(client, "gene_normalizer", 0, 3) == {
+        "uniprot:p15056",
+        "uniprot:p04629",
+    }
+    assert client.scans == [
+        {
+            "TableName": "gene_normalizer",
+            "Segment": 0,
+            "TotalSegments": 3,
+            "ProjectionExpression": "label_and_type",
+            "FilterExpression": "item_type = :item_type AND begins_with(label_and_type, :prefix)",
+            "ExpressionAttributeValues": {
+                ":item_type": {"S": "associated_with"},
+                ":prefix": {"S": "uniprot"},
+            },
+        }
+    ]
+    assert _scan_uniprot_ids(client, "gene_normalizer", 1, 3) == set()
+
+
+def test_get_uniprot_refs(tmp_path, monkeypatch):
+    """Test that every segment is scanned and each distinct reference normalized once"""
+    client = FakeDynamoDbClient(SEGMENTS)
+    genes = SimpleNamespace(meta=SimpleNamespace(client=client), name="gene_normalizer")
+    normalized = {
+        "uniprot:p15056": ("hgnc:1097", "BRAF"),
+        "uniprot:p04629": ("hgnc:8031", "NTRK1"),
+    }
+    queries = []
+
+    class FakeQueryHandler:
+        """Normalize UniProt references."""
+
+        def __init__(self, db):
+            """Initialize query handler."""
+            self.db = db
+
+        def normalize(self, query):
+            """Normalize UniProt reference."""
+            queries.append(query)
+            gene_id, label = normalized[query]
+            return SimpleNamespace(gene=SimpleNamespace(gene_id=gene_id, label=label))
+
+    monkeypatch.setattr(
+        build_interpro, "create_db", lambda: SimpleNamespace(genes=genes)
+    )
+    monkeypatch.setattr(build_interpro, "QueryHandler", FakeQueryHandler)
+    monkeypatch.setattr(build_interpro, "APP_ROOT", tmp_path)
+    (tmp_path / "data").mkdir()
+
+    assert get_uniprot_refs(workers=3) == {
+        "P04629": ("hgnc:8031", "NTRK1"),
+        "P15056": ("hgnc:1097", "BRAF"),
+    }
+    assert sorted(scan["Segment"] for scan in client.scans) == [0, 1, 2]
+    assert sorted(queries) == ["uniprot:p04629", "uniprot:p15056"]
+    (refs_file,) = (tmp_path / "data").glob("uniprot_refs_*.tsv")
+    assert refs_file.read_text() == (
+        "P04629\thgnc:8031\tNTRK1\nP15056\thgnc:1097\tBRAF\n"
+    )
+
+
+BRAF_DOMAINS = {
+    "IPR000719": ("BRAF", "IPR000719", "Protein kinase domain", "457", "717"),
+    "IPR003116": ("BRAF", "IPR003116", "Raf-like Ras-binding domain", "155", "227"),
+}
+NTRK1_DOMAINS = {
+    "IPR000372": ("NTRK1", "IPR000372", "Leucine-rich repeat N-terminal", "33", "64"),
+}
+
+
+def test_get_uniprot_digests():
+    """Test that digests depend on an accession's genes and domains, not their order"""
+    digests = _get_uniprot_digests(
+        {
+            ("P15056", "hgnc:1097"): BRAF_DOMAINS,
+            ("P04629", "hgnc:8031"): NTRK1_DOMAINS,
+            ("P04629", "hgnc:1"): NTRK1_DOMAINS,
+        }
+    )
+    assert set(digests) == {"P15056", "P04629"}
+
+    reordered = _get_uniprot_digests(
+        {
+            ("P04629", "hgnc:1"): NTRK1_DOMAINS,
+            ("P15056", "hgnc:1097"): dict(reversed(BRAF_DOMAINS.items())),
+            ("P04629", "hgnc:8031"): NTRK1_DOMAINS,
+        }
+    )
+    assert reordered == digests
+
+    changed = _get_uniprot_digests(
+        {
+            ("P15056", "hgnc:1097"): {"IPR000719": BRAF_DOMAINS["IPR000719"]},
+            ("P04629", "hgnc:8031"): NTRK1_DOMAINS,
+        }
+    )
+    assert changed["P15056"] != digests["P15056"]
+    assert changed["P04629"] != digests["P04629"]
+
+
+def test_get_uniprot_sprot_digest(tmp_path):
+    """Test that UniProtKB data is fingerprinted the same whether or not gzipped"""
+    path = tmp_path / "uniprot_sprot_20240101.dat"
+    path.write_bytes(UNIPROT_SPROT)
+    gz_path = tmp_path / "uniprot_sprot_20240101.dat.gz"
+    gz_path.write_bytes(gzip.compress(UNIPROT_SPROT))
+    assert _get_uniprot_sprot_digest(path) == _get_uniprot_sprot_digest(gz_path)
+
+    path.write_bytes(UNIPROT_SPROT.replace(b"NP_002520.2", b"NP_002520.3"))
+    assert _get_uniprot_sprot_digest(path) != _get_uniprot_sprot_digest(gz_path)
+
+
+def test_load_reusable_accessions(tmp_path):
+    """Test that only accessions found previously, for unchanged genes and domains
+    and the same UniProtKB data, are reused
+    """
+    previous_path = tmp_path / "domain_lookup_20240101.tsv"
+    previous_path.touch()
+    manifest = {
+        "uniprot_sprot": "sprot-1",
+        "uniprot": {
+            "P15056": {"digest": "a", "refseq": {"hgnc:1097": "NP_004324.2"}},
+            "P04629": {
+                "digest": "b",
+                "refseq": {"hgnc:8031": "NP_002520.2", "hgnc:1": None},
+            },
+            "Q00000": {"digest": "c", "refseq": {"hgnc:2": "NP_000000.1"}},
+        },
+    }
+    (tmp_path / "domain_lookup_20240101.manifest.json").write_text(json.dumps(manifest))
+    digests = {"P15056": "a", "P04629": "b", "Q00000": "changed", "P00001": "d"}
+
+    assert _load_reusable_accessions(previous_path, digests, "sprot-1") == {
+        ("P15056", "hgnc:1097"): "NP_004324.2",
+        ("P04629", "hgnc:8031"): "NP_002520.2",
+    }
+    assert _load_reusable_accessions(previous_path, digests, "sprot-2") == {}
+
+
+def test_build_gene_domain_maps_incremental(tmp_path, monkeypatch):
+    """Test that UniProtKB is only downloaded, and only parsed for changed accessions,
+    when the previous build's RefSeq accessions can't all be reused
+    """
+    release = ["UniProtKB/Swiss-Prot Release 2024_01 of 24-Jan-2024"]
+    next_release = []
+    interpro_uniprot = {
+        ("P15056", "hgnc:1097"): BRAF_DOMAINS,
+        ("P04629", "hgnc:8031"): NTRK1_DOMAINS,
+    }
+    downloads = []
+    lookups = []
+
+    def ftp_download(domain, path, fname, callback):
+        files = {
+            "entry.list": b"ENTRY_AC\tENTRY_TYPE\tENTRY_NAME\n",
+            "reldate.txt": f"{release[0]}\n".encode(),
+        }
+        callback(files[fname])
+
+    def download_uniprot_sprot(output_dir, keep_gz=False):
+        path = tmp_path / f"uniprot_sprot_{len(downloads)}.dat"
+        path.write_bytes(UNIPROT_SPROT)
+        downloads.append(path)
+        release[:] = next_release or release
+        return path
+
+    def get_protein_accessions(relevant_proteins, uniprot_sprot_path, keep_gz=False):
+        lookups.append(relevant_proteins)
+        return original_get_protein_accessions(relevant_proteins, uniprot_sprot_path)
+
+    original_get_protein_accessions = build_interpro.get_protein_accessions
+    monkeypatch.setattr(build_interpro, "ftp_download", ftp_download)
+    monkeypatch.setattr(
+        build_interpro, "download_uniprot_sprot", download_uniprot_sprot
+    )
+    monkeypatch.setattr(
+        build_interpro, "get_protein_accessions", get_protein_accessions
+    )
+    monkeypatch.setattr(
+        build_interpro,
+        "get_interpro_uniprot_rels",
+        lambda *_: {k: dict(v) for k, v in interpro_uniprot.items()},
+    )
+    uniprot_refs_path = tmp_path / "uniprot_refs_20240101.tsv"
+    uniprot_refs_path.write_text("P15056\thgnc:1097\tBRAF\nP04629\thgnc:8031\tNTRK1\n")
+
+    def build(name, previous=None):
+        output_dir = tmp_path / name
+        output_dir.mkdir()
+        build_gene_domain_maps(
+            set(),
+            uniprot_refs_path=uniprot_refs_path,
+            output_dir=output_dir,
+            previous_domains_path=previous,
+        )
+        (domains_path,) = output_dir.glob("domain_lookup_*.tsv")
+        return domains_path
+
+    first = build("first")
+    assert len(downloads) == 1
+    assert lookups == [{"P15056", "P04629"}]
+    manifest = json.loads(get_domain_manifest_path(first).read_text())
+    assert manifest["uniprot_sprot"] == release[0]
+
+    # nothing changed
+    unchanged = build("unchanged", first)
+    assert len(downloads) == 1
+    assert len(lookups) == 1
+    assert unchanged.read_text() == first.read_text()
+
+    # one accession's domains changed
+    interpro_uniprot[("P04629", "hgnc:8031")] = {}
+    build("changed", unchanged)
+    assert len(downloads) == 2
+    assert lookups[1:] == [{"P04629"}]
+
+    # new UniProtKB release
+    interpro_uniprot[("P04629", "hgnc:8031")] = NTRK1_DOMAINS
+    release[0] = "UniProtKB/Swiss-Prot Release 2024_02 of 27-Mar-2024"
+    released = build("released", unchanged)
+    assert len(downloads) == 3
+    assert lookups[2:] == [{"P15056", "P04629"}]
+    assert released.read_text() == first.read_text()
+
+    # new UniProtKB release during download of the changed accession's data
+    interpro_uniprot[("P04629", "hgnc:8031")] = {}
+    next_release.append("UniProtKB/Swiss-Prot Release 2024_03 of 29-May-2024")
+    raced = build("raced", released)
+    assert len(downloads) == 4
+    assert lookups[3:] == [{"P15056", "P04629"}]
+    manifest = json.loads(get_domain_manifest_path(raced).read_text())
+    assert manifest["uniprot_sprot"].startswith("sha256:")
+
+
+def test_write_domain_diff(tmp_path):
+    """Test that added and removed rows are reported, ordered by gene"""
+    previous_path = tmp_path / "domain_lookup_20240101.tsv"
+    previous_path.write_text(
+        "hgnc:8031\tNTRK1\tIPR000372\tLRR\t33\t64\tNP_002520.2\n"
+        "hgnc:1097\tBRAF\tIPR000719\tProtein kinase domain\t457\t717\tNP_004324.2\n"
+        "hgnc:427\tALK\tIPR000719\tProtein kinase domain\t1116\t1392\tNP_004295.2\n"
+    )
+    path = tmp_path / "domain_lookup_20240201.tsv"
+    path.write_text(
+        "hgnc:1097\tBRAF\tIPR000719\tProtein kinase domain\t457\t717\tNP_004324.2\n"
+        "hgnc:8031\tNTRK1\tIPR000372\tLRR\t33\t64\tNP_002520.3\n"
+        "hgnc:1097\tBRAF\tIPR003116\tRaf-like Ras-binding domain\t155\t227\tNP_004324.2\n"
+    )
+    diff_path = tmp_path / "domain_diff_20240201.tsv"
+
+    assert write_domain_diff(previous_path, path, diff_path) == (3, 2, 2)
+    assert diff_path.read_text() == (
+        "+\thgnc:1097\tBRAF\tIPR003116\tRaf-like Ras-binding domain\t155\t227\tNP_004324.2\n"
+        "-\thgnc:427\tALK\tIPR000719\tProtein kinase domain\t1116\t1392\tNP_004295.2\n"
+        "-\thgnc:8031\tNTRK1\tIPR000372\tLRR\t33\t64\tNP_002520.2\n"
+        "+\thgnc:8031\tNTRK1\tIPR000372\tLRR\t33\t64\tNP_002520.3\n"
+    )
+    assert write_domain_diff(path, path, diff_path) == (0, 0, 0)
+    assert diff_path.read_text() == ""
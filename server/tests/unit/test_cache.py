@@ -0,0 +1,77 @@
+"""Test in-memory caching."""
+
+import asyncio
+
+import pytest
+from curfu.cache import CachingProxy, TTLCache
+
+
+@pytest.mark.asyncio()
+async def test_shared():
+    """Test that concurrent lookups share one call, and failed ones are retried"""
+    cache = TTLCache(10)
+    calls = []
+
+    async def lookup(value):
+        calls.append(value)
+        await asyncio.sleep(0)
+        if value is None:
+            raise ValueError
+        return value
+
+    results = await asyncio.gather(
+        *(cache.shared("a", lambda: lookup(1)) for _ in range(3))
+    )
+    assert results == [1, 1, 1]
+    assert await cache.shared("a", lambda: lookup(2)) == 1
+    assert calls == [1]
+
+    for _ in range(2):
+        with pytest.raises(ValueError):  # noqa: PT011
+            await cache.shared("b", lambda: lookup(None))
+        await asyncio.sleep(0)
+        assert "b" not in cache._entries  # noqa: SLF001
+    assert calls == [1, None, None]
+
+
+@pytest.mark.asyncio()
+async def test_shared_cancelled_awaiter():
+    """Test that cancelling one awaiter doesn't cancel the lookup for the others"""
+    cache = TTLCache(10)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def lookup():
+        started.set()
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(cache.shared("a", lookup))
+    await started.wait()
+    second = asyncio.ensure_future(cache.shared("a", lookup))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "done"
+    assert first.cancelled()
+
+
+def test_caching_proxy():
+    """Test that attributes the proxy doesn't define come from the wrapped object"""
+
+    class Wrapped:
+        name = "wrapped"
+
+        def value(self):
+            return 1
+
+    class Proxy(CachingProxy):
+        def value(self):
+            return 2
+
+    proxy = Proxy(Wrapped())
+    assert proxy.name == "wrapped"
+    assert proxy.value() == 2
+    assert proxy.wrapped.value() == 1
+    with pytest.raises(AttributeError):
+        _ = proxy.missing
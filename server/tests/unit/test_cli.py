@@ -0,0 +1,56 @@
+"""Test devtools commands."""
+
+import csv
+
+from click.testing import CliRunner
+from curfu.cli import devtools
+from curfu.gene_services import GeneService
+
+
+def test_gene_index(tmp_path):
+    """Test that gene-index writes a snapshot that the gene service can load"""
+    suggestions_file = tmp_path / "gene_suggest_20240101.csv"
+    with suggestions_file.open("w") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "concept_id",
+                "symbol",
+                "aliases",
+                "previous_symbols",
+                "chromosome",
+                "strand",
+            ]
+        )
+        writer.writerow(["hgnc:1097", "BRAF", "", "", "NCBI:NC_000007.14", "-"])
+        writer.writerow(["hgnc:8031", "NTRK1", "", "", "NCBI:NC_000001.11", "+"])
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    result = CliRunner().invoke(
+        devtools, ["gene-index", "-s", str(suggestions_file), "-o", str(output_dir)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Built gene index snapshot from gene_suggest_20240101.csv" in result.output
+
+    (index_file,) = output_dir.glob("gene_index_*.bin")
+    genes = GeneService(index_file=index_file)
+    assert genes.suggest_genes("ntrk") == (
+        {
+            "concept_id": [],
+            "symbol": [("NTRK1", "NTRK1", "hgnc:8031", "NCBI:NC_000001.11", "+")],
+            "prev_symbols": [],
+            "aliases": [],
+        },
+        1,
+    )
+
+
+def test_domains_missing_manifest(tmp_path):
+    """Test that incremental domain builds require the previous build's manifest"""
+    previous = tmp_path / "domain_lookup_20240101.tsv"
+    previous.touch()
+    result = CliRunner().invoke(devtools, ["domains", "--previous", str(previous)])
+    assert result.exit_code == 2
+    assert "No manifest found for" in result.output
+    assert "domain_lookup_20240101.manifest.json" in result.output
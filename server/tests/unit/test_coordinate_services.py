@@ -0,0 +1,32 @@
+"""Test cached exon coordinate lookups."""
+
+import inspect
+
+import pytest
+from cool_seq_tool.mappers.exon_genomic_coords import ExonGenomicCoordsMapper
+from cool_seq_tool.sources.uta_database import UtaDatabase
+from curfu.coordinate_services import CachedExonCoordsMapper
+
+
+def _parameters(method):
+    return [
+        (p.name, p.kind, p.default)
+        for p in inspect.signature(method).parameters.values()
+    ]
+
+
+@pytest.mark.parametrize("name", ["_get_all_exon_coords", "_get_genomic_aln_coords"])
+def test_overridden_signatures(name):
+    """Test that overridden private Cool-Seq-Tool methods still match upstream, so
+    that an upgrade changing them fails here rather than in production
+    """
+    assert inspect.iscoroutinefunction(getattr(ExonGenomicCoordsMapper, name))
+    assert _parameters(getattr(CachedExonCoordsMapper, name)) == _parameters(
+        getattr(ExonGenomicCoordsMapper, name)
+    )
+
+
+def test_alignment_lookup_signature():
+    """Test that the UTA lookup called by the cached alignment lookup is unchanged"""
+    parameters = inspect.signature(UtaDatabase.get_alt_ac_start_or_end).parameters
+    assert list(parameters) == ["self", "tx_ac", "tx_exon_start", "tx_exon_end", "gene"]
@@ -0,0 +1,49 @@
+"""Test devtools download utilities."""
+
+import gzip
+import io
+
+import pytest
+from curfu import devtools
+from curfu.devtools import _GunzipWriter, ftp_download_gz
+
+DATA = b"".join(f"line {i}\n".encode() for i in range(2000))
+# gzip data consisting of several concatenated members, as produced by e.g. pigz
+MULTI_MEMBER_GZ = gzip.compress(DATA[:5000]) + gzip.compress(DATA[5000:])
+
+
+@pytest.mark.parametrize("piece_size", [1, 7, 4096, len(MULTI_MEMBER_GZ)])
+def test_gunzip_writer(piece_size):
+    """Test that data is decompressed however it's split, across gzip members"""
+    out = io.BytesIO()
+    writer = _GunzipWriter(out)
+    for i in range(0, len(MULTI_MEMBER_GZ), piece_size):
+        writer.write(MULTI_MEMBER_GZ[i : i + piece_size])
+    writer.close()
+    assert out.getvalue() == DATA
+
+
+def test_gunzip_writer_truncated():
+    """Test that truncated gzip data is rejected"""
+    writer = _GunzipWriter(io.BytesIO())
+    writer.write(MULTI_MEMBER_GZ[:-10])
+    with pytest.raises(ValueError, match="incomplete"):
+        writer.close()
+
+
+@pytest.mark.parametrize("decompress", [True, False])
+def test_ftp_download_gz(tmp_path, monkeypatch, decompress):
+    """Test that downloaded gzip data is saved unpacked, or as is"""
+
+    def ftp_download(domain, path, fname, callback):
+        for i in range(0, len(MULTI_MEMBER_GZ), 1000):
+            callback(MULTI_MEMBER_GZ[i : i + 1000])
+
+    monkeypatch.setattr(devtools, "ftp_download", ftp_download)
+    outfile_path = tmp_path / "data.txt"
+    assert (
+        ftp_download_gz("ftp.test", "pub", "data.txt.gz", outfile_path, decompress)
+        == outfile_path
+    )
+    expected = DATA if decompress else MULTI_MEMBER_GZ
+    assert outfile_path.read_bytes() == expected
@@ -0,0 +1,143 @@
+"""Test domain lookup table loading."""
+
+from array import array
+
+import pytest
+from curfu import LookupServiceError, main
+from curfu.domain_services import (
+    DOMAIN_INDEX_MAGIC,
+    DOMAIN_INDEX_VERSION,
+    DomainIndex,
+    DomainRecord,
+    DomainService,
+    LazyDomainIndex,
+)
+from curfu.snapshot import write_snapshot
+
+ROWS = [
+    "hgnc:1097\tBRAF\tIPR000719\tProtein kinase domain\t457\t717\tNP_004324.2",
+    "hgnc:1097\tBRAF\tIPR003116\tRaf-like Ras-binding domain\t155\t227\tNP_004324.2",
+    "HGNC:8031\tNTRK1\tIPR000372\tLeucine-rich repeat N-terminal\t33\t64\tNP_002520.2",
+    # row for a gene already seen, separated from its other rows
+    "hgnc:1097\tBRAF\tIPR020454\tDiacylglycerol/phorbol-ester binding\t234\t280\tNP_004324.2",
+    # domain name containing a vertical tab, which isn't a row separator
+    "hgnc:427\tALK\tIPR000998\tMAM\x0bdomain\t264\t427\tNP_004295.2",
+]
+
+
+@pytest.fixture()
+def domain_file(tmp_path):
+    """Provide small domain lookup table, without a trailing newline."""
+    path = tmp_path / "domain_lookup_20240101.tsv"
+    path.write_text("\n".join(ROWS))
+    return path
+
+
+def test_lazy_domain_index(domain_file):
+    """Test that lazily parsed domains match those parsed up front"""
+    index = DomainIndex(DomainIndex.build(domain_file))
+    lazy_index = LazyDomainIndex(domain_file, cache_size=1)
+
+    assert set(lazy_index.ranges) == {"hgnc:1097", "hgnc:8031", "hgnc:427"}
+    assert len(lazy_index.ranges["hgnc:1097"]) == 2
+    for gene_id in ("hgnc:1097", "hgnc:8031", "hgnc:427", "hgnc:1097"):
+        assert lazy_index.get(gene_id) == index.get(gene_id)
+    assert lazy_index.get("hgnc:427") == [
+        DomainRecord("interpro:IPR000998", "MAM\x0bdomain", 264, 427, "NP_004295.2")
+    ]
+    assert [d.interpro_id for d in lazy_index.get("hgnc:1097")] == [
+        "interpro:IPR000719",
+        "interpro:IPR003116",
+        "interpro:IPR020454",
+    ]
+    assert lazy_index.get("hgnc:99999") is None
+    assert lazy_index.get("") is None
+
+
+def test_domain_index_invalid_rows(tmp_path):
+    """Test that blank, non-domain, and truncated lines are skipped the same way
+    whether domains are parsed up front or lazily
+    """
+    path = tmp_path / "domain_lookup_20240101.tsv"
+    path.write_text(
+        f"\n{ROWS[0]}\n\nnot a row\n"
+        "hgnc:1097\tBRAF\tIPR003116\n"
+        "hgnc:8031\tNTRK1\tIPR000372\tLeucine-rich repeat N-terminal\t33\t64\n"
+        f"{ROWS[2]}\n"
+    )
+    index = DomainIndex(DomainIndex.build(path))
+    lazy_index = LazyDomainIndex(path)
+    assert set(lazy_index.ranges) == {"hgnc:1097", "hgnc:8031"}
+    for gene_id in ("hgnc:1097", "hgnc:8031", "not a row", ""):
+        assert lazy_index.get(gene_id) == index.get(gene_id)
+    assert index.get("hgnc:1097") == [
+        DomainRecord(
+            "interpro:IPR000719", "Protein kinase domain", 457, 717, "NP_004324.2"
+        )
+    ]
+    assert len(index.get("hgnc:8031")) == 1
+
+
+def test_load_mapping_local_snapshot(domain_file, tmp_path, monkeypatch):
+    """Test that the local snapshot is only used while it was built from the newest
+    local domain lookup table, however their filenames are dated
+    """
+    data_dir = tmp_path / "app" / "data"
+    data_dir.mkdir(parents=True)
+    monkeypatch.setattr("curfu.utils.APP_ROOT", data_dir.parent)
+    monkeypatch.setattr(
+        "curfu.domain_services.get_data_file",
+        lambda _: sorted(data_dir.glob("domain_lookup_*.tsv"))[-1],
+    )
+    old_file = data_dir / "domain_lookup_20240101.tsv"
+    old_file.write_bytes(domain_file.read_bytes())
+    # snapshot dated by the day it was built, after the lookup table
+    write_snapshot(
+        data_dir / "domain_index_20240301.bin",
+        DOMAIN_INDEX_MAGIC,
+        DOMAIN_INDEX_VERSION,
+        DomainIndex.build(old_file),
+    )
+    domains = DomainService()
+    domains.load_mapping()
+    assert isinstance(domains.index.genes, memoryview)
+    assert len(domains.get_possible_domains("hgnc:1097")) == 3
+
+    # newer lookup table, but dated before the snapshot
+    new_file = data_dir / "domain_lookup_20240201.tsv"
+    new_file.write_text("\n".join(ROWS[:2]))
+    domains.load_mapping()
+    assert isinstance(domains.index.genes, array)
+    assert len(domains.get_possible_domains("hgnc:1097")) == 2
+    with pytest.raises(LookupServiceError):
+        domains.get_possible_domains("hgnc:8031")
+
+
+def test_load_mapping_lazy(domain_file, monkeypatch):
+    """Test that lazy mode is used when no snapshot is available"""
+    monkeypatch.setattr("curfu.domain_services.read_local_snapshot", lambda *_: None)
+    monkeypatch.setattr("curfu.domain_services.get_data_file", lambda _: domain_file)
+    domains = DomainService()
+    domains.load_mapping(lazy=True)
+    assert isinstance(domains.index, LazyDomainIndex)
+    assert domains.get_possible_domains("HGNC:8031") == [
+        DomainRecord(
+            "interpro:IPR000372",
+            "Leucine-rich repeat N-terminal",
+            33,
+            64,
+            "NP_002520.2",
+        )
+    ]
+    with pytest.raises(LookupServiceError):
+        domains.get_possible_domains("hgnc:99999")
+
+
+def test_get_domain_services_lazy(domain_file, monkeypatch):
+    """Test that CURFU_LAZY_DOMAINS selects lazy loading at startup"""
+    monkeypatch.setattr("curfu.domain_services.read_local_snapshot", lambda *_: None)
+    monkeypatch.setattr("curfu.domain_services.get_data_file", lambda _: domain_file)
+    monkeypatch.setattr(main, "LAZY_DOMAINS", True)
+    assert isinstance(main.get_domain_services().index, LazyDomainIndex)
+    monkeypatch.setattr(main, "LAZY_DOMAINS", False)
+    assert isinstance(main.get_domain_services().index, DomainIndex)
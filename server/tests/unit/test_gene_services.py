@@ -0,0 +1,201 @@
+"""Test gene autocomplete index construction and lookup."""
+
+import csv
+from types import SimpleNamespace
+
+import pytest
+from curfu import LookupServiceError
+from curfu.gene_services import (
+    GENE_INDEX_MAGIC,
+    GENE_INDEX_VERSION,
+    CachedNormalizer,
+    GeneService,
+)
+from curfu.snapshot import write_snapshot
+from gene.schemas import MatchType
+
+GENES = [
+    ("hgnc:1097", "BRAF", "NCBI:NC_000007.14", "-"),
+    ("hgnc:1100", "BRCA1", "NCBI:NC_000017.11", "-"),
+    ("hgnc:1241", "C1QA", "NCBI:NC_000001.11", "+"),
+    ("hgnc:28795", "C1orf50", "NCBI:NC_000001.11", "+"),
+    ("hgnc:8031", "NTRK1", "NCBI:NC_000001.11", "+"),
+]
+
+
+class FakeNormalizer:
+    """Match gene symbols the way the gene normalizer does, counting lookups."""
+
+    def __init__(self):
+        """Initialize normalizer."""
+        self.symbols = {
+            symbol.upper(): (concept_id, symbol) for concept_id, symbol, *_ in GENES
+        }
+        self.queries = []
+
+    def normalize(self, query):
+        """Normalize gene symbol."""
+        self.queries.append(query)
+        match = self.symbols.get(query.strip().upper())
+        if not match:
+            return SimpleNamespace(match_type=MatchType.NO_MATCH)
+        return SimpleNamespace(
+            match_type=MatchType.SYMBOL,
+            normalized_id=match[0],
+            gene=SimpleNamespace(label=match[1], extensions=[]),
+        )
+
+
+@pytest.fixture()
+def suggestions_file(tmp_path):
+    """Provide small gene suggestions table."""
+    path = tmp_path / "gene_suggest_20240101.csv"
+    with path.open("w") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "concept_id",
+                "symbol",
+                "aliases",
+                "previous_symbols",
+                "chromosome",
+                "strand",
+            ]
+        )
+        for concept_id, symbol, chromosome, strand in GENES:
+            writer.writerow([concept_id, symbol, "", "", chromosome, strand])
+    return path
+
+
+def test_suggest_genes(suggestions_file):
+    """Test prefix lookups, ordering, and match counts"""
+    genes = GeneService(suggestions_file=suggestions_file)
+
+    suggestions, n = genes.suggest_genes("br")
+    assert n == 2
+    assert suggestions["symbol"] == [
+        ("BRAF", "BRAF", "hgnc:1097", "NCBI:NC_000007.14", "-"),
+        ("BRCA1", "BRCA1", "hgnc:1100", "NCBI:NC_000017.11", "-"),
+    ]
+    assert suggestions["concept_id"] == []
+
+    # ordered case-insensitively by term, so C1orf50 precedes C1QA
+    suggestions, n = genes.suggest_genes("C1")
+    assert n == 2
+    assert [s[0] for s in suggestions["symbol"]] == ["C1orf50", "C1QA"]
+
+    suggestions, n = genes.suggest_genes("hgnc:1")
+    assert n == 3
+    assert [s[0] for s in suggestions["concept_id"]] == [
+        "hgnc:1097",
+        "hgnc:1100",
+        "hgnc:1241",
+    ]
+
+    suggestions, n = genes.suggest_genes("BRAFX")
+    assert n == 0
+    assert all(not s for s in suggestions.values())
+
+
+def test_suggest_genes_limit(suggestions_file):
+    """Test that only exact matches are provided once the limit is exceeded"""
+    genes = GeneService(suggestions_file=suggestions_file)
+
+    suggestions, n = genes.suggest_genes("C1", limit=1)
+    assert n == 2
+    assert all(not s for s in suggestions.values())
+
+    suggestions, n = genes.suggest_genes("braf", limit=0)
+    assert n == 1
+    assert suggestions["symbol"] == [
+        ("BRAF", "BRAF", "hgnc:1097", "NCBI:NC_000007.14", "-")
+    ]
+
+    suggestions, n = genes.suggest_genes("BR", limit=2)
+    assert n == 2
+    assert len(suggestions["symbol"]) == 2
+
+
+def test_gene_index_snapshot(suggestions_file, tmp_path):
+    """Test that an index loaded from a snapshot matches one built from the table"""
+    genes = GeneService(suggestions_file=suggestions_file)
+    index_file = tmp_path / "gene_index_20240101.bin"
+    genes.save_index(index_file)
+
+    loaded = GeneService(index_file=index_file)
+    for query in ("", "B", "br", "C1", "hgnc:", "hgnc:8031", "NTRK1", "Z"):
+        assert loaded.suggest_genes(query) == genes.suggest_genes(query)
+        assert loaded.suggest_genes(query, 1) == genes.suggest_genes(query, 1)
+
+
+def test_gene_index_snapshot_fallback(suggestions_file, tmp_path):
+    """Test that a snapshot of another layout version is ignored in favor of the
+    suggestions table
+    """
+    index_file = tmp_path / "gene_index_20240101.bin"
+    write_snapshot(index_file, GENE_INDEX_MAGIC, GENE_INDEX_VERSION + 1, {})
+
+    genes = GeneService(suggestions_file=suggestions_file, index_file=index_file)
+    assert genes.suggest_genes("NTRK")[1] == 1
+
+
+def test_local_gene_index_snapshot(suggestions_file, tmp_path, monkeypatch):
+    """Test that the local snapshot is only used while it was built from the newest
+    local suggestions file, however their filenames are dated
+    """
+    data_dir = tmp_path / "app" / "data"
+    data_dir.mkdir(parents=True)
+    monkeypatch.setattr("curfu.utils.APP_ROOT", data_dir.parent)
+    monkeypatch.setattr(
+        "curfu.gene_services.get_data_file",
+        lambda _: sorted(data_dir.glob("gene_suggest_*.csv"))[-1],
+    )
+    old_file = data_dir / "gene_suggest_20240101.csv"
+    old_file.write_bytes(suggestions_file.read_bytes())
+    # snapshot dated by the day it was built, after the suggestions file
+    GeneService(suggestions_file=old_file).save_index(
+        data_dir / "gene_index_20240301.bin"
+    )
+    assert GeneService().suggest_genes("BRAF")[1] == 1
+
+    # newer suggestions file, but dated before the snapshot
+    new_file = data_dir / "gene_suggest_20240201.csv"
+    with new_file.open("w") as f:
+        f.write(old_file.read_text())
+        f.write("hgnc:99999,BRAFX,,,NCBI:NC_000007.14,-\n")
+    assert GeneService().suggest_genes("BRAF")[1] == 2
+
+    GeneService(suggestions_file=new_file).save_index(
+        data_dir / "gene_index_20240201.bin"
+    )
+    assert GeneService().suggest_genes("BRAF")[1] == 2
+    # suggestions file changed in place
+    new_file.write_text(old_file.read_text())
+    assert GeneService().suggest_genes("BRAF")[1] == 1
+
+
+def test_get_normalized_gene(suggestions_file):
+    """Test that gene normalization results are cached by stripped, case-insensitive
+    term, however the term was padded when first looked up
+    """
+    genes = GeneService(suggestions_file=suggestions_file)
+    query_handler = FakeNormalizer()
+    normalizer = CachedNormalizer(query_handler)
+
+    assert genes.get_normalized_gene(" braf ", normalizer) == (
+        "hgnc:1097",
+        "BRAF",
+        "BRAF",
+    )
+    assert genes.get_normalized_gene("BRAF", normalizer) == (
+        "hgnc:1097",
+        "BRAF",
+        "BRAF",
+    )
+    assert query_handler.queries == ["braf"]
+
+    for term in ("NOTAGENE", " notagene"):
+        with pytest.raises(LookupServiceError, match="Lookup of gene term"):
+            genes.get_normalized_gene(term, normalizer)
+    assert query_handler.queries == ["braf", "NOTAGENE"]
+    assert normalizer.cache.stats()["hits"] == 2
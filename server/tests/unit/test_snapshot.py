@@ -0,0 +1,109 @@
+"""Test binary snapshot container and string table."""
+
+from array import array
+
+import pytest
+from curfu.snapshot import (
+    SOURCE_SECTION,
+    SnapshotError,
+    StringTable,
+    get_source_fingerprint,
+    is_built_from,
+    read_snapshot,
+    write_snapshot,
+)
+
+MAGIC = b"CURFUTST"
+
+
+@pytest.fixture()
+def snapshot_file(tmp_path):
+    """Provide snapshot containing one section of each supported type."""
+    path = tmp_path / "test_20240101.bin"
+    write_snapshot(
+        path,
+        MAGIC,
+        2,
+        {"blob": b"abcde", "ints": array("I", [3, 1, 4, 1, 5]), "empty": array("I")},
+    )
+    return path
+
+
+def test_snapshot_round_trip(snapshot_file):
+    """Test that sections read back with the same contents and types"""
+    sections = read_snapshot(snapshot_file, MAGIC, 2)
+    assert set(sections) == {"blob", "ints", "empty"}
+    assert bytes(sections["blob"]) == b"abcde"
+    assert sections["ints"].format == "I"
+    assert sections["ints"].tolist() == [3, 1, 4, 1, 5]
+    assert len(sections["empty"]) == 0
+    # sections following an unaligned one are still aligned for in-place use
+    assert snapshot_file.read_bytes().find(array("I", [3, 1, 4]).tobytes()) % 8 == 0
+
+
+def test_snapshot_rejected(snapshot_file, tmp_path):
+    """Test that snapshots of the wrong kind, version, or size are rejected"""
+    with pytest.raises(SnapshotError, match="expected table type"):
+        read_snapshot(snapshot_file, b"CURFUXXX", 2)
+    with pytest.raises(SnapshotError, match="has version 2 \\(expected 1\\)"):
+        read_snapshot(snapshot_file, MAGIC, 1)
+
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(snapshot_file.read_bytes()[:-4])
+    with pytest.raises(SnapshotError, match="truncated"):
+        read_snapshot(truncated, MAGIC, 2)
+    with pytest.raises(SnapshotError, match="Unable to map"):
+        read_snapshot(tmp_path / "missing.bin", MAGIC, 2)
+
+
+def test_snapshot_invalid_sections(tmp_path):
+    """Test that unsupported section contents can't be written"""
+    with pytest.raises(ValueError, match="Unsupported format"):
+        write_snapshot(tmp_path / "x.bin", MAGIC, 1, {"floats": array("d", [1.0])})
+    with pytest.raises(ValueError, match="exceeds 32 bytes"):
+        write_snapshot(tmp_path / "x.bin", MAGIC, 1, {"n" * 33: b""})
+
+
+def test_string_table(tmp_path):
+    """Test string table construction, lookup, and snapshot round trip"""
+    values = ["BRAF", "BRAF1", "BRAFP1", "BRCA1", "ÅBC", "A", "BRAF"]
+    table, ids = StringTable.build(values)
+    assert len(table) == 6
+    assert [table[i] for i in range(len(table))] == sorted(set(values))
+    assert all(table[ids[value]] == value for value in values)
+    assert table.raw(ids["ÅBC"]) == "ÅBC".encode()
+
+    assert table.find("BRCA1") == ids["BRCA1"]
+    assert table.find("BRC") is None
+    assert table.find("ZZZ") is None
+
+    assert table.prefix_range("BRAF") == (ids["BRAF"], ids["BRCA1"])
+    assert table.prefix_range("BRC") == (ids["BRCA1"], ids["BRCA1"] + 1)
+    assert table.prefix_range("C") == (ids["ÅBC"], ids["ÅBC"])
+    assert table.prefix_range("Å") == (ids["ÅBC"], len(table))
+    assert table.prefix_range("") == (0, len(table))
+
+    path = tmp_path / "strings.bin"
+    write_snapshot(path, MAGIC, 1, table.sections("strings"))
+    loaded = StringTable.from_sections(read_snapshot(path, MAGIC, 1), "strings")
+    assert [loaded[i] for i in range(len(loaded))] == sorted(set(values))
+    assert loaded.prefix_range("BRAF") == table.prefix_range("BRAF")
+
+
+def test_is_built_from(tmp_path):
+    """Test that snapshots match their source file only while it's unchanged"""
+    source = tmp_path / "test_20240101.tsv"
+    source.write_bytes(b"abc")
+    path = tmp_path / "test_20240101.bin"
+    write_snapshot(path, MAGIC, 1, {SOURCE_SECTION: get_source_fingerprint(source)})
+    sections = read_snapshot(path, MAGIC, 1)
+    assert is_built_from(sections, source)
+
+    renamed = tmp_path / "test_20240201.tsv"
+    renamed.write_bytes(b"abc")
+    assert not is_built_from(sections, renamed)
+    source.write_bytes(b"abd")
+    assert not is_built_from(sections, source)
+    source.write_bytes(b"abcd")
+    assert not is_built_from(sections, source)
+    assert not is_built_from({}, source)